@@ -0,0 +1,121 @@
+"""
+Benchmark del tiempo de arranque, medido con `python -X importtime`.
+
+Importa `main` en un intérprete nuevo varias veces y reporta la mediana del tiempo acumulado
+de importación, los módulos que más aportan y si la pila HTTP (`requests`) quedó cargada. Como
+referencia, mide también importar `main` junto con `requests`, que es lo que paga la primera
+conversión de un viaje internacional.
+
+Los módulos de `DIFERIDOS` solo deben cargarse al usarse; si alguno se importa al arrancar, el
+programa termina con código 1.
+
+Uso:
+    python -m benchmarks.bench_arranque [--repeticiones 10] [--modulos 10] [--salida arranque.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PILA_HTTP = ("requests", "urllib3", "idna", "charset_normalizer", "certifi")
+# Módulos costosos que la aplicación importa recién al necesitarlos.
+DIFERIDOS = ("requests", "numpy", "asyncio", "multiprocessing", "concurrent.futures.process",
+             "mmap", "http.server")
+
+
+def importar(codigo: str) -> dict:
+    """
+    Ejecuta código en un intérprete nuevo con `-X importtime` y procesa su informe.
+
+    Args:
+        codigo (str): Código a ejecutar desde la raíz del proyecto.
+
+    Returns:
+        dict: Microsegundos acumulados por módulo de primer nivel ('acumulado'), microsegundos
+              propios por módulo ('propio') y total del código ('total_us'). No se cuentan
+              los módulos que el intérprete importa al iniciar, hasta `site` inclusive.
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                             capture_output=True, text=True, check=True)
+    lineas = [linea[len("import time:"):].split("|")
+              for linea in proceso.stderr.splitlines()
+              if linea.startswith("import time:") and "self [us]" not in linea]
+    # El informe lista cada módulo después de los que importa: lo anterior a `site` es el
+    # arranque del intérprete (incluidos los .pth del entorno), igual para cualquier código.
+    inicio = next((i + 1 for i, (_, _, nombre) in enumerate(lineas) if nombre == " site"), 0)
+    acumulado, propio = {}, {}
+    for tiempo_propio, tiempo_acumulado, nombre in lineas[inicio:]:
+        propio[nombre.strip()] = int(tiempo_propio)
+        # Los módulos de primer nivel no tienen sangría; su tiempo incluye el de sus hijos.
+        if not nombre.startswith("  "):
+            acumulado[nombre.strip()] = int(tiempo_acumulado)
+    return {'acumulado': acumulado, 'propio': propio, 'total_us': sum(acumulado.values())}
+
+
+def medir(codigo: str, repeticiones: int) -> dict:
+    """
+    Importa varias veces y resume las mediciones.
+
+    Args:
+        codigo (str): Código a ejecutar en cada repetición.
+        repeticiones (int): Intérpretes a lanzar.
+
+    Returns:
+        dict: Mediana del total en ms, mediana del tiempo propio por módulo en µs y módulos
+              de la pila HTTP cargados.
+    """
+    mediciones = [importar(codigo) for _ in range(repeticiones)]
+    modulos = set().union(*(medicion['propio'] for medicion in mediciones))
+    propio = {modulo: statistics.median(medicion['propio'].get(modulo, 0)
+                                        for medicion in mediciones)
+              for modulo in modulos}
+    return {
+        'codigo': codigo,
+        'mediana_ms': statistics.median(m['total_us'] for m in mediciones) / 1000,
+        'propio_us': propio,
+        'pila_http': sorted(modulo for modulo in modulos if modulo.split(".")[0] in PILA_HTTP),
+    }
+
+
+def main():
+    """Mide el arranque con y sin la pila HTTP e imprime los módulos más costosos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=10,
+                        help="Intérpretes a lanzar por medición.")
+    parser.add_argument("--modulos", type=int, default=10,
+                        help="Módulos más costosos a mostrar.")
+    parser.add_argument("--salida", help="Archivo JSON donde se escriben los resultados.")
+    args = parser.parse_args()
+
+    arranque = medir("import main", args.repeticiones)
+    con_http = medir("import main, requests", args.repeticiones)
+
+    print(f"Arranque (import main):        {arranque['mediana_ms']:8.1f} ms")
+    print(f"Con la pila HTTP (+ requests): {con_http['mediana_ms']:8.1f} ms")
+    if arranque['pila_http']:
+        print(f"La pila HTTP se carga al arrancar: {', '.join(arranque['pila_http'][:5])}...")
+    else:
+        print("La pila HTTP no se carga al arrancar.")
+
+    print(f"\n{'módulo':>50} {'propio µs':>10}")
+    costosos = sorted(arranque['propio_us'].items(), key=lambda par: par[1], reverse=True)
+    for modulo, tiempo in costosos[:args.modulos]:
+        print(f"{modulo:>50} {tiempo:>10.0f}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({'python': sys.version.split()[0], 'arranque': arranque,
+                       'con_pila_http': con_http}, archivo, indent=2)
+
+    cargados = [modulo for modulo in DIFERIDOS if modulo in arranque['propio_us']]
+    if cargados:
+        print(f"\nMódulos diferidos importados al arrancar: {', '.join(cargados)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark del registro concurrente de gastos con el lock por viaje.
+
+Mide los gastos por segundo al registrar desde 1, 2, 4 y 8 hilos, tanto sobre un mismo viaje
+(todos los hilos compiten por su lock) como sobre un viaje por hilo (locks distintos).
+
+Uso:
+    python -m benchmarks.bench_concurrencia [--gastos 20000]
+"""
+
+import argparse
+import threading
+import time
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+
+
+def crear_viaje() -> Viaje:
+    """Crea un viaje nacional vacío."""
+    return Viaje(date(2025, 6, 1), date(2025, 6, 30), 100000,
+                 Destino.obtener("Cali", "Valle", "Colombia", "cop"), TipoViaje.NACIONAL)
+
+
+def medir(hilos: int, gastos_por_hilo: int, compartido: bool) -> float:
+    """
+    Registra gastos desde varios hilos y mide el rendimiento total.
+
+    Args:
+        hilos (int): Número de hilos.
+        gastos_por_hilo (int): Gastos que registra cada hilo.
+        compartido (bool): Si es True, todos los hilos usan el mismo viaje.
+
+    Returns:
+        float: Gastos registrados por segundo.
+    """
+    comun = crear_viaje()
+    viajes = [comun if compartido else crear_viaje() for _ in range(hilos)]
+    gasto = Gasto(date(2025, 6, 1), 1000, MedioPago.EFECTIVO, TipoGasto.COMPRAS, 1000)
+    barrera = threading.Barrier(hilos + 1)
+
+    def registrar(viaje):
+        barrera.wait()
+        for _ in range(gastos_por_hilo):
+            viaje.agregar_gasto(gasto)
+
+    trabajadores = [threading.Thread(target=registrar, args=(viaje,)) for viaje in viajes]
+    for trabajador in trabajadores:
+        trabajador.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    return hilos * gastos_por_hilo / (time.perf_counter() - inicio)
+
+
+def main():
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--gastos", type=int, default=20000, help="Gastos por hilo.")
+    args = parser.parse_args()
+
+    print(f"{'hilos':>6} {'mismo viaje (g/s)':>20} {'viaje por hilo (g/s)':>22}")
+    for hilos in (1, 2, 4, 8):
+        compartido = medir(hilos, args.gastos, True)
+        separados = medir(hilos, args.gastos, False)
+        print(f"{hilos:>6} {compartido:>20.0f} {separados:>22.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark del costo por inserción al registrar gastos en un viaje.
+
+Reproduce el camino de `ControlGasto.registrar_gasto` sin conversión de moneda ni impresión:
+agregar el gasto al viaje y calcular la diferencia con el presupuesto del día. Con el índice
+por fecha de `Viaje`, el costo por inserción debe mantenerse plano al crecer el viaje.
+
+Uso:
+    python -m benchmarks.bench_gasto_diario [--maximo 1000000]
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from controladores.control_gasto import ControlGasto
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+
+DIAS_VIAJE = 30
+
+
+def medir(cantidad: int) -> dict:
+    """
+    Registra `cantidad` gastos y mide el costo medio por inserción al inicio y al final.
+
+    Args:
+        cantidad (int): Número de gastos a registrar.
+
+    Returns:
+        dict: Microsegundos por inserción en el primer y en el último décimo de la carga.
+    """
+    inicio = date(2025, 6, 1)
+    viaje = Viaje(inicio, inicio + timedelta(days=DIAS_VIAJE - 1), 100000,
+                  Destino("Bogotá", "Cundinamarca", "Colombia", "cop"), TipoViaje.NACIONAL)
+    control = ControlGasto(viaje, None)
+    fechas = [inicio + timedelta(days=i) for i in range(DIAS_VIAJE)]
+    gastos = [
+        Gasto(fechas[i % DIAS_VIAJE], 1000, MedioPago.EFECTIVO, TipoGasto.ALIMENTACION, 1000)
+        for i in range(cantidad)
+    ]
+
+    def registrar(bloque):
+        if not bloque:
+            return 0.0
+        comienzo = time.perf_counter()
+        for gasto in bloque:
+            viaje.agregar_gasto(gasto)
+            control.calcular_diferencia_presupuesto(gasto.get_fecha())
+        return (time.perf_counter() - comienzo) / len(bloque) * 1e6
+
+    decimo = max(cantidad // 10, 1)
+    primero = registrar(gastos[:decimo])
+    registrar(gastos[decimo:cantidad - decimo])
+    ultimo = registrar(gastos[cantidad - decimo:])
+
+    return {'cantidad': cantidad, 'us_primer_decimo': primero, 'us_ultimo_decimo': ultimo}
+
+
+def main():
+    """Ejecuta el benchmark para tamaños crecientes e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--maximo", type=int, default=10 ** 6,
+                        help="Cantidad máxima de gastos a registrar.")
+    args = parser.parse_args()
+
+    cantidad = 10 ** 3
+    print(f"{'gastos':>10} {'µs/inserción (inicio)':>22} {'µs/inserción (final)':>22}")
+    while cantidad <= args.maximo:
+        resultado = medir(cantidad)
+        print(f"{cantidad:>10} {resultado['us_primer_decimo']:>22.3f} "
+              f"{resultado['us_ultimo_decimo']:>22.3f}")
+        cantidad *= 10
+
+
+if __name__ == '__main__':
+    main()
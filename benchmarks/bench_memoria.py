@@ -0,0 +1,134 @@
+"""
+Benchmark de memoria de los modelos, medido con tracemalloc.
+
+Compara los bytes por gasto y por viaje de los modelos actuales (con __slots__ y destinos
+compartidos) frente a réplicas independientes de los modelos originales, con sus atributos en
+un __dict__ y un Destino nuevo por viaje.
+
+Con Python 3.11, un gasto pasa de 168 a 144 bytes. Un viaje vacío actual ocupa más que el
+original (unos 2200 frente a 305 bytes) porque ahora incluye sus agregados (ResumenGastos),
+su lock y su lista de observadores; el destino compartido solo ahorra el de cada viaje.
+
+Uso:
+    python -m benchmarks.bench_memoria [--gastos 100000] [--viajes 10000]
+"""
+
+import argparse
+import tracemalloc
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+
+
+class GastoConDict:
+    """Réplica del Gasto original (sin __slots__), con sus atributos en un __dict__."""
+
+    def __init__(self, fecha, valor: float, medio_pago: MedioPago,
+                 tipo_gasto: TipoGasto, valor_cop: float):
+        if not isinstance(valor, (int, float)):
+            raise TypeError("El valor debe ser un número (int o float).")
+        if not isinstance(valor_cop, (int, float)):
+            raise TypeError("El valor en COP debe ser un número (int o float).")
+        if valor < 0:
+            raise ValueError("El valor original no puede ser negativo.")
+        if valor_cop < 0:
+            raise ValueError("El valor en COP no puede ser negativo.")
+        self.fecha = fecha
+        self.valor = valor
+        self.medio_pago = medio_pago
+        self.tipo_gasto = tipo_gasto
+        self.valor_cop = valor_cop
+
+
+class ViajeConDict:
+    """Réplica del Viaje original (sin __slots__ ni agregados), con una lista de gastos."""
+
+    def __init__(self, fecha_inicio, fecha_fin, presupuesto_diario: float, destino,
+                 tipo_viaje: TipoViaje):
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_fin
+        self.presupuesto_diario = presupuesto_diario
+        self.destino = destino
+        self.tipo_viaje = tipo_viaje
+        self.estado_viaje = True
+        self.gastos = []
+
+
+class DestinoConDict:
+    """Réplica del Destino original (sin __slots__), creada de nuevo para cada viaje."""
+
+    def __init__(self, ciudad: str, departamento: str, pais: str, moneda_local: str):
+        self.ciudad = ciudad
+        self.departamento = departamento
+        self.pais = pais
+        self.moneda_local = moneda_local
+
+
+def bytes_por_objeto(crear, cantidad: int) -> float:
+    """
+    Mide la memoria retenida por `cantidad` objetos creados con `crear`.
+
+    Args:
+        crear (callable): Función que recibe el índice y crea un objeto.
+        cantidad (int): Número de objetos a crear.
+
+    Returns:
+        float: Bytes retenidos por objeto, incluida su referencia en la lista.
+    """
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [crear(i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (despues - antes) / cantidad
+
+
+def medir(gastos: int, viajes: int) -> dict:
+    """
+    Mide los bytes por gasto y por viaje antes y después de las optimizaciones.
+
+    Args:
+        gastos (int): Número de gastos a crear.
+        viajes (int): Número de viajes a crear, todos hacia la misma ciudad.
+
+    Returns:
+        dict: Bytes por objeto para cada variante.
+    """
+    fecha = date(2025, 6, 1)
+
+    def gasto(clase):
+        return lambda i: clase(fecha, float(i), MedioPago.EFECTIVO, TipoGasto.COMPRAS, float(i))
+
+    def viaje(clase, crear_destino):
+        return lambda i: clase(fecha, fecha, 100000, crear_destino("Lima", "Lima", "Perú", "pen"),
+                               TipoViaje.INTERNACIONAL)
+
+    return {
+        'gasto_antes': bytes_por_objeto(gasto(GastoConDict), gastos),
+        'gasto_despues': bytes_por_objeto(gasto(Gasto), gastos),
+        'viaje_antes': bytes_por_objeto(viaje(ViajeConDict, DestinoConDict), viajes),
+        'viaje_despues': bytes_por_objeto(viaje(Viaje, Destino.obtener), viajes),
+    }
+
+
+def main():
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--gastos", type=int, default=100000)
+    parser.add_argument("--viajes", type=int, default=10000)
+    args = parser.parse_args()
+
+    resultado = medir(args.gastos, args.viajes)
+    print(f"{'modelo':<8} {'antes (B)':>12} {'después (B)':>12}")
+    print(f"{'gasto':<8} {resultado['gasto_antes']:>12.1f} {resultado['gasto_despues']:>12.1f}")
+    print(f"{'viaje':<8} {resultado['viaje_antes']:>12.1f} {resultado['viaje_despues']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark del reporte de flota repartido en procesos.
+
+Crea muchos viajes sobre almacenes columnares y mide el tiempo de `ControlReporte.reporte_flota`
+con 1, 2, 4 y 8 procesos, junto con la aceleración respecto a un solo proceso. También mide la
+preparación de los bloques que se envían a los procesos, la única parte que corre en serie en
+el proceso principal: la aceleración posible está acotada por su fracción del total.
+
+Uso:
+    python -m benchmarks.bench_reporte_flota [--viajes 200] [--gastos 5000]
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+
+from controladores.control_reporte import ControlReporte
+from enums.tipo_viaje import TipoViaje
+from modelos.almacen_columnar import AlmacenGastosColumnar, MEDIOS, TIPOS
+from modelos.destino import Destino
+from modelos.dinero import a_centavos
+from modelos.viaje import Viaje
+
+
+def crear_viajes(cantidad: int, gastos_por_viaje: int) -> list:
+    """
+    Crea viajes de 30 días con gastos aleatorios cargados directamente en sus columnas.
+
+    Returns:
+        list[Viaje]: Los viajes creados.
+    """
+    azar = random.Random(7)
+    destino = Destino.obtener("Cali", "Valle", "Colombia", "cop")
+    inicio = date(2025, 6, 1).toordinal()
+    viajes = []
+    for _ in range(cantidad):
+        almacen = AlmacenGastosColumnar()
+        for _ in range(gastos_por_viaje):
+            valor = a_centavos(azar.uniform(1000, 100000))
+            almacen.agregar_fila((inicio + azar.randrange(30), azar.randrange(len(MEDIOS)),
+                                  azar.randrange(len(TIPOS)), valor, valor))
+        viajes.append(Viaje(date(2025, 6, 1), date(2025, 6, 30), 100000, destino,
+                            TipoViaje.NACIONAL, almacen=almacen))
+    return viajes
+
+
+def main():
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--viajes", type=int, default=200, help="Número de viajes.")
+    parser.add_argument("--gastos", type=int, default=5000, help="Gastos por viaje.")
+    args = parser.parse_args()
+
+    viajes = crear_viajes(args.viajes, args.gastos)
+    inicio = time.perf_counter()
+    for viaje in viajes:
+        viaje.get_gastos().a_bytes()
+    preparacion = time.perf_counter() - inicio
+
+    print(f"{'procesos':>9} {'tiempo (s)':>11} {'aceleración':>12}")
+    base = None
+    for procesos in (1, 2, 4, 8):
+        inicio = time.perf_counter()
+        ControlReporte.reporte_flota(viajes, procesos=procesos)
+        tiempo = time.perf_counter() - inicio
+        base = base or tiempo
+        print(f"{procesos:>9} {tiempo:>11.3f} {base / tiempo:>12.2f}")
+    print(f"Preparación en serie de los bloques: {preparacion:.3f} s "
+          f"({preparacion / base:.1%} del tiempo con un proceso).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Servidor HTTP local que imita la API de tasas de cambio, para medir sin depender de la red.
+
+Responde a las mismas rutas que la API real (`/<fecha>/v1/currencies/<moneda>.json`) con tasas
+fijas para cualquier fecha, y mantiene las conexiones abiertas (HTTP/1.1) como el CDN real.
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Unidades de cada moneda por un dólar.
+TASAS_USD = {"usd": 1.0, "cop": 4000.0, "eur": 0.9, "mxn": 17.0, "brl": 5.0}
+RUTA = re.compile(r"^/(?P<fecha>\d{4}-\d{2}-\d{2})/v1/currencies/(?P<moneda>[a-z]+)\.json$")
+
+
+def tabla_tasas(moneda: str) -> dict:
+    """Retorna las tasas de todas las monedas conocidas frente a `moneda`."""
+    base = TASAS_USD[moneda]
+    return {otra: tasa / base for otra, tasa in TASAS_USD.items()}
+
+
+class _ManejadorTasas(BaseHTTPRequestHandler):
+    """Responde las consultas de tablas diarias; cualquier otra ruta es un 404."""
+
+    protocol_version = "HTTP/1.1"
+    # Las cabeceras y el cuerpo salen en dos escrituras; con Nagle activo, la segunda
+    # esperaría el ACK retardado del cliente (unos 40 ms) en cada conexión reutilizada.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        coincidencia = RUTA.match(self.path)
+        if coincidencia is None or coincidencia['moneda'] not in TASAS_USD:
+            self._responder(404, b"{}")
+            return
+        moneda = coincidencia['moneda']
+        cuerpo = json.dumps({"date": coincidencia['fecha'], moneda: tabla_tasas(moneda)})
+        self._responder(200, cuerpo.encode())
+
+    def _responder(self, estado: int, cuerpo: bytes):
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *_):
+        """No escribe una línea por consulta."""
+
+
+class ServidorTasasFalso:
+    """
+    Servidor de tasas en 127.0.0.1 sobre un puerto libre, atendido en un hilo aparte.
+
+    Atributos:
+        url_api (str): Plantilla de dirección para `ControlAPIMonedaIntercambio.url_api`.
+        consultas (int): Consultas atendidas.
+    """
+
+    def __init__(self):
+        """Abre el socket en un puerto libre; el servidor atiende tras `iniciar`."""
+        servidor = self
+
+        class Manejador(_ManejadorTasas):
+            def do_GET(self):
+                servidor.consultas += 1
+                super().do_GET()
+
+        self.consultas = 0
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self._http.daemon_threads = True
+        puerto = self._http.server_address[1]
+        self.url_api = f"http://127.0.0.1:{puerto}/{{fecha}}/v1/currencies/{{moneda}}.json"
+        self._hilo = threading.Thread(target=self._http.serve_forever, daemon=True)
+
+    def iniciar(self):
+        """Empieza a atender consultas."""
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Deja de atender consultas y cierra el socket."""
+        self._http.shutdown()
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_):
+        self.detener()
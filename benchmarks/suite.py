@@ -0,0 +1,312 @@
+"""
+Suite de benchmarks de los caminos críticos de registro, conversión y reportes.
+
+Mide, para 10^3 a 10^6 gastos, el registro con `ControlGasto.registrar_gasto` (nacional e
+internacional), `Viaje.calcular_gasto_diario`, los reportes diario y por tipo de
+`ControlReporte` y la consulta de tasas de `ControlAPIMonedaIntercambio` contra un servidor de
+tasas local. De cada caso se registran las operaciones por segundo, la latencia p50/p99 por
+operación y el pico de memoria (tracemalloc, en una segunda pasada sin cronometrar).
+
+Los resultados se escriben en JSON. Si existe una línea base, el programa termina con código 1
+cuando algún caso rinde menos operaciones por segundo, o usa más memoria, que la línea base
+más la tolerancia. Con `--comparar`, la falta de la línea base también termina con código 1,
+de modo que el control no pasa en silencio; la línea base depende del equipo, así que se genera
+en él con `--guardar-linea-base`.
+
+Uso:
+    python -m benchmarks.suite [--tamanos 1000 10000] [--casos reporte_diario]
+                               [--salida resultados.json] [--linea-base benchmarks/linea_base.json]
+                               [--tolerancia 0.25] [--guardar-linea-base] [--comparar]
+                               [--sin-memoria]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import date, datetime, timedelta
+
+from benchmarks.servidor_tasas import ServidorTasasFalso
+from controladores.cache_tasas import CacheTasas
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.control_gasto import ControlGasto
+from controladores.control_reporte import ControlReporte
+from controladores.transporte_http import TransporteHTTP
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+
+TAMANOS = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DIAS_VIAJE = 30
+INICIO = date(2024, 6, 1)
+# Los casos cuyo costo por operación no depende del número de gastos repiten a lo sumo
+# esta cantidad de operaciones, sobre un viaje del tamaño indicado.
+MAX_CONSULTAS = 2000
+LINEA_BASE = os.path.join(os.path.dirname(__file__), "linea_base.json")
+
+
+def crear_viaje(tipo_viaje: TipoViaje = TipoViaje.NACIONAL) -> Viaje:
+    """Crea un viaje vacío de `DIAS_VIAJE` días."""
+    if tipo_viaje == TipoViaje.NACIONAL:
+        destino = Destino.obtener("Cali", "Valle", "Colombia", "cop")
+    else:
+        destino = Destino.obtener("Miami", "Florida", "Estados Unidos", "usd")
+    return Viaje(INICIO, INICIO + timedelta(days=DIAS_VIAJE - 1), 100000, destino, tipo_viaje)
+
+
+def datos_gastos(cantidad: int) -> list:
+    """Genera los argumentos de `registrar_gasto` para `cantidad` gastos repartidos en el viaje."""
+    medios = tuple(MedioPago)
+    tipos = tuple(TipoGasto)
+    return [(INICIO + timedelta(days=i % DIAS_VIAJE), 1000 + i % 500,
+             medios[i % len(medios)], tipos[i % len(tipos)]) for i in range(cantidad)]
+
+
+def viaje_con_gastos(cantidad: int) -> Viaje:
+    """Crea un viaje nacional con `cantidad` gastos ya agregados."""
+    viaje = crear_viaje()
+    viaje.agregar_gastos([Gasto(fecha, valor, medio, tipo, valor)
+                          for fecha, valor, medio, tipo in datos_gastos(cantidad)])
+    return viaje
+
+
+def caso_registrar_gasto(cantidad: int):
+    """Registra gastos en un viaje nacional."""
+    control = ControlGasto(crear_viaje(), None)
+    return lambda datos: control.registrar_gasto(*datos), datos_gastos(cantidad)
+
+
+def caso_registrar_gasto_internacional(cantidad: int):
+    """Registra gastos en dólares; la tasa de cada fecha se consulta una vez al servidor."""
+    ControlAPIMonedaIntercambio.configurar_cache()
+    control = ControlGasto(crear_viaje(TipoViaje.INTERNACIONAL), None)
+    return lambda datos: control.registrar_gasto(*datos), datos_gastos(cantidad)
+
+
+def caso_calcular_gasto_diario(cantidad: int):
+    """Consulta el total de un día en un viaje con `cantidad` gastos."""
+    viaje = viaje_con_gastos(cantidad)
+    fechas = [INICIO + timedelta(days=i % DIAS_VIAJE) for i in range(cantidad)]
+    return viaje.calcular_gasto_diario, fechas
+
+
+def caso_reporte_diario(cantidad: int):
+    """Genera el reporte diario de un viaje con `cantidad` gastos."""
+    viaje = viaje_con_gastos(cantidad)
+    return (lambda _: ControlReporte.calcular_reporte_gastos_todos_los_dias(None, viaje),
+            range(min(cantidad, MAX_CONSULTAS)))
+
+
+def caso_reporte_por_tipo(cantidad: int):
+    """Genera el reporte por tipo de un viaje con `cantidad` gastos."""
+    viaje = viaje_con_gastos(cantidad)
+    return (lambda _: ControlReporte.reporte_por_tipo(viaje),
+            range(min(cantidad, MAX_CONSULTAS)))
+
+
+def caso_obtener_tasa(cantidad: int):
+    """Consulta tasas de fechas distintas, todas fuera de la caché, al servidor local."""
+    ControlAPIMonedaIntercambio.configurar_cache(capacidad=MAX_CONSULTAS)
+    fechas = [INICIO - timedelta(days=i) for i in range(min(cantidad, MAX_CONSULTAS))]
+    return lambda fecha: ControlAPIMonedaIntercambio.obtener_tasa_cambio("usd", fecha), fechas
+
+
+CASOS = {
+    'registrar_gasto': caso_registrar_gasto,
+    'registrar_gasto_internacional': caso_registrar_gasto_internacional,
+    'calcular_gasto_diario': caso_calcular_gasto_diario,
+    'reporte_diario': caso_reporte_diario,
+    'reporte_por_tipo': caso_reporte_por_tipo,
+    'obtener_tasa': caso_obtener_tasa,
+}
+
+
+def percentil(ordenados, fraccion: float) -> float:
+    """Retorna el percentil de una secuencia ordenada (método del rango más cercano)."""
+    return ordenados[round(fraccion * (len(ordenados) - 1))]
+
+
+def medir(caso, cantidad: int) -> dict:
+    """
+    Ejecuta un caso cronometrando cada operación.
+
+    Args:
+        caso (callable): Función que prepara el caso y retorna (operación, argumentos).
+        cantidad (int): Número de gastos del caso.
+
+    Returns:
+        dict: Operaciones, segundos, operaciones por segundo y latencias p50/p99 en µs.
+    """
+    operacion, argumentos = caso(cantidad)
+    latencias = array('q')
+    reloj = time.perf_counter_ns
+    inicio = reloj()
+    for argumento in argumentos:
+        antes = reloj()
+        operacion(argumento)
+        latencias.append(reloj() - antes)
+    segundos = (reloj() - inicio) / 1e9
+
+    ordenadas = sorted(latencias)
+    return {
+        'operaciones': len(latencias),
+        'segundos': segundos,
+        'ops_por_segundo': len(latencias) / segundos,
+        'p50_us': percentil(ordenadas, 0.50) / 1000,
+        'p99_us': percentil(ordenadas, 0.99) / 1000,
+    }
+
+
+def medir_memoria(caso, cantidad: int) -> int:
+    """
+    Ejecuta un caso completo, preparación incluida, con tracemalloc activo.
+
+    Returns:
+        int: Pico de memoria asignada en bytes.
+    """
+    tracemalloc.start()
+    try:
+        operacion, argumentos = caso(cantidad)
+        for argumento in argumentos:
+            operacion(argumento)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def ejecutar(casos, tamanos, memoria: bool = True) -> list:
+    """
+    Ejecuta los casos indicados para cada tamaño contra un servidor de tasas local.
+
+    La salida impresa por la aplicación durante los casos se descarta. Los casos usan una
+    caché y un transporte propios, sin paquete de tasas; al terminar se restauran la URL, la
+    caché, el transporte y el paquete que tenía ControlAPIMonedaIntercambio.
+
+    Returns:
+        list[dict]: Un resultado por caso y tamaño.
+    """
+    resultados = []
+    api = ControlAPIMonedaIntercambio
+    originales = (api.url_api, api.cache, api.transporte, api.paquete)
+    with ServidorTasasFalso() as servidor, open(os.devnull, "w", encoding="utf-8") as nulo:
+        # Se asignan directamente: configurar_cache y configurar_paquete cerrarían los del
+        # llamador.
+        api.url_api, api.cache = servidor.url_api, CacheTasas()
+        api.transporte, api.paquete = TransporteHTTP(), None
+        try:
+            for nombre in casos:
+                for cantidad in tamanos:
+                    with contextlib.redirect_stdout(nulo):
+                        resultado = medir(CASOS[nombre], cantidad)
+                        if memoria:
+                            resultado['memoria_pico_bytes'] = medir_memoria(CASOS[nombre],
+                                                                            cantidad)
+                    resultado = {'caso': nombre, 'tamano': cantidad, **resultado}
+                    resultados.append(resultado)
+                    print(f"{nombre:>30} {cantidad:>9} {resultado['ops_por_segundo']:>12.0f} "
+                          f"{resultado['p50_us']:>9.2f} {resultado['p99_us']:>9.2f} "
+                          f"{resultado.get('memoria_pico_bytes', 0) / 2 ** 20:>10.1f}")
+        finally:
+            api.cache.cerrar()
+            api.transporte.cerrar()
+            api.url_api, api.cache, api.transporte, api.paquete = originales
+    return resultados
+
+
+def comparar(resultados: list, linea_base: list, tolerancia: float) -> list:
+    """
+    Compara los resultados con una línea base.
+
+    Args:
+        resultados (list[dict]): Resultados actuales.
+        linea_base (list[dict]): Resultados de referencia.
+        tolerancia (float): Fracción de empeoramiento admitida (0.25 = 25 %).
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada.
+    """
+    base = {(r['caso'], r['tamano']): r for r in linea_base}
+    regresiones = []
+    for resultado in resultados:
+        referencia = base.get((resultado['caso'], resultado['tamano']))
+        if referencia is None:
+            continue
+        etiqueta = f"{resultado['caso']} ({resultado['tamano']})"
+        minimo = referencia['ops_por_segundo'] * (1 - tolerancia)
+        if resultado['ops_por_segundo'] < minimo:
+            regresiones.append(f"{etiqueta}: {resultado['ops_por_segundo']:.0f} ops/s, "
+                               f"mínimo admitido {minimo:.0f}")
+        if 'memoria_pico_bytes' in resultado and 'memoria_pico_bytes' in referencia:
+            maximo = referencia['memoria_pico_bytes'] * (1 + tolerancia)
+            if resultado['memoria_pico_bytes'] > maximo:
+                regresiones.append(f"{etiqueta}: {resultado['memoria_pico_bytes']} bytes, "
+                                   f"máximo admitido {maximo:.0f}")
+    return regresiones
+
+
+def main():
+    """Ejecuta la suite, guarda los resultados y los compara con la línea base."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS,
+                        help="Cantidades de gastos a medir.")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=list(CASOS),
+                        help="Casos a ejecutar.")
+    parser.add_argument("--salida", default="resultados_benchmarks.json",
+                        help="Archivo JSON donde se escriben los resultados.")
+    parser.add_argument("--linea-base", default=LINEA_BASE,
+                        help="Archivo JSON con los resultados de referencia.")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Fracción de empeoramiento admitida frente a la línea base.")
+    parser.add_argument("--guardar-linea-base", action="store_true",
+                        help="Guarda los resultados como nueva línea base.")
+    parser.add_argument("--comparar", action="store_true",
+                        help="Falla si no existe la línea base en lugar de no comparar.")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="No mide el pico de memoria (evita la segunda pasada).")
+    args = parser.parse_args()
+
+    print(f"{'caso':>30} {'gastos':>9} {'ops/s':>12} {'p50 µs':>9} {'p99 µs':>9} "
+          f"{'pico MiB':>10}")
+    resultados = ejecutar(args.casos, args.tamanos, memoria=not args.sin_memoria)
+    informe = {
+        'fecha': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2)
+
+    if args.guardar_linea_base:
+        with open(args.linea_base, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2)
+        print(f"Línea base guardada en {args.linea_base}")
+        return
+
+    if not os.path.exists(args.linea_base):
+        if args.comparar:
+            print(f"No hay línea base en {args.linea_base}; genérela con --guardar-linea-base "
+                  f"en este equipo.", file=sys.stderr)
+            sys.exit(1)
+        print(f"No hay línea base en {args.linea_base}; no se comparan los resultados.")
+        return
+    with open(args.linea_base, encoding="utf-8") as archivo:
+        linea_base = json.load(archivo)['resultados']
+    regresiones = comparar(resultados, linea_base, args.tolerancia)
+    for regresion in regresiones:
+        print(f"Regresión: {regresion}")
+    if regresiones:
+        sys.exit(1)
+    print("Sin regresiones frente a la línea base.")
+
+
+if __name__ == '__main__':
+    main()
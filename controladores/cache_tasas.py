@@ -0,0 +1,163 @@
+"""
+Módulo que implementa una caché de dos niveles para las tasas de cambio.
+
+El primer nivel es una caché LRU en memoria del proceso, con capacidad configurable.
+El segundo nivel es opcional y persiste las entradas en una base de datos SQLite local,
+de modo que las tasas ya consultadas sobreviven a los reinicios de la aplicación.
+
+Las tasas históricas nunca cambian, por lo que se guardan sin vencimiento. Las tasas
+marcadas como volátiles (las del día actual) vencen tras un tiempo de vida configurable.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheTasas:
+    """
+    Caché LRU en memoria respaldada opcionalmente por un almacén SQLite en disco.
+
+    Atributos:
+        capacidad (int): Número máximo de entradas en memoria.
+        ruta (str | None): Ruta del archivo SQLite. Si es None, no se persiste en disco.
+        ttl_volatil (float): Segundos de vida de las entradas volátiles.
+        aciertos_memoria (int): Consultas resueltas desde la memoria.
+        aciertos_disco (int): Consultas resueltas desde el disco.
+        fallos (int): Consultas que no encontraron una entrada vigente.
+    """
+
+    def __init__(self, capacidad: int = 1024, ruta: str = None, ttl_volatil: float = 3600):
+        """
+        Inicializa la caché y, si se indica una ruta, abre o crea el almacén en disco.
+
+        Args:
+            capacidad (int): Número máximo de entradas en memoria.
+            ruta (str | None): Ruta del archivo SQLite para la persistencia.
+            ttl_volatil (float): Segundos de vida de las entradas volátiles.
+
+        Raises:
+            ValueError: Si la capacidad o el tiempo de vida no son positivos.
+        """
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la caché debe ser positiva.")
+        if ttl_volatil <= 0:
+            raise ValueError("El tiempo de vida de las entradas volátiles debe ser positivo.")
+
+        self.capacidad = capacidad
+        self.ruta = ruta
+        self.ttl_volatil = ttl_volatil
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion = None
+
+        if ruta is not None:
+            self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS tasas ("
+                "clave TEXT PRIMARY KEY, valor TEXT NOT NULL, expira REAL)"
+            )
+            self._conexion.commit()
+
+    def obtener(self, clave: str, contar: bool = True):
+        """
+        Busca una entrada vigente, primero en memoria y luego en disco.
+
+        Args:
+            clave (str): Clave de la entrada.
+            contar (bool): Si es False, la consulta no se suma a los aciertos ni a los fallos
+                           (por ejemplo, al revisar entradas auxiliares que no son tasas).
+
+        Returns:
+            object | None: Valor almacenado, o None si no existe o ya venció.
+        """
+        ahora = time.time()
+        with self._lock:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                valor, expira = entrada
+                if expira is None or expira > ahora:
+                    self._memoria.move_to_end(clave)
+                    self.aciertos_memoria += contar
+                    return valor
+                del self._memoria[clave]
+
+            if self._conexion is not None:
+                fila = self._conexion.execute(
+                    "SELECT valor, expira FROM tasas WHERE clave = ?", (clave,)
+                ).fetchone()
+                if fila is not None and (fila[1] is None or fila[1] > ahora):
+                    valor = json.loads(fila[0])
+                    self._guardar_en_memoria(clave, valor, fila[1])
+                    self.aciertos_disco += contar
+                    return valor
+
+            self.fallos += contar
+            return None
+
+    def guardar(self, clave: str, valor, volatil: bool = False):
+        """
+        Almacena una entrada en memoria y, si está configurado, en disco.
+
+        Args:
+            clave (str): Clave de la entrada.
+            valor: Valor serializable como JSON.
+            volatil (bool): Si es True, la entrada vence tras `ttl_volatil` segundos.
+        """
+        expira = time.time() + self.ttl_volatil if volatil else None
+        with self._lock:
+            self._guardar_en_memoria(clave, valor, expira)
+            if self._conexion is not None:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO tasas (clave, valor, expira) VALUES (?, ?, ?)",
+                    (clave, json.dumps(valor), expira)
+                )
+                self._conexion.commit()
+
+    def _guardar_en_memoria(self, clave: str, valor, expira):
+        """Inserta una entrada en la LRU y descarta la menos usada si se excede la capacidad."""
+        self._memoria[clave] = (valor, expira)
+        self._memoria.move_to_end(clave)
+        if len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def estadisticas(self) -> dict:
+        """
+        Retorna los contadores de uso de la caché.
+
+        Returns:
+            dict: Aciertos en memoria y disco, fallos, tasa de aciertos y tamaño en memoria.
+        """
+        with self._lock:
+            consultas = self.aciertos_memoria + self.aciertos_disco + self.fallos
+            aciertos = self.aciertos_memoria + self.aciertos_disco
+            return {
+                'aciertos_memoria': self.aciertos_memoria,
+                'aciertos_disco': self.aciertos_disco,
+                'fallos': self.fallos,
+                'tasa_aciertos': aciertos / consultas if consultas else 0.0,
+                'entradas_memoria': len(self._memoria),
+            }
+
+    def limpiar(self):
+        """Elimina todas las entradas en memoria y en disco, y reinicia los contadores."""
+        with self._lock:
+            self._memoria.clear()
+            self.aciertos_memoria = 0
+            self.aciertos_disco = 0
+            self.fallos = 0
+            if self._conexion is not None:
+                self._conexion.execute("DELETE FROM tasas")
+                self._conexion.commit()
+
+    def cerrar(self):
+        """Cierra la conexión con el almacén en disco, si existe."""
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
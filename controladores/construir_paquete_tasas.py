@@ -0,0 +1,35 @@
+"""
+Construye un paquete de tasas (ver paquete_tasas) descargando las tablas de la API.
+
+Uso:
+    python -m controladores.construir_paquete_tasas tasas.paquete --desde 2024-01-01 \\
+        --hasta 2025-12-31 --monedas usd eur mxn cop
+"""
+
+import argparse
+from datetime import date
+
+from .control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from .paquete_tasas import construir_paquete
+
+
+def main():
+    """Construye un paquete de tasas descargando el rango de fechas indicado."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("ruta", help="Archivo del paquete a crear.")
+    parser.add_argument("--desde", type=date.fromisoformat, required=True,
+                        help="Primer día (YYYY-MM-DD).")
+    parser.add_argument("--hasta", type=date.fromisoformat, required=True,
+                        help="Último día (YYYY-MM-DD).")
+    parser.add_argument("--monedas", nargs="+", required=True, help="Monedas a incluir.")
+    parser.add_argument("--base", default="usd", help="Moneda base de las tablas descargadas.")
+    args = parser.parse_args()
+
+    resultado = construir_paquete(args.ruta, args.desde, args.hasta, args.monedas,
+                                  ControlAPIMonedaIntercambio.descargar_tabla, args.base)
+    print(f"Paquete {args.ruta}: {resultado['publicados']} de {resultado['dias']} días "
+          f"publicados.")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,54 +5,341 @@ Este módulo permite obtener la tasa de cambio entre una moneda extranjera y pes
 para una fecha específica, así como realizar conversiones monetarias automáticas. Utiliza la API de
 Fawaz Ahmed para acceder a datos históricos y actuales de tasas de cambio.
 
+Las tablas de tasas obtenidas se guardan completas en una caché de dos niveles (memoria y,
+opcionalmente, disco), por lo que cada fecha solo se descarga una vez para todas las monedas.
+Si se configura un paquete de tasas (ver paquete_tasas), las tasas se leen primero de él, sin
+acceder a la red; solo las monedas o fechas que no cubre se consultan a la API.
+
+Las fechas que la API confirma como no publicadas (404) también se guardan en la caché, de modo
+que retroceder sobre ellas no vuelve a consultarlas. Si el servidor deja de responder, el
+interruptor de circuito del transporte hace que las consultas fallen de inmediato hasta que
+vuelva a estar disponible.
+
 Dependencias:
-    - requests: Para realizar solicitudes HTTP a la API.
+    - requests: Para realizar solicitudes HTTP a la API (a través de TransporteHTTP, que lo
+      importa en la primera consulta).
     - datetime.date: Para manejar fechas asociadas a los gastos.
 """
 
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-import requests
+
+from modelos.dinero import a_centavos, a_unidades, aplicar_tasa as aplicar_tasa_centavos
+
+from .cache_tasas import CacheTasas
+from .metricas import (REGISTRO, TASAS_CONSULTAS, TASAS_ERRORES, TASAS_LATENCIA,
+                       TASAS_NO_PUBLICADAS, TASAS_RECHAZADAS)
+from .paquete_tasas import PaqueteTasas
+from .transporte_http import CircuitoAbiertoError, TransporteHTTP
 
 class ControlAPIMonedaIntercambio:
     """
     Clase para obtener y convertir tasas de cambio usando la API de Fawaz Ahmed.
     """
     moneda_local = "cop"
+    # Dirección de cada tabla diaria; puede apuntarse a otro servidor (por ejemplo, uno local).
+    url_api = ("https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{fecha}/v1/"
+               "currencies/{moneda}.json")
+    dias_retroceso = 7  # intenta con máximo 7 días hacia atrás
+    dias_publicacion = 2  # días tras los que una fecha sin tabla ya no se publicará
+    busqueda_paralela = False
+    cache = CacheTasas()
+    paquete = None
+    transporte = TransporteHTTP()
+    _ejecutor = None
+    _lock_ejecutor = threading.Lock()
+    _en_vuelo = weakref.WeakKeyDictionary()  # bucle de eventos -> {(moneda, fecha): tarea}
+
+    @staticmethod
+    def configurar_busqueda_paralela(activa: bool = True):
+        """
+        Activa o desactiva la consulta simultánea de la fecha y los días anteriores.
+
+        Con la búsqueda paralela, una fecha sin publicar cuesta aproximadamente una sola
+        consulta de latencia en lugar de una por cada día retrocedido.
+
+        Args:
+            activa (bool): True para consultar en paralelo, False para hacerlo día a día.
+        """
+        ControlAPIMonedaIntercambio.busqueda_paralela = activa
+
+    @staticmethod
+    def configurar_transporte(tamano_pool: int = 10, reintentos: int = 3,
+                              factor_espera: float = 0.5, timeout: float = 5,
+                              fallos_para_abrir: int = 5, espera_apertura: float = 30):
+        """
+        Reemplaza el transporte HTTP compartido por uno con la configuración indicada.
+
+        Args:
+            tamano_pool (int): Conexiones persistentes por servidor.
+            reintentos (int): Reintentos máximos ante tiempos de espera y errores 5xx.
+            factor_espera (float): Factor de la espera exponencial entre reintentos.
+            timeout (float): Segundos máximos de espera por cada intento.
+            fallos_para_abrir (int): Consultas fallidas seguidas que abren el circuito.
+            espera_apertura (float): Segundos que el circuito permanece abierto.
+
+        Returns:
+            TransporteHTTP: El transporte configurado.
+        """
+        ControlAPIMonedaIntercambio.transporte.cerrar()
+        ControlAPIMonedaIntercambio.transporte = TransporteHTTP(
+            tamano_pool, reintentos, factor_espera, timeout, fallos_para_abrir, espera_apertura
+        )
+        return ControlAPIMonedaIntercambio.transporte
+
+    @staticmethod
+    def configurar_cache(capacidad: int = 1024, ruta: str = None, ttl_hoy: float = 3600):
+        """
+        Reemplaza la caché de tasas por una nueva con la configuración indicada.
+
+        Args:
+            capacidad (int): Número máximo de tablas diarias en memoria.
+            ruta (str | None): Archivo SQLite donde persistir las tasas entre ejecuciones.
+            ttl_hoy (float): Segundos de vida de las tasas de la fecha actual o futuras.
+
+        Returns:
+            CacheTasas: La caché configurada.
+        """
+        ControlAPIMonedaIntercambio.cache.cerrar()
+        ControlAPIMonedaIntercambio.cache = CacheTasas(capacidad, ruta, ttl_hoy)
+        return ControlAPIMonedaIntercambio.cache
+
+    @staticmethod
+    def configurar_paquete(ruta: str = None):
+        """
+        Usa un paquete de tasas históricas como primera fuente de tasas.
+
+        Args:
+            ruta (str | None): Archivo del paquete; None deja de usar el paquete actual.
+
+        Returns:
+            PaqueteTasas | None: El paquete abierto.
+        """
+        if ControlAPIMonedaIntercambio.paquete is not None:
+            ControlAPIMonedaIntercambio.paquete.cerrar()
+        ControlAPIMonedaIntercambio.paquete = PaqueteTasas(ruta) if ruta is not None else None
+        return ControlAPIMonedaIntercambio.paquete
+
+    @staticmethod
+    def estadisticas_cache() -> dict:
+        """
+        Retorna los contadores de aciertos y fallos de la caché de tasas.
+
+        Returns:
+            dict: Estadísticas de uso de la caché.
+        """
+        return ControlAPIMonedaIntercambio.cache.estadisticas()
+
+    @staticmethod
+    def obtener_tabla(moneda_base: str, fecha: date) -> dict:
+        """
+        Retorna la tabla completa de tasas publicada para una fecha.
+
+        Cada respuesta de la API incluye la tasa de la moneda base frente a todas las demás,
+        por lo que la tabla se guarda completa en la caché bajo la fecha solicitada. Cualquier
+        otra conversión para esa misma fecha se resuelve a partir de ella sin nuevas descargas.
+        La entrada vence si la fecha es actual o futura, o si se resolvió con una fecha
+        anterior y la solicitada aún puede publicarse.
+
+        Args:
+            moneda_base (str): Moneda cuyo archivo se descarga si la fecha no está en caché.
+            fecha (date): Fecha solicitada.
+
+        Returns:
+            dict: Diccionario con la moneda base ('base'), la fecha efectiva de publicación
+                  ('fecha') y las tasas frente a cada moneda ('tasas').
+
+        Raises:
+            RuntimeError: Si no se encuentra una tabla válida en los últimos días.
+            ErrorTransporte: Si la consulta falla por un motivo distinto a una fecha inexistente.
+        """
+        moneda_base = moneda_base.lower()
+        clave = f"tabla:{fecha.isoformat()}"
+        tabla = ControlAPIMonedaIntercambio.cache.obtener(clave)
+        if tabla is not None and (tabla['base'] == moneda_base or moneda_base in tabla['tasas']):
+            return tabla
+
+        if ControlAPIMonedaIntercambio.busqueda_paralela:
+            tabla = ControlAPIMonedaIntercambio._buscar_en_paralelo(moneda_base, fecha)
+        else:
+            tabla = ControlAPIMonedaIntercambio._buscar_secuencial(moneda_base, fecha)
+        if tabla is None:
+            raise RuntimeError("No se pudo obtener una tasa de cambio válida en los últimos "
+                               "días.")
+
+        print(f"Tasas de cambio {moneda_base.upper()} descargadas para {tabla['fecha']}")
+        volatil = fecha >= date.today() or (
+            tabla['fecha'] != fecha.isoformat()
+            and ControlAPIMonedaIntercambio._puede_publicarse(fecha)
+        )
+        ControlAPIMonedaIntercambio.cache.guardar(clave, tabla, volatil)
+        return tabla
+
+    @staticmethod
+    def _puede_publicarse(fecha: date) -> bool:
+        """Indica si una fecha sin tabla publicada aún puede publicarse."""
+        return fecha >= date.today() - timedelta(days=ControlAPIMonedaIntercambio.dias_publicacion)
+
+    @staticmethod
+    def descargar_tabla(moneda_base: str, fecha: date):
+        """
+        Descarga la tabla de tasas de una moneda base para una fecha exacta.
+
+        Las fechas no publicadas se recuerdan en la caché (con vencimiento si son recientes,
+        porque aún pueden publicarse) y no se vuelven a consultar.
+
+        Returns:
+            dict | None: Tabla de tasas, o None si la fecha no está publicada (404).
+        """
+        fecha_str = fecha.strftime("%Y-%m-%d")
+        clave_no_publicada = f"no_publicada:{moneda_base}:{fecha_str}"
+        # Las entradas negativas no son consultas de tasas: no cuentan en las estadísticas.
+        if ControlAPIMonedaIntercambio.cache.obtener(clave_no_publicada, contar=False):
+            return None
+
+        url = ControlAPIMonedaIntercambio.url_api.format(fecha=fecha_str, moneda=moneda_base)
+        inicio = time.perf_counter()
+        try:
+            data = ControlAPIMonedaIntercambio.transporte.obtener_json(url)
+        except CircuitoAbiertoError:
+            if REGISTRO.activo:
+                TASAS_RECHAZADAS.etiquetas(moneda_base).inc()
+            raise
+        except Exception:
+            if REGISTRO.activo:
+                TASAS_ERRORES.etiquetas(moneda_base).inc()
+                ControlAPIMonedaIntercambio._medir_consulta(moneda_base, inicio)
+            raise
+        if REGISTRO.activo:
+            ControlAPIMonedaIntercambio._medir_consulta(moneda_base, inicio)
+        if data is None:
+            if REGISTRO.activo:
+                TASAS_NO_PUBLICADAS.etiquetas(moneda_base).inc()
+            ControlAPIMonedaIntercambio.cache.guardar(
+                clave_no_publicada, True, ControlAPIMonedaIntercambio._puede_publicarse(fecha)
+            )
+            return None
+        if moneda_base not in data:
+            raise RuntimeError(f"La respuesta para {fecha_str} no contiene la moneda "
+                               f"{moneda_base.upper()}.")
+        return {'base': moneda_base, 'fecha': fecha_str, 'tasas': data[moneda_base]}
+
+    @staticmethod
+    def _medir_consulta(moneda_base: str, inicio: float):
+        """Cuenta una consulta hecha al servidor y observa su duración."""
+        TASAS_CONSULTAS.etiquetas(moneda_base).inc()
+        TASAS_LATENCIA.etiquetas(moneda_base).observar(time.perf_counter() - inicio)
+
+    @staticmethod
+    def _buscar_secuencial(moneda_base: str, fecha: date):
+        """
+        Consulta la fecha dada y, ante un 404, retrocede un día por vez.
+
+        Returns:
+            dict | None: Tabla de la fecha publicada más reciente, o None si no hay ninguna.
+        """
+        for dias in range(ControlAPIMonedaIntercambio.dias_retroceso):
+            tabla = ControlAPIMonedaIntercambio.descargar_tabla(
+                moneda_base, fecha - timedelta(days=dias)
+            )
+            if tabla is not None:
+                return tabla
+        return None
+
+    @staticmethod
+    def _buscar_en_paralelo(moneda_base: str, fecha: date):
+        """
+        Consulta a la vez la fecha dada y los días anteriores, y se queda con la más reciente.
+
+        Los resultados se revisan en orden de fecha descendente, de modo que el resultado y los
+        errores propagados son los mismos que en la búsqueda secuencial. En cuanto se encuentra
+        una tabla se cancelan las consultas que aún no han empezado; las que ya están en curso
+        terminan en segundo plano y su resultado se descarta.
+
+        Returns:
+            dict | None: Tabla de la fecha publicada más reciente, o None si no hay ninguna.
+        """
+        ejecutor = ControlAPIMonedaIntercambio._obtener_ejecutor()
+        futuros = [
+            ejecutor.submit(ControlAPIMonedaIntercambio.descargar_tabla,
+                            moneda_base, fecha - timedelta(days=dias))
+            for dias in range(ControlAPIMonedaIntercambio.dias_retroceso)
+        ]
+        try:
+            for futuro in futuros:
+                tabla = futuro.result()
+                if tabla is not None:
+                    return tabla
+            return None
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+
+    @staticmethod
+    def _obtener_ejecutor() -> ThreadPoolExecutor:
+        """Crea, la primera vez que se necesita, el pool de hilos para la búsqueda paralela."""
+        with ControlAPIMonedaIntercambio._lock_ejecutor:
+            if ControlAPIMonedaIntercambio._ejecutor is None:
+                ControlAPIMonedaIntercambio._ejecutor = ThreadPoolExecutor(
+                    max_workers=ControlAPIMonedaIntercambio.dias_retroceso,
+                    thread_name_prefix="tasas"
+                )
+            return ControlAPIMonedaIntercambio._ejecutor
+
+    @staticmethod
+    def obtener_tasa(moneda_origen: str, moneda_destino: str, fecha: date) -> float:
+        """
+        Calcula la tasa entre dos monedas cualesquiera para una fecha.
+
+        Si hay un paquete de tasas que cubre ambas monedas y la fecha, la tasa se lee de él.
+        Si no, se usa la tabla de la fecha, sea cual sea su moneda base: las tasas directas,
+        inversas y cruzadas se obtienen dividiendo las tasas de ambas monedas frente a la base.
+
+        Args:
+            moneda_origen (str): Moneda de la que se convierte.
+            moneda_destino (str): Moneda a la que se convierte.
+            fecha (date): Fecha de la conversión.
+
+        Returns:
+            float: Unidades de la moneda destino por cada unidad de la moneda origen.
+
+        Raises:
+            RuntimeError: Si la tabla de la fecha no contiene alguna de las monedas.
+        """
+        moneda_origen = moneda_origen.lower()
+        moneda_destino = moneda_destino.lower()
+        paquete = ControlAPIMonedaIntercambio.paquete
+        if paquete is not None:
+            tasa = paquete.tasa(moneda_origen, moneda_destino, fecha,
+                                ControlAPIMonedaIntercambio.dias_retroceso)
+            if tasa is not None:
+                return tasa
+        tabla = ControlAPIMonedaIntercambio.obtener_tabla(moneda_origen, fecha)
+        tasas = tabla['tasas']
+
+        def tasa_frente_a_base(moneda):
+            if moneda == tabla['base']:
+                return 1.0
+            if moneda not in tasas:
+                raise RuntimeError(f"La moneda {moneda.upper()} no está en la tabla de {fecha}.")
+            return tasas[moneda]
+
+        return tasa_frente_a_base(moneda_destino) / tasa_frente_a_base(moneda_origen)
 
     @staticmethod
     def obtener_tasa_cambio(moneda_destino: str, fecha: date) -> float:
         """
         Intenta obtener la tasa de cambio para la fecha dada, y si no existe,
         retrocede un día hasta encontrar una fecha válida.
+
+        La tasa se calcula a partir de la tabla de la fecha guardada en caché; solo si no
+        está se descarga de la API.
         """
-        moneda_destino = moneda_destino.lower()
-        intentos = 7  # intenta con máximo 7 días hacia atrás
-        while intentos > 0:
-            fecha_str = fecha.strftime("%Y-%m-%d")
-            url = (
-                f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{fecha_str}/v1/"
-                f"currencies/{moneda_destino}.json"
-            )
-            try:
-                response = requests.get(url, timeout=5)
-                response.raise_for_status()
-                data = response.json()
-                tasa = data[moneda_destino][ControlAPIMonedaIntercambio.moneda_local]
-                print(f"Tasa de cambio {moneda_destino.upper()} -> COP en {fecha_str}: {tasa}")
-                return round(tasa, 2)
-
-            except requests.exceptions.HTTPError as e:
-                if response.status_code == 404:
-                    fecha -= timedelta(days=1)
-                    intentos -= 1
-                    continue  # intenta con un día anterior
-                else:
-                    print(f"[ERROR] Error HTTP: {e}")
-            except Exception as e:
-                print(f"[ERROR] Otro error: {e}")
-                break
-
-        raise RuntimeError("No se pudo obtener una tasa de cambio válida en los últimos días.")
+        moneda = ControlAPIMonedaIntercambio.moneda_local
+        return round(ControlAPIMonedaIntercambio.obtener_tasa(moneda_destino, moneda, fecha), 2)
 
     @staticmethod
     def convertir_moneda(moneda_destino: str, valor: float, fecha: date) -> float:
@@ -60,4 +347,56 @@ class ControlAPIMonedaIntercambio:
         Convierte un monto a COP usando la tasa de cambio más cercana disponible.
         """
         tasa = ControlAPIMonedaIntercambio.obtener_tasa_cambio(moneda_destino, fecha)
-        return round(valor * tasa, 2)
+        return ControlAPIMonedaIntercambio.aplicar_tasa(valor, tasa)
+
+    @staticmethod
+    def aplicar_tasa(valor: float, tasa: float) -> float:
+        """
+        Convierte un monto con una tasa ya obtenida, redondeando al centavo más cercano.
+
+        El redondeo se hace sobre enteros de centavos (ver dinero), con las mitades
+        alejándose de cero, en lugar de redondear el producto en float.
+        """
+        return a_unidades(aplicar_tasa_centavos(a_centavos(valor), tasa))
+
+    @staticmethod
+    async def obtener_tasa_cambio_async(moneda_destino: str, fecha: date) -> float:
+        """
+        Versión asíncrona de `obtener_tasa_cambio`.
+
+        La consulta bloqueante se ejecuta en el pool de hilos del bucle de eventos. Las
+        solicitudes concurrentes para la misma moneda y fecha comparten una única consulta
+        en curso, de modo que solo se realiza una descarga por combinación.
+
+        Args:
+            moneda_destino (str): Moneda a convertir a COP.
+            fecha (date): Fecha de la conversión.
+
+        Returns:
+            float: Tasa de cambio a COP redondeada a dos decimales.
+        """
+        # Importación diferida: quien llama ya tiene un bucle de eventos, así que asyncio está
+        # cargado; el resto de la aplicación no lo necesita al iniciar.
+        import asyncio
+
+        moneda_destino = moneda_destino.lower()
+        bucle = asyncio.get_running_loop()
+        en_vuelo = ControlAPIMonedaIntercambio._en_vuelo.setdefault(bucle, {})
+        clave = (moneda_destino, fecha)
+        tarea = en_vuelo.get(clave)
+        if tarea is None:
+            tarea = bucle.create_task(asyncio.to_thread(
+                ControlAPIMonedaIntercambio.obtener_tasa_cambio, moneda_destino, fecha
+            ))
+            en_vuelo[clave] = tarea
+            tarea.add_done_callback(lambda _: en_vuelo.pop(clave, None))
+        # shield evita que la cancelación de un solicitante cancele la consulta compartida
+        return await asyncio.shield(tarea)
+
+    @staticmethod
+    async def convertir_moneda_async(moneda_destino: str, valor: float, fecha: date) -> float:
+        """
+        Versión asíncrona de `convertir_moneda`.
+        """
+        tasa = await ControlAPIMonedaIntercambio.obtener_tasa_cambio_async(moneda_destino, fecha)
+        return ControlAPIMonedaIntercambio.aplicar_tasa(valor, tasa)
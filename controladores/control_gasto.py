@@ -1,12 +1,21 @@
 """"
 Controlador de gastos para un viaje.
 """
+import time
+from itertools import islice
+
 from enums.tipo_gasto import TipoGasto
 from enums.medio_pago import MedioPago
 from enums.tipo_viaje import TipoViaje  # ✅ Importación necesaria
 from modelos.viaje import Viaje
 from modelos.gasto import Gasto
+from modelos.dinero import a_unidades, formatear
 from .control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from .lector_gastos import FilaInvalida
+from .transporte_http import ErrorTransporte
+from .metricas import REGISTRO, GASTOS_REGISTRADOS
+
+MAX_ERRORES_REPORTADOS = 100
 
 class ViajeFinalizadoError(Exception):
     """Se lanza cuando se intenta registrar un gasto en un viaje finalizado.""" 
@@ -65,20 +74,177 @@ class ControlGasto:
         else:
             valor_cop = valor
 
+        self._agregar_gasto(fecha, valor, medio_pago, tipo_gasto, valor_cop)
+
+    async def registrar_gasto_async(self, fecha, valor: float, medio_pago: MedioPago,
+                                    tipo_gasto: TipoGasto):
+        """
+        Versión asíncrona de `registrar_gasto`.
+
+        La conversión de moneda no bloquea el bucle de eventos, por lo que pueden registrarse
+        muchos gastos concurrentemente; los que comparten moneda y fecha usan una sola consulta.
+
+        Args:
+            fecha: Fecha del gasto.
+            valor (float): Valor original del gasto.
+            medio_pago (MedioPago): Medio de pago utilizado.
+            tipo_gasto (TipoGasto): Tipo del gasto.
+
+        Raises:
+            ViajeFinalizadoError: Si el viaje ya fue finalizado.
+        """
+        if not self.viaje.estado_viaje:
+            raise ViajeFinalizadoError("El viaje ha finalizado, no se pueden registrar más gastos.")
+
+        if self.viaje.tipo_viaje == TipoViaje.INTERNACIONAL:
+            moneda_destino = self.viaje.destino.get_moneda_local()
+            valor_cop = await ControlAPIMonedaIntercambio.convertir_moneda_async(
+                moneda_destino, valor, fecha
+            )
+        else:
+            valor_cop = valor
+
+        self._agregar_gasto(fecha, valor, medio_pago, tipo_gasto, valor_cop)
+
+    def registrar_gastos_lote(self, filas, tamano_lote: int = 10000) -> dict:
+        """
+        Registra un gran número de gastos leídos, por ejemplo, con `lector_gastos.leer_archivo`.
+
+        Las filas se consumen por lotes de `tamano_lote`, por lo que la memoria usada no
+        depende del tamaño del archivo. En cada lote, la tasa de cambio se resuelve una sola vez
+        por fecha (la moneda es la del destino del viaje) y se reutiliza en los lotes
+        siguientes. Si la consulta falla por un error de red, la fecha se vuelve a consultar en
+        el siguiente lote que la contenga; las filas sin tasa se cuentan aparte de las filas
+        inválidas. Los gastos de cada lote se agregan al viaje de una sola vez y, en lugar de
+        informar cada gasto, al final se imprime un resumen.
+
+        Args:
+            filas (iterable[FilaGasto | FilaInvalida]): Filas a registrar.
+            tamano_lote (int): Número de filas procesadas por lote.
+
+        Returns:
+            dict: Resumen con los gastos registrados, rechazados por inválidos y sin tasa de
+                  cambio disponible, el total en COP, las tasas consultadas, los segundos
+                  empleados y los primeros errores encontrados.
+
+        Raises:
+            ViajeFinalizadoError: Si el viaje ya fue finalizado.
+        """
+        if not self.viaje.estado_viaje:
+            raise ViajeFinalizadoError("El viaje ha finalizado, no se pueden registrar más gastos.")
+
+        inicio = time.perf_counter()
+        internacional = self.viaje.tipo_viaje == TipoViaje.INTERNACIONAL
+        moneda_destino = self.viaje.destino.get_moneda_local()
+        tasas = {}  # fecha -> tasa, o el error definitivo obtenido al consultarla
+        resumen = {'registrados': 0, 'rechazados': 0, 'sin_tasa': 0, 'total_cop': 0,
+                   'tasas_consultadas': 0, 'segundos': 0.0, 'errores': []}
+        total_centavos = 0
+
+        def rechazar(linea, motivo, contador='rechazados'):
+            resumen[contador] += 1
+            if len(resumen['errores']) < MAX_ERRORES_REPORTADOS:
+                resumen['errores'].append((linea, str(motivo)))
+
+        filas = iter(filas)
+        while True:
+            lote = list(islice(filas, tamano_lote))
+            if not lote:
+                break
+
+            fallidas = {}  # fecha -> error de red de este lote; no se memoriza
+            if internacional:
+                for fecha in {fila.fecha for fila in lote if not isinstance(fila, FilaInvalida)}:
+                    if fecha not in tasas:
+                        resumen['tasas_consultadas'] += 1
+                        try:
+                            tasas[fecha] = ControlAPIMonedaIntercambio.obtener_tasa_cambio(
+                                moneda_destino, fecha
+                            )
+                        except ErrorTransporte as e:
+                            fallidas[fecha] = e
+                        except RuntimeError as e:
+                            tasas[fecha] = e
+
+            gastos = []
+            for fila in lote:
+                if isinstance(fila, FilaInvalida):
+                    rechazar(fila.linea, fila.motivo)
+                    continue
+                if internacional:
+                    tasa = fallidas.get(fila.fecha) or tasas[fila.fecha]
+                    if isinstance(tasa, Exception):
+                        rechazar(fila.linea, tasa, 'sin_tasa')
+                        continue
+                    valor_cop = ControlAPIMonedaIntercambio.aplicar_tasa(fila.valor, tasa)
+                else:
+                    valor_cop = fila.valor
+                try:
+                    gasto = Gasto(fila.fecha, fila.valor, fila.medio_pago, fila.tipo_gasto,
+                                  valor_cop)
+                except (TypeError, ValueError) as e:
+                    rechazar(fila.linea, e)
+                    continue
+                gastos.append(gasto)
+                total_centavos += gasto.get_centavos_cop()
+
+            try:
+                self.viaje.agregar_gastos(gastos)
+            except RuntimeError as e:
+                self._verificar_no_finalizado(e)
+                raise
+            resumen['registrados'] += len(gastos)
+            if REGISTRO.activo:
+                GASTOS_REGISTRADOS.etiquetas(self.viaje.tipo_viaje.name).inc(len(gastos))
+
+        resumen['segundos'] = time.perf_counter() - inicio
+        resumen['total_cop'] = a_unidades(total_centavos)
+        print(
+            f"Importación terminada: {resumen['registrados']} gastos registrados "
+            f"({formatear(total_centavos)} COP), {resumen['rechazados']} rechazados, "
+            f"{resumen['sin_tasa']} sin tasa de cambio, "
+            f"{resumen['tasas_consultadas']} tasas consultadas en {resumen['segundos']:.2f} s"
+        )
+        return resumen
+
+    def _verificar_no_finalizado(self, error: Exception):
+        """
+        Traduce el error de un viaje finalizado en otro hilo después de la verificación inicial.
+
+        Raises:
+            ViajeFinalizadoError: Si el viaje ya está finalizado.
+        """
+        if not self.viaje.estado_viaje:
+            raise ViajeFinalizadoError(
+                "El viaje ha finalizado, no se pueden registrar más gastos."
+            ) from error
+
+    def _agregar_gasto(self, fecha, valor: float, medio_pago: MedioPago,
+                       tipo_gasto: TipoGasto, valor_cop: float):
+        """
+        Crea el gasto ya convertido a COP, lo agrega al viaje e informa el presupuesto restante.
+        """
         gasto = Gasto(fecha, valor, medio_pago, tipo_gasto, valor_cop)
-        self.viaje.agregar_gasto(gasto)
+        try:
+            self.viaje.agregar_gasto(gasto)
+        except RuntimeError as e:
+            self._verificar_no_finalizado(e)
+            raise
+        if REGISTRO.activo:
+            GASTOS_REGISTRADOS.etiquetas(self.viaje.tipo_viaje.name).inc()
 
         print(
-            f"Se registró un gasto de {valor} {self.viaje.destino.get_moneda_local()} "
-            f"-> {valor_cop} COP"
+            f"Se registró un gasto de {formatear(gasto.get_centavos())} "
+            f"{self.viaje.destino.get_moneda_local()} "
+            f"-> {formatear(gasto.get_centavos_cop())} COP"
         )
-        diferencia = self.calcular_diferencia_presupuesto(fecha)
+        diferencia = self._diferencia_presupuesto_centavos(fecha)
         if diferencia > 0:
-            print(f"Presupuesto restante para {fecha}: {diferencia} COP")
+            print(f"Presupuesto restante para {fecha}: {formatear(diferencia)} COP")
         elif diferencia == 0:
             print(f"Presupuesto agotado para {fecha}")
         else:
-            print(f"Presupuesto excedido para {fecha} por {-diferencia} COP")
+            print(f"Presupuesto excedido para {fecha} por {formatear(-diferencia)} COP")
 
     def calcular_diferencia_presupuesto(self, fecha) -> float:
         """
@@ -93,12 +259,16 @@ class ControlGasto:
         Raises:
             ValueError: Si el presupuesto diario o algún gasto es negativo.
         """
-        if self.viaje.presupuesto_diario < 0:
+        return a_unidades(self._diferencia_presupuesto_centavos(fecha))
+
+    def _diferencia_presupuesto_centavos(self, fecha) -> int:
+        """Versión de `calcular_diferencia_presupuesto` en centavos, con la misma validación."""
+        if self.viaje.presupuesto_centavos < 0:
             raise ValueError("El presupuesto diario no puede ser negativo.")
 
-        total_cop = self.viaje.calcular_gasto_diario(fecha)
+        total_centavos = self.viaje.get_resumen().total_fecha(fecha)
 
-        if total_cop < 0:
+        if total_centavos < 0:
             raise ValueError("No se permiten gastos negativos.")
 
-        return self.viaje.presupuesto_diario - total_cop
+        return self.viaje.presupuesto_centavos - total_centavos
@@ -0,0 +1,180 @@
+"""
+Seguimiento incremental del presupuesto de un viaje, con alertas al cruzar umbrales.
+
+El control se suscribe como observador del viaje y, en cada gasto agregado, eliminado o
+reemplazado, actualiza en O(1) el presupuesto restante del día afectado y el del viaje completo
+(`presupuesto_diario` por cada día entre `fecha_inicio` y `fecha_fin`). El total del día se lee
+de los agregados del viaje, y el acumulado del viaje se mantiene aquí. Todos los totales se
+llevan en centavos (ver dinero), así que el acumulado no deriva tras muchas actualizaciones;
+los montos se entregan en unidades.
+
+Para cada día y para el viaje se recuerda el último nivel alcanzado (menos del 80 %, 80 %,
+100 % o excedido). Cuando un gasto lo hace subir, se avisa a los suscriptores una vez por cada
+umbral cruzado; si una eliminación lo hace bajar, el umbral puede volver a avisarse al cruzarlo
+otra vez. Los avisos se entregan dentro del lock del viaje, como cualquier observador, así que
+los suscriptores deben ser rápidos, sin E/S (main encola las alertas y las muestra después de
+cada operación), y no deben esperar a otros hilos ni modificar otros viajes.
+"""
+
+from collections import namedtuple
+
+from modelos.dinero import a_unidades
+
+from modelos.viaje import Viaje
+
+from .metricas import REGISTRO, PRESUPUESTO_EXCEDIDO
+
+UMBRAL_80 = '80%'
+UMBRAL_100 = '100%'
+EXCEDIDO = 'excedido'
+# Umbrales en orden; el nivel de un ámbito es la cantidad de umbrales alcanzados.
+UMBRALES = (UMBRAL_80, UMBRAL_100, EXCEDIDO)
+FRACCION_ALERTA = 0.8
+
+# `fecha` es None cuando el umbral cruzado es el del viaje completo.
+AlertaPresupuesto = namedtuple(
+    'AlertaPresupuesto', ['viaje', 'fecha', 'umbral', 'gastado', 'presupuesto']
+)
+
+
+def nivel_presupuesto(gastado: int, presupuesto: int) -> int:
+    """
+    Retorna cuántos umbrales alcanza un gasto respecto a un presupuesto.
+
+    Returns:
+        int: 0 (menos del 80 %), 1 (80 %), 2 (100 %) o 3 (excedido).
+    """
+    if gastado > presupuesto:
+        return 3
+    if gastado >= presupuesto:
+        return 2
+    if gastado >= presupuesto * FRACCION_ALERTA:
+        return 1
+    return 0
+
+
+class ControlPresupuesto:
+    """
+    Mantiene el presupuesto restante por día y del viaje completo y avisa al cruzar umbrales.
+
+    Atributos:
+        viaje (Viaje): Viaje observado.
+        presupuesto_total (float): Presupuesto diario multiplicado por los días del viaje.
+        gastado (float): Total en COP de los gastos del viaje.
+    """
+
+    def __init__(self, viaje: Viaje):
+        """
+        Calcula el estado inicial a partir de los agregados del viaje y se suscribe a él.
+
+        Los umbrales que el viaje ya haya alcanzado no se avisan.
+
+        Args:
+            viaje (Viaje): Viaje a seguir.
+        """
+        self.viaje = viaje
+        self._suscriptores = ()
+        with viaje.bloqueo:
+            dias = (viaje.fecha_fin - viaje.fecha_inicio).days + 1
+            self._presupuesto_total = viaje.presupuesto_centavos * dias
+            resumen = viaje.get_resumen()
+            self._gastado = sum(resumen.por_medio.values())
+            self._nivel_viaje = nivel_presupuesto(self._gastado, self._presupuesto_total)
+            self._nivel_por_dia = {
+                fecha: nivel_presupuesto(datos['total'], viaje.presupuesto_centavos)
+                for fecha, datos in resumen.por_fecha.items()
+            }
+            viaje.agregar_observador(self)
+
+    @property
+    def presupuesto_total(self) -> float:
+        """Presupuesto diario multiplicado por los días del viaje."""
+        return a_unidades(self._presupuesto_total)
+
+    @property
+    def gastado(self) -> float:
+        """Total en COP de los gastos del viaje."""
+        return a_unidades(self._gastado)
+
+    def suscribir(self, suscriptor):
+        """
+        Agrega un invocable que recibe una AlertaPresupuesto por cada umbral cruzado.
+
+        Args:
+            suscriptor (callable): Función a llamar con la alerta.
+        """
+        self._suscriptores = self._suscriptores + (suscriptor,)
+
+    def desconectar(self):
+        """Deja de observar el viaje."""
+        self.viaje.quitar_observador(self)
+
+    def restante_dia(self, fecha) -> float:
+        """
+        Retorna el presupuesto que queda para una fecha (negativo si se excedió).
+
+        Args:
+            fecha (date): Fecha a consultar.
+
+        Returns:
+            float: Presupuesto diario menos el total en COP de la fecha.
+        """
+        return a_unidades(self.viaje.presupuesto_centavos
+                          - self.viaje.get_resumen().total_fecha(fecha))
+
+    def restante_viaje(self) -> float:
+        """
+        Retorna el presupuesto que queda para todo el viaje (negativo si se excedió).
+
+        Returns:
+            float: Presupuesto total menos el total en COP gastado.
+        """
+        return a_unidades(self._presupuesto_total - self._gastado)
+
+    def __call__(self, evento: str, viaje: Viaje, *datos):
+        """Observador del viaje: actualiza los totales afectados por el evento."""
+        if evento == 'gasto_agregado':
+            gasto, = datos
+            self._actualizar(gasto.get_centavos_cop(), (gasto.get_fecha(),))
+        elif evento == 'gastos_agregados':
+            gastos, = datos
+            self._actualizar(sum(gasto.get_centavos_cop() for gasto in gastos),
+                             {gasto.get_fecha() for gasto in gastos})
+        elif evento == 'gasto_eliminado':
+            gasto, = datos
+            self._actualizar(-gasto.get_centavos_cop(), (gasto.get_fecha(),))
+        elif evento == 'gasto_reemplazado':
+            anterior, nuevo = datos
+            self._actualizar(nuevo.get_centavos_cop() - anterior.get_centavos_cop(),
+                             {anterior.get_fecha(), nuevo.get_fecha()})
+
+    def _actualizar(self, diferencia: int, fechas):
+        """Suma la diferencia (en centavos) al acumulado y revisa los umbrales."""
+        self._gastado += diferencia
+        nivel = nivel_presupuesto(self._gastado, self._presupuesto_total)
+        anterior, self._nivel_viaje = self._nivel_viaje, nivel
+        if nivel > anterior:
+            self._avisar(None, anterior, nivel, self._gastado, self._presupuesto_total)
+
+        presupuesto = self.viaje.presupuesto_centavos
+        resumen = self.viaje.get_resumen()
+        for fecha in fechas:
+            gastado = resumen.total_fecha(fecha)
+            nivel = nivel_presupuesto(gastado, presupuesto) if gastado else 0
+            anterior = self._nivel_por_dia.get(fecha, 0)
+            if nivel:
+                self._nivel_por_dia[fecha] = nivel
+            else:
+                self._nivel_por_dia.pop(fecha, None)
+            if nivel > anterior:
+                self._avisar(fecha, anterior, nivel, gastado, presupuesto)
+
+    def _avisar(self, fecha, anterior: int, nivel: int, gastado: int, presupuesto: int):
+        """Entrega una alerta (con los montos en unidades) por cada umbral cruzado."""
+        if nivel == len(UMBRALES) and REGISTRO.activo:
+            PRESUPUESTO_EXCEDIDO.etiquetas('viaje' if fecha is None else 'dia').inc()
+        for umbral in UMBRALES[anterior:nivel]:
+            alerta = AlertaPresupuesto(self.viaje, fecha, umbral, a_unidades(gastado),
+                                       a_unidades(presupuesto))
+            for suscriptor in self._suscriptores:
+                suscriptor(alerta)
@@ -4,14 +4,120 @@
     Proporciona métodos estáticos para calcular estadísticas de gastos por fecha y por tipo,
     diferenciando los medios de pago utilizados (efectivo o tarjeta). Los reportes generados 
     pueden usarse para evaluar el comportamiento financiero del usuario durante el viaje.
+
+    Los totales se mantienen actualizados en el viaje a medida que se agregan gastos, por lo que
+    cada reporte es una copia de esos agregados y no un recorrido de todos los gastos. La copia
+    se hace con el lock del viaje tomado, así que un reporte nunca mezcla un gasto a medio sumar.
+
+    Los reportes por rango (`iterar_reporte_diario`, `iterar_reporte_fecha_tipo`) son
+    generadores: entregan una fila por día en orden cronológico y calculan cada fila solo
+    cuando se pide, de modo que mostrar la primera página de un viaje largo no exige agregar
+    todo su historial. El rango se ubica con búsqueda binaria sobre el índice de fechas.
+
+    El reporte de flota agrupa los gastos de muchos viajes repartiéndolos en particiones que se
+    procesan en un `ProcessPoolExecutor`. A cada proceso se le envían los gastos de su partición
+    como los bloques de bytes de los arreglos columnares de cada viaje (no como objetos Gasto);
+    el proceso los concatena columna por columna, y cada uno devuelve
+    reportes parciales con la misma forma que `generar_reportes`, y los parciales se combinan
+    sumando hoja por hoja, una operación asociativa que no depende del orden de llegada.
+
+    Los agregados y los reportes parciales están en centavos de COP (enteros), así que sumarlos
+    es exacto; cada reporte se convierte a unidades (float) solo al entregarlo.
 """
 
-from enums.medio_pago import MedioPago
+import os
+from datetime import date
 
-from enums.tipo_gasto import TipoGasto
+from modelos.almacen_columnar import AlmacenGastosColumnar
+
+from modelos.dinero import reporte_a_unidades
+
+from modelos.resumen_gastos import ResumenGastos
 
 from modelos.viaje import Viaje
 
+from .metricas import REPORTE_DURACION
+
+# Reportes cuyas claves son fechas y que se entregan en orden cronológico.
+REPORTES_POR_FECHA = ('diario', 'fecha_tipo')
+# Series del histograma de duración de cada reporte, resueltas una sola vez.
+_DURACION_REPORTE = {
+    reporte: REPORTE_DURACION.etiquetas(reporte)
+    for reporte in ('diario', 'por_tipo', 'por_medio', 'fecha_tipo', 'todos', 'recalculo',
+                    'repositorio', 'flota')
+}
+
+
+def combinar_reportes(acumulado: dict, parcial: dict) -> dict:
+    """
+    Suma en `acumulado` los montos de otros reportes con la misma forma.
+
+    Los diccionarios anidados se combinan clave por clave y los montos se suman, así que
+    combinar parciales en cualquier orden o agrupación da el mismo resultado.
+
+    Args:
+        acumulado (dict): Reportes donde se acumula; se modifica.
+        parcial (dict): Reportes a sumar; no se modifica.
+
+    Returns:
+        dict: El mismo diccionario `acumulado`.
+    """
+    for clave, valor in parcial.items():
+        if isinstance(valor, dict):
+            combinar_reportes(acumulado.setdefault(clave, {}), valor)
+        else:
+            acumulado[clave] = acumulado.get(clave, 0) + valor
+    return acumulado
+
+
+def _reportes_particion(bloques_viajes: list) -> dict:
+    """
+    Calcula los reportes de una partición enviada como los bloques de `_bloques_viaje` de
+    cada uno de sus viajes.
+
+    Se ejecuta en los procesos del pool, por lo que está a nivel de módulo. Los bloques de
+    todos los viajes se concatenan columna por columna, sin recorrer los gastos.
+    """
+    almacen = AlmacenGastosColumnar.desde_bytes(
+        b"".join(bloques) for bloques in zip(*bloques_viajes)
+    )
+    return ControlReporte._reportes_de(ResumenGastos.desde_gastos(almacen))
+
+
+def _bloques_viaje(viaje) -> tuple:
+    """
+    Retorna los gastos de un viaje como bloques de `AlmacenGastosColumnar.a_bytes`.
+
+    Si el viaje ya guarda sus gastos en un almacén columnar, sus arreglos se copian en bloque;
+    solo los viajes con una lista de Gasto se recorren gasto por gasto.
+    """
+    with viaje.bloqueo:
+        gastos = viaje.get_gastos()
+        if isinstance(gastos, AlmacenGastosColumnar):
+            return gastos.a_bytes()
+        gastos = list(gastos)
+    return AlmacenGastosColumnar(gastos).a_bytes()
+
+
+def _particionar(viajes: list, particiones: int) -> list:
+    """
+    Reparte los viajes en grupos consecutivos con una cantidad de gastos parecida.
+
+    Returns:
+        list[list[Viaje]]: A lo sumo `particiones` grupos, ninguno vacío.
+    """
+    total = sum(len(viaje.get_gastos()) for viaje in viajes)
+    objetivo = max(1, -(-total // particiones))
+    grupos = [[]]
+    acumulado = 0
+    for viaje in viajes:
+        if acumulado >= objetivo and len(grupos) < particiones:
+            grupos.append([])
+            acumulado = 0
+        grupos[-1].append(viaje)
+        acumulado += len(viaje.get_gastos())
+    return [grupo for grupo in grupos if grupo]
+
 class ControlReporte:
     """
     Clase encargada de generar reportes sobre los gastos realizados durante un viaje.
@@ -21,28 +127,56 @@ class ControlReporte:
     def calcular_reporte_gastos_todos_los_dias(_, viaje: Viaje) -> dict:
         """
         Calcula un reporte diario de gastos, diferenciando entre efectivo y tarjeta.
+
+        El reporte es una copia de los agregados por fecha del viaje; modificarlo no
+        altera el viaje.
         """
-        reporte = {}
-        for gasto in viaje.get_gastos():
-            fecha = gasto.get_fecha()
-            if fecha not in reporte:
-                reporte[fecha] = {'efectivo': 0, 'tarjetas': 0, 'total': 0}
+        with _DURACION_REPORTE['diario'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(viaje.get_resumen().por_fecha)
 
-            medio = gasto.get_medio_pago()
-            valor = gasto.get_valor_moneda_local_cop()
+    @staticmethod
+    def iterar_reporte_diario(viaje: Viaje, desde: date = None, hasta: date = None):
+        """
+        Recorre el reporte diario en orden cronológico, opcionalmente dentro de [desde, hasta].
 
-            if medio.name == "EFECTIVO":
-                reporte[fecha]['efectivo'] += valor
-            elif medio.name in ("TARJETA_DEBITO", "TARJETA_CREDITO"):
-                reporte[fecha]['tarjetas'] += valor
-            else:
-                raise ValueError(f"Medio de pago desconocido: {medio}")
+        Cada fila se copia con el lock del viaje tomado solo mientras se copia; un día que
+        se quede sin gastos mientras se recorre se omite.
 
-            reporte[fecha]['total'] += valor
+        Args:
+            viaje (Viaje): Viaje del cual se extraen los gastos.
+            desde (date | None): Primera fecha incluida; sin límite si es None.
+            hasta (date | None): Última fecha incluida; sin límite si es None.
+
+        Yields:
+            tuple: (fecha, {'efectivo', 'tarjetas', 'total'}).
+        """
+        yield from ControlReporte._iterar_filas(viaje, desde, hasta, 'fila_diaria')
+
+    @staticmethod
+    def iterar_reporte_fecha_tipo(viaje: Viaje, desde: date = None, hasta: date = None):
+        """
+        Recorre el desglose por fecha y tipo en orden cronológico dentro de [desde, hasta].
 
-        return reporte
+        Args:
+            viaje (Viaje): Viaje del cual se extraen los gastos.
+            desde (date | None): Primera fecha incluida; sin límite si es None.
+            hasta (date | None): Última fecha incluida; sin límite si es None.
 
+        Yields:
+            tuple: (fecha, nombre del tipo -> {'efectivo', 'tarjetas', 'total'}).
+        """
+        yield from ControlReporte._iterar_filas(viaje, desde, hasta, 'fila_fecha_tipo')
 
+    @staticmethod
+    def _iterar_filas(viaje: Viaje, desde, hasta, fila: str):
+        """Entrega (fecha, fila) para cada fecha del rango, usando el método `fila` del resumen."""
+        with viaje.bloqueo:
+            fechas = viaje.get_resumen().fechas_en_rango(desde, hasta)
+        for fecha in fechas:
+            with viaje.bloqueo:
+                datos = getattr(viaje.get_resumen(), fila)(fecha)
+            if datos is not None:
+                yield fecha, reporte_a_unidades(datos)
 
     @staticmethod
     def reporte_por_tipo(viaje: Viaje) -> dict:
@@ -57,15 +191,146 @@ class ControlReporte:
             dict: Diccionario donde cada clave es un tipo de gasto y el valor es otro
                   diccionario con los montos totales por medio de pago y el total general.
         """
-        reporte = {}
-        for tipo in TipoGasto:
-            reporte[tipo.name] = {'efectivo': 0, 'tarjetas': 0, 'total': 0}
-
-        for gasto in viaje.get_gastos():
-            tipo = gasto.get_tipo_gasto().name
-            if gasto.get_medio_pago() == MedioPago.EFECTIVO:
-                reporte[tipo]['efectivo'] += gasto.get_valor_moneda_local_cop()
-            else:
-                reporte[tipo]['tarjetas'] += gasto.get_valor_moneda_local_cop()
-            reporte[tipo]['total'] += gasto.get_valor_moneda_local_cop()
-        return reporte
+        with _DURACION_REPORTE['por_tipo'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(viaje.get_resumen().por_tipo)
+
+    @staticmethod
+    def reporte_por_medio_pago(viaje: Viaje) -> dict:
+        """
+        Calcula el total gastado con cada medio de pago.
+
+        Args:
+            viaje (Viaje): Objeto del viaje del cual se extraen los gastos.
+
+        Returns:
+            dict: Nombre del medio de pago -> total en COP.
+        """
+        with _DURACION_REPORTE['por_medio'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(viaje.get_resumen().por_medio)
+
+    @staticmethod
+    def reporte_por_fecha_y_tipo(viaje: Viaje) -> dict:
+        """
+        Calcula el desglose de gastos por fecha y tipo, diferenciando entre efectivo y tarjeta.
+
+        Args:
+            viaje (Viaje): Objeto del viaje del cual se extraen los gastos.
+
+        Returns:
+            dict: Fecha -> nombre del tipo -> {'efectivo', 'tarjetas', 'total'}.
+        """
+        with _DURACION_REPORTE['fecha_tipo'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(viaje.get_resumen().reporte_fecha_tipo())
+
+    @staticmethod
+    def generar_reportes(viaje: Viaje) -> dict:
+        """
+        Genera todos los reportes del viaje a partir de sus agregados.
+
+        Args:
+            viaje (Viaje): Objeto del viaje del cual se extraen los gastos.
+
+        Returns:
+            dict: Reportes bajo las claves 'diario', 'por_tipo', 'por_medio' y 'fecha_tipo'.
+        """
+        with _DURACION_REPORTE['todos'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(ControlReporte._reportes_de(viaje.get_resumen()))
+
+    @staticmethod
+    def recalcular_reportes(viaje: Viaje) -> dict:
+        """
+        Recalcula desde cero todos los reportes a partir de los gastos almacenados.
+
+        No usa los agregados incrementales del viaje, por lo que sirve para auditarlos. Los
+        gastos se recorren una sola vez para construir la tabla cruzada fecha × tipo × medio
+        de pago; con un almacén columnar ese recorrido es vectorizado.
+
+        Args:
+            viaje (Viaje): Viaje cuyos gastos se agrupan.
+
+        Returns:
+            dict: Reportes con las mismas claves que `generar_reportes`.
+        """
+        with _DURACION_REPORTE['recalculo'].medir(), viaje.bloqueo:
+            return reporte_a_unidades(
+                ControlReporte._reportes_de(ResumenGastos.desde_gastos(viaje.get_gastos()))
+            )
+
+    @staticmethod
+    def reportes_desde_repositorio(repositorio, viaje_id: int) -> dict:
+        """
+        Genera todos los reportes de un viaje guardado en un RepositorioSQLite sin cargarlo.
+
+        La agrupación se hace en SQL (`GROUP BY` fecha, tipo y medio de pago); a Python solo
+        llega una fila por combinación.
+
+        Args:
+            repositorio (RepositorioSQLite): Repositorio donde está guardado el viaje.
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            dict: Reportes con las mismas claves que `generar_reportes`.
+        """
+        with _DURACION_REPORTE['repositorio'].medir():
+            return reporte_a_unidades(ControlReporte._reportes_de(
+                ResumenGastos.desde_tabla(*repositorio.tabla_cruzada(viaje_id))
+            ))
+
+    @staticmethod
+    def _reportes_de(resumen: ResumenGastos) -> dict:
+        """Arma el diccionario con todos los reportes de un ResumenGastos, en centavos."""
+        return {
+            'diario': resumen.reporte_diario(),
+            'por_tipo': resumen.reporte_por_tipo(),
+            'por_medio': resumen.reporte_por_medio(),
+            'fecha_tipo': resumen.reporte_fecha_tipo(),
+        }
+
+    @staticmethod
+    def reporte_flota(viajes, procesos: int = None, particiones: int = None) -> dict:
+        """
+        Recalcula los reportes combinados de muchos viajes repartiendo el trabajo en procesos.
+
+        Como `recalcular_reportes`, agrupa los gastos almacenados sin usar los agregados
+        incrementales. Cada viaje de una partición viaja al proceso como cinco bloques de
+        bytes, y los reportes parciales se combinan con `combinar_reportes`.
+
+        Args:
+            viajes (iterable[Viaje]): Viajes a incluir.
+            procesos (int | None): Procesos del pool; por defecto, los núcleos disponibles.
+                                   Con 1 proceso todo se calcula en el proceso actual.
+            particiones (int | None): Grupos de viajes en que se reparte el trabajo; por
+                                      defecto, cuatro por proceso para equilibrar la carga.
+
+        Returns:
+            dict: Reportes con las mismas claves que `generar_reportes`, sumados sobre
+                  todos los viajes y con las fechas en orden cronológico.
+        """
+        with _DURACION_REPORTE['flota'].medir():
+            return ControlReporte._reporte_flota(list(viajes), procesos, particiones)
+
+    @staticmethod
+    def _reporte_flota(viajes: list, procesos, particiones) -> dict:
+        """Implementación de `reporte_flota`."""
+        procesos = procesos or os.cpu_count() or 1
+        grupos = _particionar(viajes, particiones or procesos * 4)
+
+        reportes = ControlReporte._reportes_de(ResumenGastos())
+        if procesos == 1 or len(grupos) <= 1:
+            for grupo in grupos:
+                combinar_reportes(reportes, _reportes_particion(
+                    [_bloques_viaje(viaje) for viaje in grupo]))
+        else:
+            # Importación diferida: multiprocessing solo hace falta para la flota.
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(procesos, len(grupos))) as pool:
+                futuros = [pool.submit(_reportes_particion,
+                                       [_bloques_viaje(viaje) for viaje in grupo])
+                           for grupo in grupos]
+                for futuro in futuros:
+                    combinar_reportes(reportes, futuro.result())
+
+        for clave in REPORTES_POR_FECHA:
+            reportes[clave] = dict(sorted(reportes[clave].items()))
+        return reporte_a_unidades(reportes)
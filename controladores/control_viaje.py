@@ -3,32 +3,100 @@ Clase controladora que gestiona la creación, validación y actualización del e
 
 Esta clase actúa como intermediario entre la lógica de negocio y los datos del objeto Viaje,
 facilitando el proceso de registro, verificación y control de la información asociada al viaje.
+
+Además del viaje actual, el controlador funciona como registro de todos los viajes de todos
+los clientes. Los viajes activos se indexan por identificador y por cédula del cliente en
+diccionarios, de modo que ubicar el viaje de un gasto es O(1). Al finalizar un viaje, este pasa
+al índice de finalizados y, si hay un repositorio configurado, se guarda en él y se libera de
+la memoria; se vuelve a cargar solo si se consulta. La finalización se notifica con el lock del
+viaje tomado, así que en ese momento solo se actualizan los índices: la escritura en el
+repositorio se hace después, fuera del lock, en `guardar_finalizados` (que `finalizar_viaje`
+y el registro de viajes llaman automáticamente).
+
+El registro puede usarse desde varios hilos. Las búsquedas son lecturas de diccionario sin
+lock; las altas y los traslados a finalizados, que tocan varios índices, se hacen con el lock
+del registro. Ese lock se toma siempre después del lock del viaje (al archivar, el observador
+corre dentro de `Viaje.finalizar_viaje`) y nunca al revés. Las operaciones que toman el lock de
+un viaje lanzan RuntimeError si se llaman desde un observador de otro viaje (ver viaje).
+
+Opcionalmente, el registro puede tener una precarga de tasas (ver precarga_tasas): al
+registrar un viaje internacional, las tasas de sus días se consultan en segundo plano y el
+registro de gastos no espera a la red.
 """
 
+import threading
+from collections import deque
 from datetime import date
+from itertools import count
 
 from enums.tipo_viaje import TipoViaje
 
-from modelos.viaje import Viaje
+from modelos.viaje import Viaje, en_notificacion
 
 from modelos.destino import Destino
 
+from modelos.cliente import Cliente
+
+from .control_gasto import ControlGasto, ViajeFinalizadoError
+from .metricas import VIAJES_ACTIVOS
+
 class ControlViaje:
     """
     Controlador que gestiona las operaciones relacionadas con un viaje.
 
     Atributos:
-        viaje (Viaje): Instancia del viaje actual.
+        viaje (Viaje): Instancia del viaje actual (el último registrado).
+        repositorio (RepositorioSQLite | None): Almacenamiento de los viajes finalizados.
+        precarga (PrecargaTasas | None): Precarga de las tasas de los viajes registrados.
     """
 
-    def __init__(self):
-        """Inicializa el controlador con un viaje en None."""
+    def __init__(self, repositorio=None, precarga=None):
+        """
+        Inicializa el controlador con un viaje en None y el registro vacío.
+
+        Args:
+            repositorio (RepositorioSQLite | None): Si se indica, los viajes se guardan en él
+                                                    y los finalizados se liberan de memoria.
+            precarga (PrecargaTasas | None): Si se indica, precarga las tasas de cada viaje
+                                             internacional registrado.
+        """
         self.viaje = None
+        self.repositorio = repositorio
+        self.precarga = precarga
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._clientes = {}
+        self._activos = {}
+        self._activos_por_cliente = {}
+        self._finalizados = {}
+        self._finalizados_por_cliente = {}
+        self._por_guardar = deque()
+
+    def registrar_cliente(self, cliente: Cliente):
+        """
+        Agrega un cliente al registro, reemplazando sus datos si la cédula ya existe.
+
+        Args:
+            cliente (Cliente): Cliente a registrar.
+        """
+        self._clientes[cliente.get_cedula()] = cliente
+        if self.repositorio is not None:
+            self.repositorio.guardar_cliente(cliente)
+
+    def obtener_cliente(self, cedula: str):
+        """
+        Busca un cliente registrado por su cédula.
+
+        Returns:
+            Cliente | None: El cliente, o None si no está registrado.
+        """
+        return self._clientes.get(cedula)
 
     def registrar_viaje(self, fecha_inicio: date, fecha_fin: date,
-                        presupuesto_diario: float, destino: Destino, tipo_viaje: TipoViaje):
+                        presupuesto_diario: float, destino: Destino, tipo_viaje: TipoViaje,
+                        cliente: Cliente = None) -> int:
         """
-        Crea una nueva instancia de Viaje con los datos proporcionados.
+        Crea una nueva instancia de Viaje con los datos proporcionados y la registra.
 
         Args:
             fecha_inicio (date): Fecha de inicio del viaje.
@@ -36,8 +104,208 @@ class ControlViaje:
             presupuesto_diario (float): Presupuesto diario asignado.
             destino (Destino): Lugar al que se realizará el viaje.
             tipo_viaje (TipoViaje): Tipo de viaje (NACIONAL o INTERNACIONAL).
+            cliente (Cliente | None): Cliente que realiza el viaje.
+
+        Returns:
+            int: Identificador del viaje.
+        """
+        viaje = Viaje(fecha_inicio, fecha_fin, presupuesto_diario, destino, tipo_viaje,
+                      cliente=cliente)
+        return self.reanudar_viaje(viaje)
+
+    def reanudar_viaje(self, viaje: Viaje) -> int:
+        """
+        Registra un viaje ya existente (por ejemplo, recuperado del diario) como viaje actual.
+
+        El viaje recibe un identificador si no lo tiene (y, con repositorio, se guarda), se
+        indexa como activo y, si es internacional, se precargan sus tasas. Un viaje que ya
+        estaba finalizado se registra directamente como finalizado.
+
+        Args:
+            viaje (Viaje): Viaje a registrar.
+
+        Returns:
+            int: Identificador del viaje.
         """
-        self.viaje = Viaje(fecha_inicio, fecha_fin, presupuesto_diario, destino, tipo_viaje)
+        self._verificar_fuera_de_notificacion()
+        self.guardar_finalizados()
+        if viaje.viaje_id is not None and self._activos.get(viaje.viaje_id) is viaje:
+            self.viaje = viaje
+            return viaje.viaje_id
+        if viaje.cliente is not None:
+            self.registrar_cliente(viaje.cliente)
+        # Un viaje cargado del repositorio conserva su identificador.
+        if viaje.viaje_id is None and self.repositorio is not None:
+            viaje.viaje_id = self.repositorio.guardar_viaje(viaje)
+        elif viaje.viaje_id is None:
+            viaje.viaje_id = next(self._ids)
+
+        viaje.agregar_observador(self._al_cambiar_viaje)
+        with self._lock:
+            self._activos[viaje.viaje_id] = viaje
+            self._activos_por_cliente.setdefault(self._cedula(viaje), {})[viaje.viaje_id] = viaje
+            self.viaje = viaje
+        VIAJES_ACTIVOS.inc()
+        if not viaje.estado_viaje:
+            self._archivar(viaje)
+            self.guardar_finalizados()
+        elif self.precarga is not None:
+            self.precarga.precargar_viaje(viaje)
+        return viaje.viaje_id
+
+    @staticmethod
+    def _verificar_fuera_de_notificacion():
+        """
+        Rechaza las operaciones que toman el lock de un viaje desde un observador de otro.
+
+        Raises:
+            RuntimeError: Si el hilo actual está entregando un evento de un viaje.
+        """
+        if en_notificacion():
+            raise RuntimeError("Un observador de un viaje no puede modificar otros viajes.")
+
+    @staticmethod
+    def _cedula(viaje: Viaje):
+        """Retorna la cédula del cliente del viaje, o None si no tiene cliente."""
+        return viaje.cliente.get_cedula() if viaje.cliente is not None else None
+
+    def _al_cambiar_viaje(self, evento: str, viaje: Viaje, *_):
+        """Observador de los viajes registrados: archiva los que se finalizan."""
+        if evento == 'viaje_finalizado':
+            self._archivar(viaje)
+
+    def _archivar(self, viaje: Viaje):
+        """
+        Mueve un viaje al índice de finalizados; si hay repositorio, queda pendiente de guardar.
+
+        Corre con el lock del viaje tomado, por lo que no escribe en el repositorio.
+        """
+        viaje_id = viaje.viaje_id
+        cedula = self._cedula(viaje)
+        viaje.quitar_observador(self._al_cambiar_viaje)
+        if self.precarga is not None:
+            self.precarga.olvidar_viaje(viaje)
+
+        with self._lock:
+            # Se registra como finalizado antes de quitarlo de los activos, para que una
+            # búsqueda concurrente siempre lo encuentre en alguno de los dos índices.
+            self._finalizados[viaje_id] = viaje
+            self._finalizados_por_cliente.setdefault(cedula, set()).add(viaje_id)
+            del self._activos[viaje_id]
+            del self._activos_por_cliente[cedula][viaje_id]
+            if not self._activos_por_cliente[cedula]:
+                del self._activos_por_cliente[cedula]
+            if self.repositorio is not None:
+                self._por_guardar.append(viaje)
+        VIAJES_ACTIVOS.dec()
+
+    def guardar_finalizados(self):
+        """
+        Guarda en el repositorio los viajes finalizados pendientes y los libera de la memoria.
+
+        Los gastos se copian con el lock del viaje tomado y se escriben después de soltarlo,
+        reemplazando en una sola transacción los que se guardaron al registrar el viaje. Si la
+        escritura falla, el viaje vuelve a quedar pendiente (y en memoria) y el error se
+        propaga. Sin repositorio no hace nada.
+        """
+        self._verificar_fuera_de_notificacion()
+        while self._por_guardar:
+            try:
+                viaje = self._por_guardar.popleft()
+            except IndexError:
+                return
+            gastos = viaje.get_gastos()
+            try:
+                if getattr(gastos, 'repositorio', None) is not self.repositorio:
+                    with viaje.bloqueo:
+                        gastos = list(gastos)
+                    self.repositorio.reemplazar_gastos(viaje.viaje_id, gastos, False)
+                else:
+                    self.repositorio.actualizar_estado(viaje.viaje_id, False)
+            except Exception:
+                self._por_guardar.appendleft(viaje)
+                raise
+            with self._lock:
+                self._finalizados[viaje.viaje_id] = None
+
+    def obtener_viaje(self, viaje_id: int) -> Viaje:
+        """
+        Busca un viaje por su identificador, activo o finalizado.
+
+        Los viajes finalizados que se liberaron de memoria se cargan desde el repositorio.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            Viaje: El viaje.
+
+        Raises:
+            KeyError: Si el viaje no está registrado.
+        """
+        viaje = self._activos.get(viaje_id)
+        if viaje is not None:
+            return viaje
+        viaje = self._finalizados[viaje_id]
+        if viaje is None:
+            viaje = self.repositorio.cargar_viaje(viaje_id)
+        return viaje
+
+    def viajes_activos(self, cedula: str = None) -> dict:
+        """
+        Retorna los viajes activos, todos o solo los de un cliente.
+
+        Args:
+            cedula (str | None): Cédula del cliente.
+
+        Returns:
+            dict: Identificador -> Viaje.
+        """
+        with self._lock:
+            if cedula is None:
+                return dict(self._activos)
+            return dict(self._activos_por_cliente.get(cedula, {}))
+
+    def viajes_finalizados(self, cedula: str = None) -> set:
+        """
+        Retorna los identificadores de los viajes finalizados, todos o solo los de un cliente.
+
+        Args:
+            cedula (str | None): Cédula del cliente.
+
+        Returns:
+            set: Identificadores de los viajes finalizados.
+        """
+        with self._lock:
+            if cedula is None:
+                return set(self._finalizados)
+            return set(self._finalizados_por_cliente.get(cedula, ()))
+
+    def registrar_gasto(self, viaje_id: int, fecha, valor: float, medio_pago, tipo_gasto):
+        """
+        Registra un gasto en el viaje indicado, ubicándolo con una búsqueda O(1).
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+            fecha: Fecha del gasto.
+            valor (float): Valor original del gasto.
+            medio_pago (MedioPago): Medio de pago utilizado.
+            tipo_gasto (TipoGasto): Tipo del gasto.
+
+        Raises:
+            ViajeFinalizadoError: Si el viaje ya fue finalizado.
+            KeyError: Si el viaje no está registrado.
+            RuntimeError: Si se llama desde un observador de un viaje.
+        """
+        self._verificar_fuera_de_notificacion()
+        viaje = self._activos.get(viaje_id)
+        if viaje is None:
+            if viaje_id in self._finalizados:
+                raise ViajeFinalizadoError(
+                    "El viaje ha finalizado, no se pueden registrar más gastos."
+                )
+            raise KeyError(f"No existe el viaje {viaje_id}.")
+        ControlGasto(viaje, self).registrar_gasto(fecha, valor, medio_pago, tipo_gasto)
 
     def validar_destino(self):
         """
@@ -50,20 +318,33 @@ class ControlViaje:
 
     def iniciar_viaje(self):
         """
-        Cambia el estado del viaje a activo.
+        Cambia el estado del viaje actual a activo y lo registra si aún no lo estaba.
+
+        Raises:
+            ViajeFinalizadoError: Si el viaje ya fue finalizado y archivado.
         """
-        self.viaje.estado_viaje = True
+        viaje = self.viaje
+        if viaje.viaje_id in self._finalizados:
+            raise ViajeFinalizadoError("El viaje ya fue finalizado; no puede reactivarse.")
+        viaje.estado_viaje = True
+        self.reanudar_viaje(viaje)
 
-    def finalizar_viaje(self):
+    def finalizar_viaje(self, viaje_id: int = None):
         """
         Finaliza el viaje si la fecha actual es mayor o igual a la fecha de fin.
+
+        Args:
+            viaje_id (int | None): Viaje a finalizar; por defecto, el viaje actual.
         """
+        self._verificar_fuera_de_notificacion()
+        viaje = self.viaje if viaje_id is None else self.obtener_viaje(viaje_id)
         hoy = date.today()
-        if hoy >= self.viaje.fecha_fin:
-            self.viaje.finalizar_viaje()
+        if hoy >= viaje.fecha_fin:
+            viaje.finalizar_viaje()
+            self.guardar_finalizados()
             print("El viaje se ha finalizado")
         else:
-            print("El viaje está aún activo. Fecha de finalización:", self.viaje.fecha_fin)
+            print("El viaje está aún activo. Fecha de finalización:", viaje.fecha_fin)
 
     def get_viaje(self):
         """
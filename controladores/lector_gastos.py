@@ -0,0 +1,117 @@
+"""
+Módulo para leer gastos en lote desde archivos CSV o JSONL.
+
+Los lectores son generadores: procesan una línea a la vez y nunca cargan el archivo completo en
+memoria. Cada fila se valida al leerla; las válidas se entregan como FilaGasto y las inválidas
+como FilaInvalida, con el número de línea y el motivo, para que quien importa decida qué hacer
+con ellas sin interrumpir la lectura.
+
+Formato esperado de cada fila (encabezado en CSV, claves en JSONL):
+    fecha (YYYY-MM-DD), valor, medio_pago (EFECTIVO, TARJETA_DEBITO, TARJETA_CREDITO),
+    tipo_gasto (TRANSPORTE, ALOJAMIENTO, ALIMENTACION, ENTRETENIMIENTO, COMPRAS, OTROS)
+"""
+
+import csv
+import json
+from collections import namedtuple
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+
+FilaGasto = namedtuple('FilaGasto', ['linea', 'fecha', 'valor', 'medio_pago', 'tipo_gasto'])
+FilaInvalida = namedtuple('FilaInvalida', ['linea', 'motivo'])
+
+CAMPOS = ('fecha', 'valor', 'medio_pago', 'tipo_gasto')
+
+
+def validar_fila(linea: int, datos: dict):
+    """
+    Convierte los campos de texto de una fila en los tipos del modelo.
+
+    Args:
+        linea (int): Número de línea en el archivo.
+        datos (dict): Campos de la fila.
+
+    Returns:
+        FilaGasto | FilaInvalida: La fila convertida, o el motivo por el que no es válida.
+    """
+    try:
+        fecha = date.fromisoformat(str(datos['fecha']).strip())
+        valor = float(datos['valor'])
+        medio_pago = MedioPago[str(datos['medio_pago']).strip().upper()]
+        tipo_gasto = TipoGasto[str(datos['tipo_gasto']).strip().upper()]
+    except KeyError as e:
+        return FilaInvalida(linea, f"Campo o valor desconocido: {e}")
+    except (TypeError, ValueError) as e:
+        return FilaInvalida(linea, str(e))
+
+    if valor < 0:
+        return FilaInvalida(linea, "El valor no puede ser negativo.")
+    return FilaGasto(linea, fecha, valor, medio_pago, tipo_gasto)
+
+
+def leer_csv(lineas):
+    """
+    Lee gastos de un CSV con encabezado.
+
+    Args:
+        lineas: Archivo abierto en modo texto o cualquier iterable de líneas.
+
+    Yields:
+        FilaGasto | FilaInvalida: Una entrada por cada fila de datos.
+    """
+    lector = csv.DictReader(lineas)
+    faltantes = set(CAMPOS) - set(lector.fieldnames or ())
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(sorted(faltantes))}")
+    for datos in lector:
+        yield validar_fila(lector.line_num, datos)
+
+
+def leer_jsonl(lineas):
+    """
+    Lee gastos de un archivo JSONL, con un objeto JSON por línea.
+
+    Args:
+        lineas: Archivo abierto en modo texto o cualquier iterable de líneas.
+
+    Yields:
+        FilaGasto | FilaInvalida: Una entrada por cada línea no vacía.
+    """
+    for linea, texto in enumerate(lineas, start=1):
+        if not texto.strip():
+            continue
+        try:
+            datos = json.loads(texto)
+        except ValueError as e:
+            yield FilaInvalida(linea, f"JSON inválido: {e}")
+            continue
+        if not isinstance(datos, dict):
+            yield FilaInvalida(linea, "Cada línea debe ser un objeto JSON.")
+            continue
+        yield validar_fila(linea, datos)
+
+
+def leer_archivo(ruta: str):
+    """
+    Abre un archivo de gastos y lo lee según su extensión (.csv o .jsonl).
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Yields:
+        FilaGasto | FilaInvalida: Una entrada por cada fila del archivo.
+
+    Raises:
+        ValueError: Si la extensión no es .csv ni .jsonl.
+    """
+    if ruta.lower().endswith(".csv"):
+        lector = leer_csv
+    elif ruta.lower().endswith((".jsonl", ".ndjson")):
+        lector = leer_jsonl
+    else:
+        raise ValueError("El archivo de gastos debe ser .csv o .jsonl.")
+
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        yield from lector(archivo)
@@ -0,0 +1,481 @@
+"""
+Métricas de la aplicación (contadores, medidores e histogramas) en formato de texto Prometheus.
+
+Las métricas se declaran una vez, a nivel de módulo, en el registro global `REGISTRO`, y los
+componentes las actualizan en sus caminos críticos. El registro está desactivado por defecto:
+cada actualización empieza comprobando `registro.activo` y retorna de inmediato, de modo que
+instrumentar un camino cuesta una llamada a método (menos de 1 µs) mientras nadie mida.
+
+Una métrica puede tener etiquetas (por ejemplo, la moneda de una consulta de tasas); cada
+combinación de valores es una serie con su propio valor, que se obtiene con `etiquetas(...)`.
+Las métricas sin etiquetas se actualizan directamente. En los caminos más frecuentes conviene
+obtener la serie una sola vez, al importar el módulo, y no en cada evento.
+
+El contenido se obtiene con `REGISTRO.exportar()` o se publica en `http://<direccion>:<puerto>/
+metrics` con `REGISTRO.servir(puerto)`.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+# Límites superiores, en segundos, de los buckets de los histogramas de latencia.
+LIMITES_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0)
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _formatear_numero(valor) -> str:
+    """Escribe un valor como lo espera el formato de texto de Prometheus."""
+    if valor == float("inf"):
+        return "+Inf"
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor)
+
+
+def _escapar(valor) -> str:
+    """Escapa el valor de una etiqueta (barras invertidas, comillas y saltos de línea)."""
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatear_etiquetas(nombres: tuple, valores: tuple, extra: str = "") -> str:
+    """Arma el bloque `{nombre="valor",...}` de una serie, o una cadena vacía."""
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class _Serie:
+    """Valor de una combinación de etiquetas; la base de las series de cada tipo."""
+
+    __slots__ = ('_registro', '_lock')
+
+    def __init__(self, registro):
+        self._registro = registro
+        self._lock = threading.Lock()
+
+
+class SerieContador(_Serie):
+    """Valor de un contador: solo puede aumentar."""
+
+    __slots__ = ('valor',)
+
+    def __init__(self, registro):
+        super().__init__(registro)
+        self.valor = 0
+
+    def reiniciar(self):
+        """Vuelve el valor a cero."""
+        self.valor = 0
+
+    def inc(self, cantidad=1):
+        """
+        Aumenta el contador.
+
+        Args:
+            cantidad (int | float): Incremento, no negativo.
+        """
+        if not self._registro.activo:
+            return
+        with self._lock:
+            self.valor += cantidad
+
+
+class SerieMedidor(_Serie):
+    """Valor de un medidor: puede subir, bajar o fijarse."""
+
+    __slots__ = ('valor',)
+
+    def __init__(self, registro):
+        super().__init__(registro)
+        self.valor = 0
+
+    def reiniciar(self):
+        """Vuelve el valor a cero."""
+        self.valor = 0
+
+    def set(self, valor):
+        """Fija el valor del medidor."""
+        if not self._registro.activo:
+            return
+        self.valor = valor
+
+    def inc(self, cantidad=1):
+        """Suma una cantidad al medidor."""
+        if not self._registro.activo:
+            return
+        with self._lock:
+            self.valor += cantidad
+
+    def dec(self, cantidad=1):
+        """Resta una cantidad al medidor."""
+        self.inc(-cantidad)
+
+
+class _Cronometro:
+    """Administrador de contexto que observa en un histograma el tiempo transcurrido."""
+
+    __slots__ = ('_serie', '_inicio')
+
+    def __init__(self, serie):
+        self._serie = serie
+        self._inicio = 0.0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self._serie.observar(time.perf_counter() - self._inicio)
+
+
+class _CronometroInactivo:
+    """Cronómetro que no mide nada, usado mientras el registro está desactivado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return None
+
+
+_CRONOMETRO_INACTIVO = _CronometroInactivo()
+
+
+class SerieHistograma(_Serie):
+    """Distribución de observaciones en buckets acumulativos, con su suma y su cantidad."""
+
+    __slots__ = ('limites', 'cuentas', 'suma', 'cantidad')
+
+    def __init__(self, registro, limites: tuple):
+        super().__init__(registro)
+        self.limites = limites
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todas las observaciones."""
+        with self._lock:
+            self.cuentas = [0] * len(self.limites)
+            self.suma = 0.0
+            self.cantidad = 0
+
+    def observar(self, valor: float):
+        """
+        Registra una observación.
+
+        Args:
+            valor (float): Valor observado, por ejemplo una latencia en segundos.
+        """
+        if not self._registro.activo:
+            return
+        posicion = bisect_left(self.limites, valor)
+        with self._lock:
+            if posicion < len(self.cuentas):
+                self.cuentas[posicion] += 1
+            self.suma += valor
+            self.cantidad += 1
+
+    def instantanea(self) -> tuple:
+        """
+        Retorna una copia consistente de las observaciones.
+
+        Returns:
+            tuple: (cuentas por bucket, suma, cantidad).
+        """
+        with self._lock:
+            return list(self.cuentas), self.suma, self.cantidad
+
+    def medir(self):
+        """
+        Retorna un administrador de contexto que observa la duración del bloque.
+
+        Returns:
+            Administrador de contexto; no mide nada si el registro está desactivado.
+        """
+        if not self._registro.activo:
+            return _CRONOMETRO_INACTIVO
+        return _Cronometro(self)
+
+
+class _Metrica(ABC):
+    """Familia de series con un nombre, una ayuda y nombres de etiquetas comunes."""
+
+    tipo = None
+
+    def __init__(self, registro, nombre: str, ayuda: str, etiquetas: tuple):
+        self.registro = registro
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.nombres_etiquetas = tuple(etiquetas)
+        self._series = {}
+        self._lock = threading.Lock()
+        self._sin_etiquetas = None if self.nombres_etiquetas else self.etiquetas()
+
+    @abstractmethod
+    def _crear_serie(self):
+        """Crea una serie vacía del tipo de la métrica."""
+
+    def _serie_sin_etiquetas(self):
+        """
+        Retorna la única serie de una métrica sin etiquetas.
+
+        Raises:
+            ValueError: Si la métrica tiene etiquetas.
+        """
+        if self._sin_etiquetas is None:
+            raise ValueError(f"La métrica {self.nombre} requiere etiquetas "
+                             f"{self.nombres_etiquetas}; use etiquetas().")
+        return self._sin_etiquetas
+
+    def etiquetas(self, *valores):
+        """
+        Retorna la serie de una combinación de valores de etiquetas, creándola si no existe.
+
+        Args:
+            *valores: Un valor por cada nombre de etiqueta, en el mismo orden.
+
+        Returns:
+            La serie correspondiente.
+
+        Raises:
+            ValueError: Si la cantidad de valores no coincide con la de etiquetas.
+        """
+        serie = self._series.get(valores)
+        if serie is None:
+            if len(valores) != len(self.nombres_etiquetas):
+                raise ValueError(f"La métrica {self.nombre} espera las etiquetas "
+                                 f"{self.nombres_etiquetas}.")
+            with self._lock:
+                serie = self._series.setdefault(valores, self._crear_serie())
+        return serie
+
+    def reiniciar(self):
+        """
+        Vuelve a cero los valores de todas las series.
+
+        Las series se conservan, de modo que las referencias obtenidas con `etiquetas`
+        siguen siendo válidas.
+        """
+        for serie in list(self._series.values()):
+            serie.reiniciar()
+
+    def exportar(self) -> list:
+        """Retorna las líneas de texto Prometheus de la métrica."""
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        for valores, serie in sorted(self._series.items()):
+            lineas.extend(self._exportar_serie(valores, serie))
+        return lineas
+
+    def _exportar_serie(self, valores: tuple, serie) -> list:
+        etiquetas = _formatear_etiquetas(self.nombres_etiquetas, valores)
+        return [f"{self.nombre}{etiquetas} {_formatear_numero(serie.valor)}"]
+
+
+class Contador(_Metrica):
+    """Métrica que solo aumenta, como el número de consultas realizadas."""
+
+    tipo = "counter"
+
+    def _crear_serie(self):
+        return SerieContador(self.registro)
+
+    def inc(self, cantidad=1):
+        """Aumenta la serie sin etiquetas."""
+        self._serie_sin_etiquetas().inc(cantidad)
+
+
+class Medidor(_Metrica):
+    """Métrica que sube y baja, como el número de viajes activos."""
+
+    tipo = "gauge"
+
+    def _crear_serie(self):
+        return SerieMedidor(self.registro)
+
+    def set(self, valor):
+        """Fija la serie sin etiquetas."""
+        self._serie_sin_etiquetas().set(valor)
+
+    def inc(self, cantidad=1):
+        """Suma una cantidad a la serie sin etiquetas."""
+        self._serie_sin_etiquetas().inc(cantidad)
+
+    def dec(self, cantidad=1):
+        """Resta una cantidad a la serie sin etiquetas."""
+        self._serie_sin_etiquetas().dec(cantidad)
+
+
+class Histograma(_Metrica):
+    """Métrica que agrupa observaciones (por ejemplo, latencias) en buckets."""
+
+    tipo = "histogram"
+
+    def __init__(self, registro, nombre: str, ayuda: str, etiquetas: tuple,
+                 limites: tuple = LIMITES_LATENCIA):
+        self.limites = tuple(sorted(limites))
+        super().__init__(registro, nombre, ayuda, etiquetas)
+
+    def _crear_serie(self):
+        return SerieHistograma(self.registro, self.limites)
+
+    def observar(self, valor: float):
+        """Registra una observación en la serie sin etiquetas."""
+        self._serie_sin_etiquetas().observar(valor)
+
+    def medir(self):
+        """Mide la duración de un bloque en la serie sin etiquetas."""
+        return self._serie_sin_etiquetas().medir()
+
+    def _exportar_serie(self, valores: tuple, serie) -> list:
+        cuentas, suma, cantidad = serie.instantanea()
+        lineas = []
+        acumulado = 0
+        for limite, cuenta in zip(self.limites + (float("inf"),), cuentas + [None]):
+            acumulado = cantidad if cuenta is None else acumulado + cuenta
+            etiquetas = _formatear_etiquetas(self.nombres_etiquetas, valores,
+                                             f'le="{_formatear_numero(limite)}"')
+            lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+        etiquetas = _formatear_etiquetas(self.nombres_etiquetas, valores)
+        lineas.append(f"{self.nombre}_sum{etiquetas} {_formatear_numero(suma)}")
+        lineas.append(f"{self.nombre}_count{etiquetas} {cantidad}")
+        return lineas
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas de la aplicación.
+
+    Atributos:
+        activo (bool): Si es False, las actualizaciones de las métricas no tienen efecto.
+    """
+
+    def __init__(self):
+        """Inicializa el registro vacío y desactivado."""
+        self.activo = False
+        self._metricas = {}
+        self._servidor = None
+
+    def _agregar(self, metrica):
+        if metrica.nombre in self._metricas:
+            raise ValueError(f"Ya existe una métrica llamada {metrica.nombre}.")
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: tuple = ()) -> Contador:
+        """Declara un contador."""
+        return self._agregar(Contador(self, nombre, ayuda, etiquetas))
+
+    def medidor(self, nombre: str, ayuda: str, etiquetas: tuple = ()) -> Medidor:
+        """Declara un medidor."""
+        return self._agregar(Medidor(self, nombre, ayuda, etiquetas))
+
+    def histograma(self, nombre: str, ayuda: str, etiquetas: tuple = (),
+                   limites: tuple = LIMITES_LATENCIA) -> Histograma:
+        """Declara un histograma con los límites de bucket indicados."""
+        return self._agregar(Histograma(self, nombre, ayuda, etiquetas, limites))
+
+    def activar(self, activo: bool = True):
+        """
+        Activa o desactiva la recolección de métricas.
+
+        Args:
+            activo (bool): True para recolectar, False para que las actualizaciones no
+                           tengan efecto.
+        """
+        self.activo = activo
+
+    def reiniciar(self):
+        """Descarta los valores de todas las métricas, conservando sus declaraciones."""
+        for metrica in self._metricas.values():
+            metrica.reiniciar()
+
+    def exportar(self) -> str:
+        """
+        Retorna todas las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Texto con una sección HELP/TYPE por métrica y una línea por serie.
+        """
+        lineas = []
+        for metrica in self._metricas.values():
+            lineas.extend(metrica.exportar())
+        return "\n".join(lineas) + "\n"
+
+    def servir(self, puerto: int = 9100, direccion: str = "127.0.0.1"):
+        """
+        Publica las métricas en `/metrics` desde un servidor HTTP en un hilo aparte.
+
+        Args:
+            puerto (int): Puerto donde escuchar; 0 elige uno libre.
+            direccion (str): Dirección donde escuchar.
+
+        Returns:
+            tuple: (dirección, puerto) donde quedó escuchando el servidor.
+        """
+        # Importación diferida: http.server carga ssl y email, y casi nunca se publica.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registro = self
+
+        class ManejadorMetricas(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                cuerpo = registro.exportar().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TIPO_CONTENIDO)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *_):
+                pass
+
+        self.detener_servidor()
+        self._servidor = ThreadingHTTPServer((direccion, puerto), ManejadorMetricas)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True,
+                         name="metricas").start()
+        return self._servidor.server_address
+
+    def detener_servidor(self):
+        """Detiene el servidor de métricas, si está en marcha."""
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+
+REGISTRO = RegistroMetricas()
+
+TASAS_CONSULTAS = REGISTRO.contador(
+    "tasas_consultas_total", "Consultas de tablas de tasas a la API.", ("moneda",))
+TASAS_NO_PUBLICADAS = REGISTRO.contador(
+    "tasas_no_publicadas_total",
+    "Consultas respondidas con 404, que obligan a retroceder un día.", ("moneda",))
+TASAS_ERRORES = REGISTRO.contador(
+    "tasas_errores_total", "Consultas de tasas fallidas.", ("moneda",))
+TASAS_RECHAZADAS = REGISTRO.contador(
+    "tasas_rechazadas_total",
+    "Consultas de tasas rechazadas sin contactar al servidor por el circuito abierto.",
+    ("moneda",))
+TASAS_LATENCIA = REGISTRO.histograma(
+    "tasas_latencia_segundos", "Duración de cada consulta de tasas a la API.", ("moneda",))
+TASAS_PRECARGADAS = REGISTRO.contador(
+    "tasas_precargadas_total", "Tasas consultadas en segundo plano al registrar viajes.",
+    ("resultado",))
+GASTOS_REGISTRADOS = REGISTRO.contador(
+    "gastos_registrados_total", "Gastos registrados en viajes.", ("tipo_viaje",))
+VIAJES_ACTIVOS = REGISTRO.medidor(
+    "viajes_activos", "Viajes registrados que aún no se finalizan.")
+PRESUPUESTO_EXCEDIDO = REGISTRO.contador(
+    "presupuesto_excedido_total", "Veces que un día o un viaje excedió su presupuesto.",
+    ("ambito",))
+REPORTE_DURACION = REGISTRO.histograma(
+    "reporte_duracion_segundos", "Tiempo de construcción de cada reporte.", ("reporte",))
@@ -0,0 +1,215 @@
+"""
+Paquete binario de tasas de cambio históricas, para convertir montos sin acceso a la red.
+
+El paquete guarda, para cada moneda, un arreglo de float64 con una posición por día del rango
+cubierto: la posición `ordinal - primer_ordinal` contiene las unidades de la moneda por cada
+unidad de la moneda base publicadas ese día, o NaN si ese día no hubo publicación. Formato
+(little-endian):
+
+    b"TASAS01\\n"                                 identificador y versión
+    <iiI  primer_ordinal, dias, cantidad_monedas
+    8 bytes por moneda                            código ASCII, completado con ceros
+    ceros hasta un múltiplo de 8 bytes
+    float64 × dias por moneda, en el orden de los códigos
+
+La lectura usa `mmap`: abrir el paquete solo lee el encabezado, cada arreglo es una vista
+(`memoryview.cast`) sobre el archivo mapeado y una consulta es un acceso por índice; el
+sistema operativo carga únicamente las páginas consultadas. Como la API, si una fecha no está
+publicada se usa la fecha disponible más cercana hacia atrás, hasta `dias_retroceso` días.
+
+Construcción del paquete (descarga cada día del rango una vez):
+    python -m controladores.construir_paquete_tasas tasas.paquete --desde 2024-01-01 \\
+        --hasta 2025-12-31 --monedas usd eur mxn cop
+"""
+
+import math
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+IDENTIFICADOR = b"TASAS01\n"
+ENCABEZADO = struct.Struct("<iiI")
+LARGO_CODIGO = 8
+BYTES_TASA = 8
+
+
+def _alinear(posicion: int) -> int:
+    """Redondea una posición al siguiente múltiplo de 8 bytes."""
+    return -(-posicion // 8) * 8
+
+
+def escribir_paquete(ruta: str, primera_fecha: date, tasas: dict):
+    """
+    Escribe un paquete a partir de las tasas de cada moneda.
+
+    Args:
+        ruta (str): Archivo a crear (se sobrescribe si existe).
+        primera_fecha (date): Fecha de la primera posición de cada arreglo.
+        tasas (dict): Código de moneda -> lista de tasas frente a la base, una por día,
+                      con None o NaN en los días sin publicación. Todas las listas deben
+                      tener el mismo largo.
+
+    Raises:
+        ValueError: Si las listas no tienen el mismo largo o un código es demasiado largo.
+    """
+    monedas = [moneda.lower() for moneda in tasas]
+    dias = {len(valores) for valores in tasas.values()}
+    if len(dias) > 1:
+        raise ValueError("Todas las monedas deben cubrir los mismos días.")
+    dias = dias.pop() if dias else 0
+    if any(len(moneda.encode("ascii")) > LARGO_CODIGO for moneda in monedas):
+        raise ValueError(f"Los códigos de moneda no pueden superar {LARGO_CODIGO} caracteres.")
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(IDENTIFICADOR)
+        archivo.write(ENCABEZADO.pack(primera_fecha.toordinal(), dias, len(monedas)))
+        for moneda in monedas:
+            archivo.write(moneda.encode("ascii").ljust(LARGO_CODIGO, b"\0"))
+        archivo.write(b"\0" * (_alinear(archivo.tell()) - archivo.tell()))
+        formato = struct.Struct(f"<{dias}d")
+        for valores in tasas.values():
+            archivo.write(formato.pack(*(math.nan if valor is None else valor
+                                         for valor in valores)))
+
+
+def construir_paquete(ruta: str, desde: date, hasta: date, monedas, descargar,
+                      moneda_base: str = "usd", hilos: int = 8) -> dict:
+    """
+    Descarga las tablas de cada día del rango y las guarda como paquete.
+
+    Args:
+        ruta (str): Archivo a crear.
+        desde (date): Primer día del rango.
+        hasta (date): Último día del rango.
+        monedas (iterable[str]): Monedas a incluir; la base se incluye siempre.
+        descargar (callable): Función (moneda_base, fecha) que retorna la tabla publicada ese
+                              día, con sus tasas en 'tasas', o None si no hay publicación.
+        moneda_base (str): Moneda cuyas tablas se descargan.
+        hilos (int): Descargas simultáneas.
+
+    Returns:
+        dict: Días del rango y días publicados.
+    """
+    moneda_base = moneda_base.lower()
+    monedas = list(dict.fromkeys([moneda_base] + [moneda.lower() for moneda in monedas]))
+    fechas = [desde + timedelta(days=dia) for dia in range((hasta - desde).days + 1)]
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        tablas = list(ejecutor.map(lambda fecha: descargar(moneda_base, fecha), fechas))
+
+    tasas = {moneda: [] for moneda in monedas}
+    for tabla in tablas:
+        for moneda in monedas:
+            if tabla is None:
+                tasas[moneda].append(None)
+            elif moneda == moneda_base:
+                tasas[moneda].append(1.0)
+            else:
+                tasas[moneda].append(tabla['tasas'].get(moneda))
+    escribir_paquete(ruta, desde, tasas)
+    return {'dias': len(fechas), 'publicados': sum(tabla is not None for tabla in tablas)}
+
+
+class PaqueteTasas:
+    """
+    Lector de un paquete de tasas mapeado en memoria.
+
+    Atributos:
+        ruta (str): Archivo del paquete.
+        primera_fecha (date): Primer día cubierto.
+        dias (int): Días cubiertos.
+        monedas (tuple[str]): Monedas incluidas.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre y mapea el paquete, leyendo solo su encabezado.
+
+        Args:
+            ruta (str): Archivo del paquete.
+
+        Raises:
+            ValueError: Si el archivo no es un paquete de tasas válido.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Los paquetes de tasas solo se leen en equipos little-endian.")
+        # Importación diferida: la mayoría de las ejecuciones no configura un paquete.
+        import mmap
+
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._mapa[:len(IDENTIFICADOR)] != IDENTIFICADOR:
+                raise ValueError(f"{ruta} no es un paquete de tasas.")
+            primer_ordinal, self.dias, cantidad = ENCABEZADO.unpack_from(
+                self._mapa, len(IDENTIFICADOR))
+            posicion = len(IDENTIFICADOR) + ENCABEZADO.size
+            self.monedas = tuple(
+                self._mapa[posicion + i * LARGO_CODIGO:posicion + (i + 1) * LARGO_CODIGO]
+                .rstrip(b"\0").decode("ascii")
+                for i in range(cantidad)
+            )
+            inicio = _alinear(posicion + cantidad * LARGO_CODIGO)
+            largo = self.dias * BYTES_TASA
+            if len(self._mapa) != inicio + cantidad * largo:
+                raise ValueError(f"{ruta} está incompleto o dañado.")
+        except Exception:
+            self._mapa.close()
+            raise
+
+        self.primera_fecha = date.fromordinal(primer_ordinal)
+        self._primer_ordinal = primer_ordinal
+        vista = memoryview(self._mapa)
+        self._columnas = {
+            moneda: vista[inicio + i * largo:inicio + (i + 1) * largo].cast("d")
+            for i, moneda in enumerate(self.monedas)
+        }
+
+    def contiene(self, moneda: str) -> bool:
+        """Indica si el paquete incluye una moneda."""
+        return moneda.lower() in self._columnas
+
+    def tasa(self, moneda_origen: str, moneda_destino: str, fecha: date,
+             dias_retroceso: int = 7):
+        """
+        Calcula la tasa entre dos monedas con la publicación más reciente hasta la fecha.
+
+        Se busca el día más cercano hacia atrás, a lo sumo `dias_retroceso` días, en que
+        ambas monedas tengan tasa; así las dos tasas provienen de la misma publicación. Las
+        fechas fuera del rango del paquete no se responden, para que se consulten en la API:
+        después del último día puede haber publicaciones más recientes que las del paquete.
+
+        Args:
+            moneda_origen (str): Moneda de la que se convierte.
+            moneda_destino (str): Moneda a la que se convierte.
+            fecha (date): Fecha de la conversión.
+            dias_retroceso (int): Días máximos a retroceder.
+
+        Returns:
+            float | None: Unidades de la moneda destino por unidad de la origen, o None si
+                          alguna moneda o la fecha no están en el paquete o no hay
+                          publicación en el rango.
+        """
+        origen = self._columnas.get(moneda_origen.lower())
+        destino = self._columnas.get(moneda_destino.lower())
+        if origen is None or destino is None:
+            return None
+        indice = fecha.toordinal() - self._primer_ordinal
+        if not 0 <= indice < self.dias:
+            return None
+        for posicion in range(indice, max(indice - dias_retroceso, -1), -1):
+            tasa_origen = origen[posicion]
+            tasa_destino = destino[posicion]
+            # Los días sin publicación se guardan como NaN.
+            if not (math.isnan(tasa_origen) or math.isnan(tasa_destino)):
+                return tasa_destino / tasa_origen
+        return None
+
+    def cerrar(self):
+        """Libera las vistas y el mapa del archivo."""
+        for columna in self._columnas.values():
+            columna.release()
+        self._columnas = {}
+        self._mapa.close()
+
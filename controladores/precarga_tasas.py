@@ -0,0 +1,186 @@
+"""
+Precarga en segundo plano de las tasas de cambio de los viajes internacionales.
+
+Al registrar un viaje internacional ya se conocen sus fechas y la moneda del destino, así que
+las tasas de todos sus días pueden consultarse antes del primer gasto. La precarga pide a
+ControlAPIMonedaIntercambio la tasa de cada día transcurrido del viaje en un pool de hilos de
+tamaño acotado; las tablas quedan en la caché de tasas y el registro de gastos las encuentra
+sin acceder a la red.
+
+Los días futuros aún no tienen tasa publicada. Un hilo de fondo despierta al comenzar cada día
+(y cada `intervalo` segundos, para renovar la tasa del día actual, que en la caché vence) y
+precarga la fecha de hoy para los viajes en curso. Los errores de la precarga se descartan:
+si una tasa no pudo precargarse, el registro del gasto la consulta como siempre.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, time, timedelta
+
+from enums.tipo_viaje import TipoViaje
+
+from .control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from .metricas import REGISTRO, TASAS_PRECARGADAS
+
+
+class PrecargaTasas:
+    """
+    Precargador de tasas para los días de los viajes internacionales registrados.
+
+    Atributos:
+        hilos (int): Consultas simultáneas máximas.
+        intervalo (float): Segundos máximos entre dos revisiones del día actual.
+        precargadas (int): Tasas precargadas con éxito.
+        fallidas (int): Tasas cuya precarga falló.
+    """
+
+    def __init__(self, hilos: int = 4, intervalo: float = 1800, hoy=date.today):
+        """
+        Inicializa el pool de hilos; el hilo diario arranca con el primer viaje.
+
+        Args:
+            hilos (int): Consultas simultáneas máximas.
+            intervalo (float): Segundos máximos entre dos revisiones del día actual.
+            hoy (callable): Función que retorna la fecha actual.
+
+        Raises:
+            ValueError: Si los hilos o el intervalo no son positivos.
+        """
+        if hilos <= 0:
+            raise ValueError("La cantidad de hilos de la precarga debe ser positiva.")
+        if intervalo <= 0:
+            raise ValueError("El intervalo de la precarga debe ser positivo.")
+        self.hilos = hilos
+        self.intervalo = intervalo
+        self.precargadas = 0
+        self.fallidas = 0
+        self._hoy = hoy
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="precarga")
+        self._viajes = {}        # id(viaje) -> viaje internacional en seguimiento
+        self._pedidas = set()    # (moneda, fecha) de días pasados ya precargados o en curso
+        self._pendientes = set()  # consultas encoladas o en curso
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def precargar_viaje(self, viaje):
+        """
+        Precarga las tasas de los días transcurridos del viaje y lo sigue hasta su fin.
+
+        Los viajes nacionales, o cuyo destino usa la moneda local, no necesitan tasas.
+
+        Args:
+            viaje (Viaje): Viaje recién registrado o reanudado.
+        """
+        moneda = viaje.destino.get_moneda_local().lower()
+        if (viaje.tipo_viaje != TipoViaje.INTERNACIONAL
+                or moneda == ControlAPIMonedaIntercambio.moneda_local):
+            return
+        hoy = self._hoy()
+        with self._lock:
+            if viaje.fecha_fin >= hoy:
+                self._viajes[id(viaje)] = viaje
+                self._iniciar_hilo()
+        ultimo = min(viaje.fecha_fin, hoy)
+        for dias in range((ultimo - viaje.fecha_inicio).days + 1):
+            self._pedir(moneda, viaje.fecha_inicio + timedelta(days=dias), hoy)
+
+    def olvidar_viaje(self, viaje):
+        """Deja de seguir un viaje (por ejemplo, al finalizarlo)."""
+        with self._lock:
+            self._viajes.pop(id(viaje), None)
+
+    def revisar_dia(self):
+        """
+        Precarga la tasa de hoy para los viajes en curso y deja de seguir los terminados.
+
+        El hilo de fondo la llama al comenzar cada día y cada `intervalo` segundos. También olvida
+        los días ya pedidos que no pertenecen a ningún viaje seguido, para que el registro de
+        días pedidos no crezca con cada viaje terminado.
+        """
+        hoy = self._hoy()
+        with self._lock:
+            for clave, viaje in list(self._viajes.items()):
+                if viaje.fecha_fin < hoy or not viaje.estado_viaje:
+                    del self._viajes[clave]
+            rangos = {}  # moneda -> [(inicio, fin)] de los viajes seguidos
+            for viaje in self._viajes.values():
+                rangos.setdefault(viaje.destino.get_moneda_local().lower(), []).append(
+                    (viaje.fecha_inicio, viaje.fecha_fin))
+            self._pedidas = {(moneda, fecha) for moneda, fecha in self._pedidas
+                             if any(inicio <= fecha <= fin
+                                    for inicio, fin in rangos.get(moneda, ()))}
+            en_curso = [viaje for viaje in self._viajes.values() if viaje.fecha_inicio <= hoy]
+        for moneda in {viaje.destino.get_moneda_local().lower() for viaje in en_curso}:
+            self._pedir(moneda, hoy, hoy)
+
+    def _pedir(self, moneda: str, fecha: date, hoy: date):
+        """Encola la consulta de una tasa; las de días pasados se piden una sola vez."""
+        if fecha < hoy:
+            with self._lock:
+                if (moneda, fecha) in self._pedidas:
+                    return
+                self._pedidas.add((moneda, fecha))
+        try:
+            futuro = self._ejecutor.submit(self._consultar, moneda, fecha)
+        except RuntimeError:
+            return  # La precarga ya se detuvo.
+        with self._lock:
+            self._pendientes.add(futuro)
+        futuro.add_done_callback(self._terminar)
+
+    def _terminar(self, futuro):
+        """Quita una consulta terminada de las pendientes."""
+        with self._lock:
+            self._pendientes.discard(futuro)
+
+    def _consultar(self, moneda: str, fecha: date):
+        """Consulta una tasa para dejarla en la caché, descartando los errores."""
+        try:
+            ControlAPIMonedaIntercambio.obtener_tasa_cambio(moneda, fecha)
+        except (RuntimeError, ValueError):
+            with self._lock:
+                self.fallidas += 1
+                self._pedidas.discard((moneda, fecha))
+            if REGISTRO.activo:
+                TASAS_PRECARGADAS.etiquetas("error").inc()
+            return
+        with self._lock:
+            self.precargadas += 1
+        if REGISTRO.activo:
+            TASAS_PRECARGADAS.etiquetas("ok").inc()
+
+    def _iniciar_hilo(self):
+        """Arranca, si no está corriendo, el hilo que revisa el día actual."""
+        if self._hilo is None and not self._detener.is_set():
+            self._hilo = threading.Thread(target=self._ciclo, name="precarga-diaria",
+                                          daemon=True)
+            self._hilo.start()
+
+    def _ciclo(self):
+        """Espera hasta el próximo día o el próximo intervalo y revisa el día actual."""
+        while True:
+            manana = datetime.combine(self._hoy() + timedelta(days=1), time())
+            segundos = (manana - datetime.now()).total_seconds()
+            if self._detener.wait(max(min(segundos, self.intervalo), 1)):
+                return
+            self.revisar_dia()
+
+    def esperar(self, timeout: float = None) -> bool:
+        """
+        Espera a que terminen las consultas encoladas hasta ahora.
+
+        Args:
+            timeout (float | None): Segundos máximos de espera.
+
+        Returns:
+            bool: True si todas terminaron a tiempo.
+        """
+        with self._lock:
+            pendientes = list(self._pendientes)
+        return not wait(pendientes, timeout).not_done
+
+    def detener(self):
+        """Detiene el hilo diario y descarta las consultas que aún no empiezan."""
+        self._detener.set()
+        self._ejecutor.shutdown(wait=True, cancel_futures=True)
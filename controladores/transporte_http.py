@@ -0,0 +1,225 @@
+"""
+Módulo que define el transporte HTTP compartido para consultar la API de tasas de cambio.
+
+Usa una única sesión de `requests` con un pool de conexiones persistentes (keep-alive), de modo
+que las consultas sucesivas al mismo servidor reutilizan la conexión TCP/TLS. Los errores
+transitorios (tiempos de espera, fallos de conexión y respuestas 5xx) se reintentan un número
+acotado de veces con espera exponencial.
+
+Las consultas pasan por un interruptor de circuito. Tras varios fallos seguidos del servidor
+(errores de conexión, 5xx o respuestas inválidas), el circuito se abre. Mientras está abierto,
+las consultas fallan de inmediato con CircuitoAbiertoError, sin esperar tiempos de espera. Pasado
+un intervalo, se deja pasar una única consulta de prueba (semiabierto): si responde, el circuito
+se cierra, y si falla, vuelve a abrirse. Un 404 u otro error 4xx es una respuesta del servidor, así
+que no cuenta como fallo.
+
+`requests` (con urllib3, idna y charset_normalizer) se importa al crear la sesión, en la primera
+consulta, y no al importar el módulo: los viajes nacionales nunca convierten montos y no
+deberían pagar su tiempo de carga al iniciar la aplicación.
+"""
+
+import threading
+import time
+
+
+class ErrorTransporte(RuntimeError):
+    """Se lanza cuando una consulta HTTP falla de forma definitiva (sin contar el 404)."""
+
+
+class CircuitoAbiertoError(ErrorTransporte):
+    """Se lanza sin consultar al servidor mientras el circuito está abierto."""
+
+
+class InterruptorCircuito:
+    """
+    Interruptor de circuito con estados cerrado, abierto y semiabierto.
+
+    Atributos:
+        fallos_para_abrir (int): Fallos consecutivos que abren el circuito.
+        espera_apertura (float): Segundos que el circuito permanece abierto antes de probar.
+        estado (str): CERRADO, ABIERTO o SEMIABIERTO.
+    """
+
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(self, fallos_para_abrir: int = 5, espera_apertura: float = 30,
+                 reloj=time.monotonic):
+        """
+        Inicializa el interruptor cerrado.
+
+        Args:
+            fallos_para_abrir (int): Fallos consecutivos que abren el circuito.
+            espera_apertura (float): Segundos abierto antes de dejar pasar una prueba.
+            reloj (callable): Función que retorna el tiempo actual en segundos.
+
+        Raises:
+            ValueError: Si los fallos para abrir no son positivos o la espera es negativa.
+        """
+        if fallos_para_abrir <= 0:
+            raise ValueError("Los fallos para abrir el circuito deben ser positivos.")
+        if espera_apertura < 0:
+            raise ValueError("La espera de apertura no puede ser negativa.")
+        self.fallos_para_abrir = fallos_para_abrir
+        self.espera_apertura = espera_apertura
+        self.estado = self.CERRADO
+        self._reloj = reloj
+        self._fallos = 0
+        self._abierto_desde = 0.0
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        """
+        Verifica si una consulta puede hacerse ahora.
+
+        Con el circuito abierto y la espera cumplida, la consulta que llama pasa a ser la
+        prueba del estado semiabierto; las demás siguen rechazándose hasta que termine.
+
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto o ya hay una prueba en curso.
+        """
+        if self.estado == self.CERRADO:
+            return
+        with self._lock:
+            if self.estado == self.CERRADO:
+                return
+            ahora = self._reloj()
+            # También se deja pasar una nueva prueba si la anterior no terminó a tiempo.
+            if ahora - self._abierto_desde >= self.espera_apertura:
+                self.estado = self.SEMIABIERTO
+                self._abierto_desde = ahora
+                return
+        raise CircuitoAbiertoError("El servicio de tasas no responde; se reintentará en "
+                                   f"{self.espera_apertura} s.")
+
+    def registrar_exito(self):
+        """Cierra el circuito y reinicia la cuenta de fallos."""
+        if self.estado == self.CERRADO and not self._fallos:
+            return
+        with self._lock:
+            self._fallos = 0
+            self.estado = self.CERRADO
+
+    def registrar_fallo(self):
+        """Cuenta un fallo; abre el circuito al llegar al límite o si falla la prueba."""
+        with self._lock:
+            self._fallos += 1
+            if self.estado == self.SEMIABIERTO or self._fallos >= self.fallos_para_abrir:
+                self.estado = self.ABIERTO
+                self._abierto_desde = self._reloj()
+
+
+class TransporteHTTP:
+    """
+    Cliente HTTP con pool de conexiones y reintentos acotados.
+
+    Atributos:
+        timeout (float): Segundos máximos de espera por cada intento.
+        sesion (requests.Session): Sesión compartida que mantiene las conexiones abiertas;
+                                   se crea en el primer acceso.
+    """
+
+    ESTADOS_REINTENTABLES = (500, 502, 503, 504)
+
+    def __init__(self, tamano_pool: int = 10, reintentos: int = 3,
+                 factor_espera: float = 0.5, timeout: float = 5,
+                 fallos_para_abrir: int = 5, espera_apertura: float = 30):
+        """
+        Guarda la configuración; la sesión y su adaptador se crean en la primera consulta.
+
+        Args:
+            tamano_pool (int): Conexiones persistentes por servidor.
+            reintentos (int): Reintentos máximos ante errores transitorios.
+            factor_espera (float): Factor de la espera exponencial entre reintentos, en segundos.
+            timeout (float): Segundos máximos de espera por cada intento.
+            fallos_para_abrir (int): Consultas fallidas seguidas que abren el circuito.
+            espera_apertura (float): Segundos que el circuito permanece abierto.
+        """
+        self.timeout = timeout
+        self.interruptor = InterruptorCircuito(fallos_para_abrir, espera_apertura)
+        self._tamano_pool = tamano_pool
+        self._reintentos = reintentos
+        self._factor_espera = factor_espera
+        self._sesion = None
+        self._error_red = None
+        self._lock = threading.Lock()
+
+    @property
+    def sesion(self):
+        """Sesión de `requests`; en el primer acceso importa `requests` y la crea."""
+        if self._sesion is None:
+            with self._lock:
+                if self._sesion is None:
+                    self._sesion = self._crear_sesion()
+        return self._sesion
+
+    def _crear_sesion(self):
+        """Importa `requests` y crea la sesión con el pool y la política de reintentos."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        politica = Retry(
+            total=self._reintentos,
+            backoff_factor=self._factor_espera,
+            status_forcelist=self.ESTADOS_REINTENTABLES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adaptador = HTTPAdapter(
+            pool_connections=self._tamano_pool, pool_maxsize=self._tamano_pool,
+            max_retries=politica
+        )
+        sesion = requests.Session()
+        sesion.mount("https://", adaptador)
+        sesion.mount("http://", adaptador)
+        self._error_red = requests.exceptions.RequestException
+        return sesion
+
+    def obtener_json(self, url: str):
+        """
+        Realiza una consulta GET y decodifica la respuesta como JSON.
+
+        Args:
+            url (str): Dirección a consultar.
+
+        Returns:
+            dict | None: Contenido de la respuesta, o None si el recurso no existe (404).
+
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto (no se consulta al servidor).
+            ErrorTransporte: Si la consulta falla tras los reintentos o responde con otro error.
+        """
+        self.interruptor.permitir()
+        sesion = self.sesion
+        try:
+            response = sesion.get(url, timeout=self.timeout)
+        except self._error_red as e:
+            self.interruptor.registrar_fallo()
+            raise ErrorTransporte(f"No se pudo consultar {url}: {e}") from e
+
+        if response.status_code >= 500:
+            self.interruptor.registrar_fallo()
+            raise ErrorTransporte(f"Error HTTP {response.status_code} al consultar {url}")
+        if response.status_code == 404:
+            self.interruptor.registrar_exito()
+            return None
+        if response.status_code >= 400:
+            self.interruptor.registrar_exito()
+            raise ErrorTransporte(f"Error HTTP {response.status_code} al consultar {url}")
+
+        try:
+            datos = response.json()
+        except ValueError as e:
+            self.interruptor.registrar_fallo()
+            raise ErrorTransporte(f"Respuesta inválida de {url}: {e}") from e
+        self.interruptor.registrar_exito()
+        return datos
+
+    def cerrar(self):
+        """Cierra la sesión, si llegó a crearse, y libera las conexiones del pool."""
+        with self._lock:
+            sesion, self._sesion = self._sesion, None
+        if sesion is not None:
+            sesion.close()
@@ -5,17 +5,37 @@ Permite a los usuarios registrar un viaje (nacional o internacional),
 agregar gastos durante las fechas del viaje, y ver reportes por día o por tipo de gasto. 
 En caso de viajes internacionales, convierte automáticamente los valores a COP.
 
-El registro se realiza por consola y la información puede mantenerse en memoria.
+El registro se realiza por consola. Los cambios del viaje se guardan en un diario en disco,
+de modo que un viaje interrumpido puede reanudarse al volver a ejecutar la aplicación.
+
+Si la variable de entorno METRICAS_PUERTO está definida, las métricas de la aplicación se
+publican en formato Prometheus en http://127.0.0.1:<puerto>/metrics. Si existe el paquete de
+tasas RUTA_PAQUETE_TASAS (creado con `python -m controladores.construir_paquete_tasas`), las
+tasas se leen de él sin acceder a la red. Si la variable de entorno PRECARGA_TASAS está
+definida, las tasas de los días de un viaje internacional se consultan en segundo plano desde
+su registro.
 """
 
+import os
+from collections import deque
 from datetime import  datetime
 from enums.tipo_viaje import TipoViaje
 from enums.tipo_gasto import TipoGasto
 from enums.medio_pago import MedioPago
 from modelos.destino import Destino
 from controladores.control_viaje import ControlViaje
-from controladores.control_gasto import ControlGasto
+from controladores.control_gasto import ControlGasto, ViajeFinalizadoError
 from controladores.control_reporte import ControlReporte
+from controladores.control_presupuesto import ControlPresupuesto, EXCEDIDO
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.lector_gastos import leer_archivo
+from controladores.metricas import REGISTRO
+from controladores.precarga_tasas import PrecargaTasas
+from persistencia.diario_viaje import DiarioViaje
+
+RUTA_CACHE_TASAS = "tasas_cambio.sqlite3"
+RUTA_PAQUETE_TASAS = "tasas.paquete"
+DIRECTORIO_DIARIO = "diario_viaje"
 
 def leer_fecha(mensaje):
     """
@@ -34,6 +54,40 @@ def leer_fecha(mensaje):
         except ValueError:
             print("⚠️ Fecha inválida, intenta de nuevo.")
 
+def leer_fecha_opcional(mensaje):
+    """
+    Solicita una fecha que el usuario puede dejar en blanco.
+
+    Args:
+        mensaje (str): Mensaje a mostrar al usuario.
+
+    Returns:
+        date | None: Fecha ingresada, o None si la entrada quedó vacía.
+    """
+    while True:
+        entrada = input(mensaje + " (formato YYYY-MM-DD, vacío para omitir): ").strip()
+        if not entrada:
+            return None
+        try:
+            return datetime.strptime(entrada, "%Y-%m-%d").date()
+        except ValueError:
+            print("⚠️ Fecha inválida, intenta de nuevo.")
+
+def mostrar_alerta_presupuesto(alerta):
+    """
+    Informa por consola que se cruzó un umbral del presupuesto.
+
+    Args:
+        alerta (AlertaPresupuesto): Umbral cruzado.
+    """
+    ambito = "del viaje" if alerta.fecha is None else f"para {alerta.fecha}"
+    if alerta.umbral == EXCEDIDO:
+        print(f"⚠️ Presupuesto {ambito} excedido: "
+              f"{alerta.gastado:.2f} de {alerta.presupuesto:.2f} COP")
+    else:
+        print(f"⚠️ Se alcanzó el {alerta.umbral} del presupuesto {ambito}: "
+              f"{alerta.gastado:.2f} de {alerta.presupuesto:.2f} COP")
+
 def mostrar_menu_gastos():
     """
     Muestra el menú interactivo para ingresar un gasto.
@@ -63,19 +117,13 @@ def mostrar_menu_gastos():
 
     return fecha, valor, medio_pago, tipo_gasto
 
-def main():
+def leer_datos_viaje():
     """
-    Función principal que gestiona el flujo de la aplicación por consola.
+    Solicita al usuario los datos de un viaje nuevo.
 
-    Permite:
-    - Registrar un nuevo viaje.
-    - Registrar gastos durante el viaje.
-    - Generar reportes diarios y por tipo de gasto.
-    - Finalizar el viaje y bloquear nuevos registros.
+    Returns:
+        tuple: Fecha de inicio, fecha de fin, presupuesto diario, destino y tipo de viaje.
     """
-    print(" Bienvenido al registro de gastos de viaje")
-
-    # --- Registro del viaje ---
     tipo = input("¿El viaje es nacional o internacional? (n/i): ").lower()
     tipo_viaje = TipoViaje.NACIONAL if tipo == "n" else TipoViaje.INTERNACIONAL
 
@@ -84,15 +132,47 @@ def main():
     pais = input("País: ")
     moneda = input("Moneda local (ej: cop, usd, eur): ").lower()
 
-    destino = Destino(ciudad, departamento, pais, moneda)
+    destino = Destino.obtener(ciudad, departamento, pais, moneda)
     fecha_inicio = leer_fecha("Fecha de inicio del viaje")
     fecha_fin = leer_fecha("Fecha de fin del viaje")
     presupuesto_diario = float(input("Presupuesto diario en COP: "))
+    return fecha_inicio, fecha_fin, presupuesto_diario, destino, tipo_viaje
+
+def main():
+    """
+    Función principal que gestiona el flujo de la aplicación por consola.
+
+    Permite:
+    - Registrar un nuevo viaje o reanudar el viaje guardado en el diario.
+    - Registrar gastos durante el viaje, uno a uno o importándolos desde un archivo.
+    - Generar reportes diarios y por tipo de gasto.
+    - Finalizar el viaje y bloquear nuevos registros.
+    """
+    print(" Bienvenido al registro de gastos de viaje")
+    ControlAPIMonedaIntercambio.configurar_cache(ruta=RUTA_CACHE_TASAS)
+    if os.path.exists(RUTA_PAQUETE_TASAS):
+        ControlAPIMonedaIntercambio.configurar_paquete(RUTA_PAQUETE_TASAS)
+    puerto_metricas = os.environ.get("METRICAS_PUERTO")
+    if puerto_metricas:
+        REGISTRO.activar()
+        direccion, puerto = REGISTRO.servir(int(puerto_metricas))
+        print(f" Métricas en http://{direccion}:{puerto}/metrics")
 
-    control_viaje = ControlViaje()
-    control_viaje.registrar_viaje(fecha_inicio, fecha_fin, presupuesto_diario, destino, tipo_viaje)
+    # --- Registro del viaje ---
+    precarga = PrecargaTasas() if os.environ.get("PRECARGA_TASAS") else None
+    control_viaje = ControlViaje(precarga=precarga)
+    diario = DiarioViaje(DIRECTORIO_DIARIO)
+    if diario.existe() and input("Hay un viaje guardado. ¿Reanudarlo? (s/n): ").lower() == "s":
+        control_viaje.reanudar_viaje(diario.recuperar())
+    else:
+        diario.descartar()
+        control_viaje.registrar_viaje(*leer_datos_viaje())
+        diario.iniciar(control_viaje.get_viaje())
     viaje = control_viaje.get_viaje()
     control_gasto = ControlGasto(viaje, control_viaje)
+    # Las alertas llegan con el lock del viaje tomado: se encolan y se muestran fuera de él.
+    alertas = deque()
+    ControlPresupuesto(viaje).suscribir(alertas.append)
 
     # --- Registro de gastos ---
     while viaje.estado_viaje:
@@ -101,22 +181,25 @@ def main():
         print("2. Finalizar viaje")
         print("3. Ver reporte diario")
         print("4. Ver reporte por tipo")
+        print("5. Importar gastos desde archivo (CSV o JSONL)")
         opcion = input("Elige una opción: ")
 
         if opcion == "1":
             try:
                 datos = mostrar_menu_gastos()
                 control_gasto.registrar_gasto(*datos)
-            except Exception as e:
+            # KeyError: opción de medio de pago o de tipo de gasto inexistente.
+            except (KeyError, ValueError, RuntimeError, ViajeFinalizadoError) as e:
                 print(f" Error: {e}")
 
         elif opcion == "2":
             control_viaje.finalizar_viaje()
 
         elif opcion == "3":
-            reporte_dia = ControlReporte.calcular_reporte_gastos_todos_los_dias(None, viaje)
+            desde = leer_fecha_opcional("Desde")
+            hasta = leer_fecha_opcional("Hasta")
             print("\n--- Reporte por día ---")
-            for fecha, datos in reporte_dia.items():
+            for fecha, datos in ControlReporte.iterar_reporte_diario(viaje, desde, hasta):
                 print(f"{fecha}: {datos}")
 
         elif opcion == "4":
@@ -125,19 +208,43 @@ def main():
             for tipo, datos in reporte_tipo.items():
                 print(f"{tipo}: {datos}")
 
+        elif opcion == "5":
+            ruta = input("Ruta del archivo: ")
+            try:
+                resumen = control_gasto.registrar_gastos_lote(leer_archivo(ruta))
+                for linea, motivo in resumen['errores']:
+                    print(f" Línea {linea}: {motivo}")
+            except (OSError, ValueError, RuntimeError, ViajeFinalizadoError) as e:
+                print(f" Error: {e}")
+
         else:
             print(" Opción inválida")
 
+        while alertas:
+            mostrar_alerta_presupuesto(alertas.popleft())
+
+    diario.cerrar()
+    if precarga is not None:
+        precarga.detener()
     print("\n El viaje ha sido finalizado. No se permiten más gastos.")
+    # Una sola copia de los agregados: las cuatro secciones reflejan el mismo estado.
+    reportes = ControlReporte.generar_reportes(viaje)
     print("--- Reporte final por día ---")
-    reporte_dia = ControlReporte.calcular_reporte_gastos_todos_los_dias(None, viaje)
-    for fecha, datos in reporte_dia.items():
+    for fecha, datos in sorted(reportes['diario'].items()):
         print(f"{fecha}: {datos}")
 
     print("\n--- Reporte final por tipo ---")
-    reporte_tipo = ControlReporte.reporte_por_tipo(viaje)
-    for tipo, datos in reporte_tipo.items():
+    for tipo, datos in reportes['por_tipo'].items():
         print(f"{tipo}: {datos}")
 
+    print("\n--- Reporte final por medio de pago ---")
+    for medio, total in reportes['por_medio'].items():
+        print(f"{medio}: {total}")
+
+    print("\n--- Reporte final por día y tipo ---")
+    for fecha, tipos in sorted(reportes['fecha_tipo'].items()):
+        for tipo, datos in tipos.items():
+            print(f"{fecha} {tipo}: {datos}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,293 @@
+"""
+Módulo que define un almacén columnar de gastos, alternativo a la lista de objetos Gasto.
+
+Cada atributo del gasto se guarda en un arreglo compacto del módulo `array`: la fecha como
+ordinal int32, el medio de pago y el tipo de gasto como códigos int8 y los valores como centavos
+int64. Así, un gasto ocupa 22 bytes en lugar de un objeto Python completo con su diccionario, y
+los totales de la tabla cruzada son sumas enteras exactas.
+
+La tabla cruzada fecha × tipo × medio de pago, de la que se derivan todos los reportes, se
+calcula con operaciones vectorizadas de NumPy (`bincount`) cuando está instalado; si no lo
+está, se recorren los arreglos en Python. NumPy se importa en el primer cálculo y no al cargar
+el módulo, porque su importación domina el arranque de la aplicación.
+El almacén entrega objetos Gasto al acceder a sus elementos, por lo que puede usarse
+donde se espera la lista de gastos de un viaje.
+"""
+
+from array import array
+from datetime import date
+from functools import lru_cache
+
+from enums.medio_pago import MedioPago
+
+from enums.tipo_gasto import TipoGasto
+
+from modelos.gasto import Gasto
+
+MEDIOS = tuple(MedioPago)
+TIPOS = tuple(TipoGasto)
+CODIGO_MEDIO = {medio: codigo for codigo, medio in enumerate(MEDIOS)}
+CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+NOMBRES_MEDIO = tuple(medio.name for medio in MEDIOS)
+NOMBRES_TIPO = tuple(tipo.name for tipo in TIPOS)
+
+
+def fila_gasto(gasto: Gasto) -> tuple:
+    """
+    Retorna los datos de un gasto en el orden de las columnas del almacén.
+
+    Returns:
+        tuple: (ordinal de la fecha, código de medio, código de tipo, centavos, centavos en COP).
+    """
+    return (gasto.get_fecha().toordinal(),
+            CODIGO_MEDIO[gasto.get_medio_pago()],
+            CODIGO_TIPO[gasto.get_tipo_gasto()],
+            gasto.get_centavos(), gasto.get_centavos_cop())
+
+
+def gasto_desde_fila(fila: tuple) -> Gasto:
+    """Construye el Gasto correspondiente a una fila obtenida con `fila_gasto`."""
+    ordinal, medio, tipo, centavos, centavos_cop = fila
+    return Gasto.desde_centavos(date.fromordinal(ordinal), centavos, MEDIOS[medio], TIPOS[tipo],
+                                centavos_cop)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Importa NumPy la primera vez que se necesita; retorna None si no está instalado."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class AlmacenGastosColumnar:
+    """
+    Secuencia de gastos almacenada por columnas.
+
+    Atributos:
+        fechas (array): Ordinales de las fechas (int32).
+        medios (array): Códigos de MedioPago (int8).
+        tipos (array): Códigos de TipoGasto (int8).
+        valores (array): Valores originales en centavos (int64).
+        valores_cop (array): Valores en centavos de COP (int64).
+    """
+
+    def __init__(self, gastos=()):
+        """
+        Inicializa el almacén, opcionalmente con gastos iniciales.
+
+        Args:
+            gastos (iterable[Gasto]): Gastos a cargar.
+        """
+        self.fechas = array('i')
+        self.medios = array('b')
+        self.tipos = array('b')
+        self.valores = array('q')
+        self.valores_cop = array('q')
+        self.extend(gastos)
+
+    def columnas(self) -> tuple:
+        """
+        Retorna los arreglos del almacén en un orden fijo, útil para serializarlos.
+
+        Returns:
+            tuple: (fechas, medios, tipos, valores, valores_cop).
+        """
+        return self.fechas, self.medios, self.tipos, self.valores, self.valores_cop
+
+    def a_bytes(self) -> tuple:
+        """
+        Retorna el contenido de cada arreglo como bytes, en el orden de `columnas`.
+
+        Es la forma compacta de enviar el almacén a otro proceso: se serializan cinco
+        bloques de bytes en lugar de un objeto Gasto por elemento.
+
+        Returns:
+            tuple[bytes]: Un bloque por columna.
+        """
+        return tuple(columna.tobytes() for columna in self.columnas())
+
+    @classmethod
+    def desde_bytes(cls, bloques):
+        """
+        Reconstruye un almacén a partir de los bloques entregados por `a_bytes`.
+
+        Args:
+            bloques (iterable[bytes]): Un bloque por columna, en el orden de `columnas`.
+
+        Returns:
+            AlmacenGastosColumnar: Almacén con los gastos de los bloques.
+        """
+        almacen = cls()
+        for columna, bloque in zip(almacen.columnas(), bloques):
+            columna.frombytes(bloque)
+        return almacen
+
+    def extender_almacen(self, otro):
+        """
+        Agrega al final todos los gastos de otro almacén columnar, copiando arreglo por arreglo.
+
+        Args:
+            otro (AlmacenGastosColumnar): Almacén cuyos gastos se agregan.
+        """
+        for columna, origen in zip(self.columnas(), otro.columnas()):
+            columna.extend(origen)
+
+    def copiar(self):
+        """
+        Retorna una copia independiente del almacén, copiando cada arreglo en bloque.
+
+        Returns:
+            AlmacenGastosColumnar: Copia del almacén.
+        """
+        copia = AlmacenGastosColumnar()
+        copia.fechas, copia.medios, copia.tipos, copia.valores, copia.valores_cop = (
+            columna[:] for columna in self.columnas()
+        )
+        return copia
+
+    def append(self, gasto: Gasto):
+        """
+        Agrega un gasto al final del almacén.
+
+        Args:
+            gasto (Gasto): Gasto a agregar.
+        """
+        self.agregar_fila(fila_gasto(gasto))
+
+    def agregar_fila(self, fila: tuple):
+        """
+        Agrega al final del almacén un gasto ya codificado con `fila_gasto`.
+
+        Args:
+            fila (tuple): (ordinal, código de medio, código de tipo, centavos, centavos en COP).
+        """
+        ordinal, medio, tipo, centavos, centavos_cop = fila
+        self.fechas.append(ordinal)
+        self.medios.append(medio)
+        self.tipos.append(tipo)
+        self.valores.append(centavos)
+        self.valores_cop.append(centavos_cop)
+
+    def extend(self, gastos):
+        """
+        Agrega varios gastos al final del almacén.
+
+        Args:
+            gastos (iterable[Gasto]): Gastos a agregar.
+        """
+        for gasto in gastos:
+            self.append(gasto)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __getitem__(self, posicion: int) -> Gasto:
+        """Construye el Gasto almacenado en la posición indicada."""
+        return gasto_desde_fila(self.fila(posicion))
+
+    def fila(self, posicion: int) -> tuple:
+        """Retorna los datos codificados del gasto de la posición indicada."""
+        return tuple(columna[posicion] for columna in self.columnas())
+
+    def __setitem__(self, posicion: int, gasto: Gasto):
+        """Sobrescribe el gasto de la posición indicada."""
+        for columna, dato in zip(self.columnas(), fila_gasto(gasto)):
+            columna[posicion] = dato
+
+    def __delitem__(self, posicion: int):
+        """Elimina el gasto de la posición indicada."""
+        for columna in self.columnas():
+            del columna[posicion]
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self[posicion]
+
+    def index(self, gasto: Gasto) -> int:
+        """
+        Retorna la posición del primer gasto con los mismos datos.
+
+        Como los Gasto entregados por el almacén se construyen al vuelo, la búsqueda compara
+        los datos del gasto y no la identidad del objeto.
+
+        Raises:
+            ValueError: Si no hay ningún gasto con esos datos.
+        """
+        return self.buscar_fila(fila_gasto(gasto))
+
+    def buscar_fila(self, fila: tuple) -> int:
+        """
+        Retorna la posición del primer gasto cuyos datos codificados coinciden con la fila.
+
+        Raises:
+            ValueError: Si no hay ningún gasto con esos datos.
+        """
+        for posicion, actual in enumerate(zip(*self.columnas())):
+            if actual == fila:
+                return posicion
+        raise ValueError("El gasto no está en el almacén.")
+
+    def remove(self, gasto: Gasto):
+        """
+        Elimina el primer gasto con los mismos datos.
+
+        Raises:
+            ValueError: Si no hay ningún gasto con esos datos.
+        """
+        del self[self.index(gasto)]
+
+    def tabla_cruzada(self):
+        """
+        Calcula la tabla cruzada fecha × tipo de gasto × medio de pago de los centavos en COP.
+
+        Returns:
+            tuple: (tabla, cantidades) con la misma forma que `calcular_tabla_cruzada` de
+                   resumen_gastos; las celdas quedan en orden cronológico.
+        """
+        if len(self) and _numpy() is not None:
+            return self._tabla_cruzada_vectorizada()
+
+        tabla = {}
+        cantidades = {}
+        for ordinal, tipo, medio, valor in sorted(zip(self.fechas, self.tipos, self.medios,
+                                                      self.valores_cop)):
+            celda = (date.fromordinal(ordinal), NOMBRES_TIPO[tipo], NOMBRES_MEDIO[medio])
+            tabla[celda] = tabla.get(celda, 0) + valor
+            cantidades[celda] = cantidades.get(celda, 0) + 1
+        return tabla, cantidades
+
+    def _tabla_cruzada_vectorizada(self):
+        """
+        Versión de `tabla_cruzada` vectorizada con NumPy sobre los arreglos sin copiarlos.
+
+        Cada gasto se asigna a una celda combinando el índice de su fecha, su tipo y su medio
+        de pago en un solo entero. Las cantidades se cuentan con `bincount`; los centavos se
+        suman con `add.at` sobre int64, porque `bincount` con pesos sumaría en float64.
+        """
+        np = _numpy()
+        fechas = np.frombuffer(self.fechas, dtype=np.intc)
+        tipos = np.frombuffer(self.tipos, dtype=np.int8).astype(np.intp)
+        medios = np.frombuffer(self.medios, dtype=np.int8).astype(np.intp)
+        valores = np.frombuffer(self.valores_cop, dtype=np.int64)
+
+        ordinales, indice_fecha = np.unique(fechas, return_inverse=True)
+        celdas_por_dia = len(TIPOS) * len(MEDIOS)
+        celda = (indice_fecha * len(TIPOS) + tipos) * len(MEDIOS) + medios
+        largo = len(ordinales) * celdas_por_dia
+        totales = np.zeros(largo, dtype=np.int64)
+        np.add.at(totales, celda, valores)
+        conteos = np.bincount(celda, minlength=largo)
+
+        tabla = {}
+        cantidades = {}
+        for posicion in np.flatnonzero(conteos).tolist():
+            dia, resto = divmod(posicion, celdas_por_dia)
+            tipo, medio = divmod(resto, len(MEDIOS))
+            clave = (date.fromordinal(int(ordinales[dia])), NOMBRES_TIPO[tipo],
+                     NOMBRES_MEDIO[medio])
+            tabla[clave] = int(totales[posicion])
+            cantidades[clave] = int(conteos[posicion])
+        return tabla, cantidades
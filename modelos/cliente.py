@@ -15,6 +15,8 @@ class Cliente:
         correo (str): Correo electrónico del cliente.
     """
 
+    __slots__ = ('nombre_completo', 'cedula', 'telefono', 'correo')
+
     def __init__(self, nombre_completo: str, cedula: str, telefono: str, correo: str):
         """Inicializa un objeto Cliente con sus datos personales."""
         self.nombre_completo = nombre_completo
@@ -3,7 +3,12 @@
 
     Contiene la información geográfica y monetaria del lugar de destino, 
     la cual es útil para calcular conversiones de divisas y reportes.
+
+    Los destinos obtenidos con `Destino.obtener` se comparten entre todos los viajes que
+    tienen la misma ciudad, departamento, país y moneda, en lugar de duplicarse por viaje.
 """
+import weakref
+
 class Destino:
     """
     Representa el destino de un viaje.
@@ -15,6 +20,33 @@ class Destino:
         moneda_local (str): Código de la moneda local del destino (por ejemplo, 'cop', 'usd').
     """
 
+    __slots__ = ('ciudad', 'departamento', 'pais', 'moneda_local', '__weakref__')
+    _internados = weakref.WeakValueDictionary()
+
+    @classmethod
+    def obtener(cls, ciudad: str, departamento: str, pais: str, moneda_local: str):
+        """
+        Retorna el destino compartido con estos datos, creándolo si aún no existe.
+
+        Los destinos compartidos no deben modificarse, ya que el cambio afectaría a todos
+        los viajes que los usan. Se liberan cuando ningún viaje los referencia.
+
+        Args:
+            ciudad (str): Nombre de la ciudad del destino.
+            departamento (str): Departamento o región administrativa del destino.
+            pais (str): País del destino.
+            moneda_local (str): Código de la moneda local del destino.
+
+        Returns:
+            Destino: Instancia única para esos datos.
+        """
+        clave = (ciudad, departamento, pais, moneda_local)
+        destino = cls._internados.get(clave)
+        if destino is None:
+            destino = cls(ciudad, departamento, pais, moneda_local)
+            cls._internados[clave] = destino
+        return destino
+
     def __init__(self, ciudad: str, departamento: str, pais: str, moneda_local: str):
         """Inicializa un objeto Destino con ciudad, departamento, país y moneda local."""
         self.ciudad = ciudad
@@ -0,0 +1,132 @@
+"""
+Módulo que define la representación interna del dinero: enteros de centavos.
+
+Los montos se guardan y se suman como `int` de centavos (centésimas de la unidad), de modo que
+la suma de muchos gastos es exacta y no acumula el error de redondeo de los float, y los
+valores caben en arreglos int64 (`array('q')`). La API sigue aceptando montos float: se
+convierten a centavos al entrar, redondeando al centavo más cercano (las mitades se alejan de
+cero), y vuelven a unidades solo al entregar o mostrar un resultado.
+
+El redondeo se calcula con float y solo recurre a `Decimal` cuando el resultado queda a una
+distancia de media unidad que el error del float no permite resolver; así, convertir un monto
+con a lo sumo dos decimales no crea ningún objeto Decimal.
+"""
+
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTAVOS_POR_UNIDAD = 100
+# Error relativo máximo que se atribuye a un producto de float antes de redondearlo.
+_TOLERANCIA = 1e-12
+
+
+def _redondear(aproximado: float, exacto) -> int:
+    """
+    Redondea al entero más cercano; ante un posible empate, usa el valor exacto.
+
+    Args:
+        aproximado (float): Valor calculado con float.
+        exacto (callable): Función que retorna el mismo valor como Decimal exacto.
+
+    Returns:
+        int: Entero más cercano, con las mitades alejándose de cero.
+    """
+    entero = round(aproximado)
+    if abs(abs(aproximado - entero) - 0.5) > abs(aproximado) * _TOLERANCIA:
+        return entero
+    return int(exacto().to_integral_value(ROUND_HALF_UP))
+
+
+def a_centavos(valor) -> int:
+    """
+    Convierte un monto en unidades a centavos, redondeando al centavo más cercano.
+
+    Un float se interpreta por su representación decimal más corta: 0.285 son 29 centavos,
+    aunque 0.285 * 100 sea 28.499999999999996 en float.
+
+    Args:
+        valor (int | float | Decimal): Monto en unidades.
+
+    Returns:
+        int: Monto en centavos.
+
+    Raises:
+        TypeError: Si el valor no es numérico.
+        ValueError: Si el valor es infinito o NaN.
+    """
+    if type(valor) is int:
+        return valor * CENTAVOS_POR_UNIDAD
+    if isinstance(valor, float):
+        if not math.isfinite(valor):
+            raise ValueError(f"El monto {valor} no es finito.")
+        return _redondear(valor * CENTAVOS_POR_UNIDAD,
+                          lambda: Decimal(repr(valor)) * CENTAVOS_POR_UNIDAD)
+    if isinstance(valor, bool) or not isinstance(valor, (int, Decimal)):
+        raise TypeError("El monto debe ser un número (int o float).")
+    if isinstance(valor, int):
+        return int(valor) * CENTAVOS_POR_UNIDAD
+    if not valor.is_finite():
+        raise ValueError(f"El monto {valor} no es finito.")
+    return int((valor * CENTAVOS_POR_UNIDAD).to_integral_value(ROUND_HALF_UP))
+
+
+def a_unidades(centavos: int) -> float:
+    """Convierte centavos a unidades, para entregar el monto fuera del modelo."""
+    return centavos / CENTAVOS_POR_UNIDAD
+
+
+def aplicar_tasa(centavos: int, tasa: float) -> int:
+    """
+    Convierte un monto en centavos con una tasa de cambio, redondeando al centavo más cercano.
+
+    Args:
+        centavos (int): Monto en centavos de la moneda de origen.
+        tasa (float): Unidades de la moneda de destino por unidad de la de origen.
+
+    Returns:
+        int: Monto en centavos de la moneda de destino.
+
+    Raises:
+        ValueError: Si la tasa es infinita o NaN.
+    """
+    if not math.isfinite(tasa):
+        raise ValueError(f"La tasa {tasa} no es finita.")
+    return _redondear(centavos * tasa, lambda: Decimal(centavos) * Decimal(repr(tasa)))
+
+
+def formatear(centavos: int) -> str:
+    """
+    Formatea un monto en centavos con dos decimales exactos, por ejemplo '-1234.05'.
+
+    Args:
+        centavos (int): Monto en centavos.
+
+    Returns:
+        str: Monto en unidades, sin pasar por float.
+    """
+    unidades, resto = divmod(abs(centavos), CENTAVOS_POR_UNIDAD)
+    return f"{'-' if centavos < 0 else ''}{unidades}.{resto:02d}"
+
+
+def reporte_a_unidades(reporte: dict) -> dict:
+    """
+    Copia un reporte (diccionarios anidados de montos en centavos) con los montos en unidades.
+
+    Args:
+        reporte (dict): Reporte en centavos; no se modifica.
+
+    Returns:
+        dict: Reporte con la misma forma y los montos como float en unidades.
+    """
+    # Se recorren dos niveles por llamada: la mayoría de los reportes son fecha o tipo -> fila.
+    copia = {}
+    for clave, valor in reporte.items():
+        if type(valor) is dict:
+            fila = {}
+            for columna, monto in valor.items():
+                fila[columna] = (reporte_a_unidades(monto) if type(monto) is dict
+                                 else monto / CENTAVOS_POR_UNIDAD)
+            copia[clave] = fila
+        else:
+            copia[clave] = valor / CENTAVOS_POR_UNIDAD
+    return copia
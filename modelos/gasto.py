@@ -4,24 +4,32 @@
     Esta clase almacena tanto la información original del gasto como su equivalente en 
     pesos colombianos (COP), permitiendo realizar análisis financieros 
     y comparaciones con el presupuesto.
+
+    Los montos se guardan como enteros de centavos (ver dinero); el constructor acepta montos
+    float y los redondea al centavo, y los getters de valor los entregan de nuevo en unidades.
 """
 
 from enums.tipo_gasto import TipoGasto
 
 from enums.medio_pago import MedioPago
 
+from modelos.dinero import a_centavos, a_unidades
+
 class Gasto:
     """
     Representa un gasto realizado durante un viaje.
 
     Atributos:
         fecha (date): Fecha en la que se realizó el gasto.
-        valor (float): Valor original del gasto (en moneda local si es internacional).
+        centavos (int): Valor original del gasto en centavos (de la moneda local si es
+                        internacional).
         medio_pago (MedioPago): Medio utilizado para realizar el gasto (efectivo, tarjeta).
         tipo_gasto (TipoGasto): Categoría del gasto (transporte, alojamiento, etc.).
-        valor_cop (float): Valor del gasto convertido a pesos colombianos (COP).
+        centavos_cop (int): Valor del gasto convertido a centavos de peso colombiano (COP).
     """
 
+    __slots__ = ('fecha', 'centavos', 'medio_pago', 'tipo_gasto', 'centavos_cop')
+
     def __init__(self, fecha, valor: float, medio_pago: MedioPago,
                  tipo_gasto: TipoGasto, valor_cop: float):
         """
@@ -36,7 +44,7 @@ class Gasto:
 
         Raises:
             TypeError: Si los valores no son numéricos.
-            ValueError: Si los montos son negativos.
+            ValueError: Si los montos son negativos o no son finitos.
         """
         if not isinstance(valor, (int, float)):
             raise TypeError("El valor debe ser un número (int o float).")
@@ -44,16 +52,53 @@ class Gasto:
         if not isinstance(valor_cop, (int, float)):
             raise TypeError("El valor en COP debe ser un número (int o float).")
 
-        if valor < 0:
+        self._iniciar(fecha, a_centavos(valor), medio_pago, tipo_gasto, a_centavos(valor_cop))
+
+    @classmethod
+    def desde_centavos(cls, fecha, centavos: int, medio_pago: MedioPago,
+                       tipo_gasto: TipoGasto, centavos_cop: int):
+        """
+        Crea un gasto con los montos ya expresados en centavos, sin convertirlos.
+
+        Args:
+            fecha (date): Fecha del gasto.
+            centavos (int): Monto original en centavos.
+            medio_pago (MedioPago): Medio de pago utilizado.
+            tipo_gasto (TipoGasto): Categoría del gasto.
+            centavos_cop (int): Monto convertido, en centavos de COP.
+
+        Returns:
+            Gasto: El gasto creado.
+
+        Raises:
+            ValueError: Si los montos son negativos.
+        """
+        gasto = cls.__new__(cls)
+        gasto._iniciar(fecha, centavos, medio_pago, tipo_gasto, centavos_cop)
+        return gasto
+
+    def _iniciar(self, fecha, centavos: int, medio_pago, tipo_gasto, centavos_cop: int):
+        """Asigna los atributos, validando que los montos no sean negativos."""
+        if centavos < 0:
             raise ValueError("El valor original no puede ser negativo.")
-        if valor_cop < 0:
+        if centavos_cop < 0:
             raise ValueError("El valor en COP no puede ser negativo.")
 
         self.fecha = fecha
-        self.valor = valor
+        self.centavos = centavos
         self.medio_pago = medio_pago
         self.tipo_gasto = tipo_gasto
-        self.valor_cop = valor_cop
+        self.centavos_cop = centavos_cop
+
+    @property
+    def valor(self) -> float:
+        """Valor original del gasto, en unidades."""
+        return a_unidades(self.centavos)
+
+    @property
+    def valor_cop(self) -> float:
+        """Valor del gasto en COP, en unidades."""
+        return a_unidades(self.centavos_cop)
 
     def get_fecha(self):
         """
@@ -71,7 +116,16 @@ class Gasto:
         Returns:
             float: Valor en moneda local.
         """
-        return self.valor
+        return a_unidades(self.centavos)
+
+    def get_centavos(self) -> int:
+        """
+        Retorna el valor original del gasto en centavos.
+
+        Returns:
+            int: Valor en centavos de la moneda local.
+        """
+        return self.centavos
 
     def get_medio_pago(self):
         """
@@ -98,4 +152,13 @@ class Gasto:
         Returns:
             float: Valor del gasto en COP.
         """
-        return self.valor_cop
+        return a_unidades(self.centavos_cop)
+
+    def get_centavos_cop(self) -> int:
+        """
+        Retorna el valor del gasto convertido a COP, en centavos.
+
+        Returns:
+            int: Valor del gasto en centavos de COP.
+        """
+        return self.centavos_cop
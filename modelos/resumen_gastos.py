@@ -0,0 +1,318 @@
+"""
+Módulo que define los agregados de gastos que un viaje mantiene actualizados.
+
+En lugar de recorrer todos los gastos cada vez que se solicita un reporte, el viaje actualiza
+estos totales en cada inserción o eliminación. Los reportes se obtienen como una copia de los
+agregados, con un costo proporcional al número de días o de tipos, no al número de gastos.
+
+La base de todos los agregados es una tabla cruzada fecha × tipo de gasto × medio de pago,
+indexada por los nombres del tipo y del medio: las cadenas guardan su hash, mientras que el de
+un miembro de Enum se calcula en Python en cada búsqueda, y la tabla se actualiza en cada gasto.
+Cuando los agregados se reconstruyen desde gastos ya almacenados, los gastos se recorren una
+sola vez para llenar la tabla cruzada, y de ella se derivan los reportes por fecha, por tipo y
+por medio de pago.
+
+Todos los montos de los agregados son enteros de centavos de COP (ver dinero), así que cada
+actualización es una suma entera exacta: agregar y quitar el mismo gasto deja los totales
+exactamente como estaban. Los montos se convierten a unidades solo al entregar los reportes.
+
+Además, las fechas con gastos se mantienen en una lista ordenada de ordinales, de modo que los
+reportes por rango de fechas ubican el rango con búsqueda binaria (`bisect`) y recorren solo
+los días que contiene: O(log n + k) para k días en el rango.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+from enums.medio_pago import MedioPago
+
+from enums.tipo_gasto import TipoGasto
+
+from modelos.gasto import Gasto
+
+COLUMNA_MEDIO = {
+    MedioPago.EFECTIVO.name: 'efectivo',
+    MedioPago.TARJETA_DEBITO.name: 'tarjetas',
+    MedioPago.TARJETA_CREDITO.name: 'tarjetas',
+}
+NOMBRES_TIPO = tuple(tipo.name for tipo in TipoGasto)
+NOMBRES_MEDIO = tuple(medio.name for medio in MedioPago)
+
+
+def columna_medio(medio) -> str:
+    """
+    Retorna la columna del reporte ('efectivo' o 'tarjetas') que corresponde a un medio de pago.
+
+    Raises:
+        ValueError: Si el medio de pago no es reconocido.
+    """
+    if not isinstance(medio, MedioPago):
+        raise ValueError(f"Medio de pago desconocido: {medio}")
+    return COLUMNA_MEDIO[medio.name]
+
+
+def calcular_tabla_cruzada(gastos) -> tuple:
+    """
+    Recorre los gastos una sola vez y acumula la tabla cruzada fecha × tipo × medio de pago.
+
+    Args:
+        gastos (iterable[Gasto]): Gastos a agrupar.
+
+    Returns:
+        tuple: (tabla, cantidades), ambos indexados por (fecha, nombre del tipo, nombre del
+               medio); la tabla contiene el total en centavos de COP de cada celda y
+               `cantidades` el número de gastos.
+
+    Raises:
+        ValueError: Si algún gasto tiene un medio de pago desconocido.
+    """
+    tabla = {}
+    cantidades = {}
+    for gasto in gastos:
+        medio = gasto.get_medio_pago()
+        columna_medio(medio)
+        celda = (gasto.get_fecha(), gasto.get_tipo_gasto().name, medio.name)
+        tabla[celda] = tabla.get(celda, 0) + gasto.get_centavos_cop()
+        cantidades[celda] = cantidades.get(celda, 0) + 1
+    return tabla, cantidades
+
+
+class ResumenGastos:
+    """
+    Totales en centavos de COP por fecha, por tipo de gasto y por medio de pago.
+
+    Atributos:
+        tabla (dict): (fecha, nombre del tipo, nombre del medio) -> centavos de la celda.
+        por_fecha (dict): Fecha -> {'efectivo', 'tarjetas', 'total'}, en orden de aparición.
+        por_tipo (dict): Nombre del tipo de gasto -> {'efectivo', 'tarjetas', 'total'}.
+        por_medio (dict): Nombre del medio de pago -> centavos.
+    """
+
+    __slots__ = ('tabla', 'por_fecha', 'por_tipo', 'por_medio',
+                 '_cantidad_por_celda', '_cantidad_por_fecha', '_ordinales')
+
+    def __init__(self):
+        """Inicializa los agregados vacíos, con todos los tipos y medios de pago en cero."""
+        self.tabla = {}
+        self.por_fecha = {}
+        self.por_tipo = {tipo: {'efectivo': 0, 'tarjetas': 0, 'total': 0}
+                         for tipo in NOMBRES_TIPO}
+        self.por_medio = dict.fromkeys(NOMBRES_MEDIO, 0)
+        self._cantidad_por_celda = {}
+        self._cantidad_por_fecha = {}
+        self._ordinales = []
+
+    @classmethod
+    def desde_gastos(cls, gastos):
+        """
+        Construye los agregados a partir de gastos ya almacenados.
+
+        Si el almacén sabe calcular su propia tabla cruzada (por ejemplo, de forma vectorizada),
+        se usa directamente; si no, se calcula con un solo recorrido de los gastos.
+
+        Args:
+            gastos: Lista de Gasto o almacén de gastos.
+
+        Returns:
+            ResumenGastos: Agregados de los gastos recibidos.
+        """
+        if hasattr(gastos, 'tabla_cruzada'):
+            tabla, cantidades = gastos.tabla_cruzada()
+        else:
+            tabla, cantidades = calcular_tabla_cruzada(gastos)
+        return cls.desde_tabla(tabla, cantidades)
+
+    @classmethod
+    def desde_tabla(cls, tabla: dict, cantidades: dict):
+        """
+        Deriva todos los agregados de una tabla cruzada ya calculada.
+
+        Args:
+            tabla (dict): (fecha, nombre del tipo, nombre del medio) -> centavos de COP.
+            cantidades (dict): (fecha, nombre del tipo, nombre del medio) -> número de gastos.
+
+        Returns:
+            ResumenGastos: Agregados derivados de la tabla.
+        """
+        resumen = cls()
+        resumen.tabla = tabla
+        resumen._cantidad_por_celda = cantidades
+        for celda, valor in tabla.items():
+            fecha, tipo, medio = celda
+            resumen._sumar_derivados(fecha, tipo, medio, COLUMNA_MEDIO[medio], valor)
+            resumen._cantidad_por_fecha[fecha] = (
+                resumen._cantidad_por_fecha.get(fecha, 0) + cantidades[celda]
+            )
+        return resumen
+
+    def agregar(self, gasto: Gasto):
+        """
+        Suma un gasto a los agregados.
+
+        Args:
+            gasto (Gasto): Gasto agregado al viaje.
+
+        Raises:
+            ValueError: Si el medio de pago del gasto no es reconocido.
+        """
+        self._acumular(gasto, 1)
+
+    def quitar(self, gasto: Gasto):
+        """
+        Resta un gasto de los agregados; la fecha desaparece al quedar sin gastos.
+
+        Args:
+            gasto (Gasto): Gasto eliminado del viaje.
+        """
+        self._acumular(gasto, -1)
+
+    def _acumular(self, gasto: Gasto, signo: int):
+        """Suma (signo 1) o resta (signo -1) los centavos en COP del gasto en cada agregado."""
+        columna = columna_medio(gasto.get_medio_pago())
+        valor = gasto.get_centavos_cop()
+        if signo < 0:
+            valor = -valor
+        fecha = gasto.get_fecha()
+        tipo = gasto.get_tipo_gasto().name
+        medio = gasto.get_medio_pago().name
+        celda = (fecha, tipo, medio)
+
+        self.tabla[celda] = self.tabla.get(celda, 0) + valor
+        self._sumar_derivados(fecha, tipo, medio, columna, valor)
+
+        cantidad = self._cantidad_por_celda.get(celda, 0) + signo
+        if cantidad:
+            self._cantidad_por_celda[celda] = cantidad
+        else:
+            del self._cantidad_por_celda[celda]
+            del self.tabla[celda]
+
+        cantidad = self._cantidad_por_fecha.get(fecha, 0) + signo
+        if cantidad:
+            self._cantidad_por_fecha[fecha] = cantidad
+        else:
+            del self._cantidad_por_fecha[fecha]
+            del self.por_fecha[fecha]
+            del self._ordinales[bisect_left(self._ordinales, fecha.toordinal())]
+
+    def _sumar_derivados(self, fecha, tipo: str, medio: str, columna: str, valor):
+        """Suma un valor a los agregados por fecha, por tipo y por medio de pago."""
+        dia = self.por_fecha.get(fecha)
+        if dia is None:
+            dia = self.por_fecha[fecha] = {'efectivo': 0, 'tarjetas': 0, 'total': 0}
+            insort(self._ordinales, fecha.toordinal())
+        dia[columna] += valor
+        dia['total'] += valor
+
+        por_tipo = self.por_tipo[tipo]
+        por_tipo[columna] += valor
+        por_tipo['total'] += valor
+
+        self.por_medio[medio] += valor
+
+    def total_fecha(self, fecha) -> int:
+        """
+        Retorna el total en centavos de COP gastado en una fecha.
+
+        Args:
+            fecha (date): Fecha a consultar.
+
+        Returns:
+            int: Total de la fecha, o 0 si no hay gastos.
+        """
+        dia = self.por_fecha.get(fecha)
+        return dia['total'] if dia is not None else 0
+
+    def fechas_en_rango(self, desde: date = None, hasta: date = None) -> list:
+        """
+        Retorna en orden cronológico las fechas con gastos dentro de [desde, hasta].
+
+        Args:
+            desde (date | None): Primera fecha incluida; sin límite si es None.
+            hasta (date | None): Última fecha incluida; sin límite si es None.
+
+        Returns:
+            list[date]: Fechas con gastos en el rango.
+        """
+        inicio = 0 if desde is None else bisect_left(self._ordinales, desde.toordinal())
+        fin = (len(self._ordinales) if hasta is None
+               else bisect_right(self._ordinales, hasta.toordinal()))
+        return [date.fromordinal(ordinal) for ordinal in self._ordinales[inicio:fin]]
+
+    def fila_diaria(self, fecha: date):
+        """
+        Retorna una copia de los totales de una fecha.
+
+        Returns:
+            dict | None: {'efectivo', 'tarjetas', 'total'}, o None si la fecha no tiene gastos.
+        """
+        dia = self.por_fecha.get(fecha)
+        return dict(dia) if dia is not None else None
+
+    def fila_fecha_tipo(self, fecha: date):
+        """
+        Retorna el desglose por tipo de gasto de una fecha, tomado de la tabla cruzada.
+
+        Returns:
+            dict | None: Nombre del tipo -> {'efectivo', 'tarjetas', 'total'}, solo con los
+                         tipos que tienen gastos, o None si la fecha no tiene gastos.
+        """
+        if fecha not in self.por_fecha:
+            return None
+        tipos = {}
+        for tipo in NOMBRES_TIPO:
+            for medio in NOMBRES_MEDIO:
+                valor = self.tabla.get((fecha, tipo, medio))
+                if valor is None:
+                    continue
+                datos = tipos.get(tipo)
+                if datos is None:
+                    datos = tipos[tipo] = {'efectivo': 0, 'tarjetas': 0, 'total': 0}
+                datos[COLUMNA_MEDIO[medio]] += valor
+                datos['total'] += valor
+        return tipos
+
+    def reporte_diario(self) -> dict:
+        """
+        Retorna una copia del agregado por fecha.
+
+        Returns:
+            dict: Fecha -> {'efectivo', 'tarjetas', 'total'}.
+        """
+        return {fecha: dict(datos) for fecha, datos in self.por_fecha.items()}
+
+    def reporte_por_tipo(self) -> dict:
+        """
+        Retorna una copia del agregado por tipo de gasto.
+
+        Returns:
+            dict: Nombre del tipo -> {'efectivo', 'tarjetas', 'total'}.
+        """
+        return {tipo: dict(datos) for tipo, datos in self.por_tipo.items()}
+
+    def reporte_por_medio(self) -> dict:
+        """
+        Retorna una copia del agregado por medio de pago.
+
+        Returns:
+            dict: Nombre del medio de pago -> total en centavos de COP.
+        """
+        return dict(self.por_medio)
+
+    def reporte_fecha_tipo(self) -> dict:
+        """
+        Retorna el desglose por fecha y tipo de gasto derivado de la tabla cruzada.
+
+        Returns:
+            dict: Fecha -> nombre del tipo -> {'efectivo', 'tarjetas', 'total'}; solo incluye
+                  las combinaciones con gastos.
+        """
+        reporte = {}
+        for (fecha, tipo, medio), valor in self.tabla.items():
+            tipos = reporte.setdefault(fecha, {})
+            datos = tipos.get(tipo)
+            if datos is None:
+                datos = tipos[tipo] = {'efectivo': 0, 'tarjetas': 0, 'total': 0}
+            datos[COLUMNA_MEDIO[medio]] += valor
+            datos['total'] += valor
+        return reporte
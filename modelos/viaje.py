@@ -1,13 +1,58 @@
 """
 Módulo que define la clase Viaje para gestionar información relacionada con gastos y presupuesto
 durante un viaje. Incluye funcionalidades para calcular diferencias presupuestarias.
+
+El viaje mantiene agregados incrementales (ResumenGastos) con los totales en COP por fecha y
+por tipo, de modo que el gasto diario y los reportes se consultan sin recorrer los gastos. El
+presupuesto y los totales se guardan en centavos (ver dinero) y se entregan en unidades.
+
+Otros componentes (por ejemplo, el diario de persistencia) pueden suscribirse a los cambios del
+viaje con `agregar_observador`; cada observador es un invocable que recibe el nombre del evento,
+el viaje y los datos del evento.
+
+Modelo de concurrencia: cada viaje se protege con un lock reentrante tomado de un conjunto fijo
+de `CANTIDAD_BLOQUEOS` locks compartidos (lock striping), para no crear un lock por viaje
+cuando hay cientos de miles. Todas las operaciones que modifican el viaje (agregar, eliminar o
+reemplazar gastos y finalizarlo) verifican el estado, actualizan los agregados, modifican el
+almacén y notifican a los observadores dentro de ese lock, por lo que:
+
+- ningún gasto se agrega después de que `finalizar_viaje` retorna;
+- los agregados siempre coinciden con los gastos almacenados;
+- los observadores reciben los eventos de un viaje de uno en uno y en orden.
+
+Leer un solo valor (por ejemplo, `calcular_gasto_diario`) no requiere el lock. Quien necesite
+una vista consistente de varios agregados a la vez debe tomar `viaje.bloqueo`, como hace
+ControlReporte.
+
+Como los observadores corren con el lock tomado, y ese lock lo comparten otros viajes, deben
+ser rápidos (sin E/S de consola ni esperas a otros hilos) y no deben modificar otro viaje:
+dos viajes pueden tomar sus locks en órdenes opuestos y bloquearse mutuamente. Mientras se
+entrega un evento, `en_notificacion()` retorna True; ControlViaje la usa para rechazar esas
+operaciones.
 """
+import threading
+from itertools import count
+
 from enums.tipo_viaje import TipoViaje
 
 from modelos.destino import Destino
 
+from modelos.dinero import a_centavos, a_unidades
+
 from modelos.gasto import Gasto
 
+from modelos.resumen_gastos import ResumenGastos
+
+CANTIDAD_BLOQUEOS = 256
+_BLOQUEOS = tuple(threading.RLock() for _ in range(CANTIDAD_BLOQUEOS))
+_siguiente_bloqueo = count()
+_notificacion = threading.local()
+
+
+def en_notificacion() -> bool:
+    """Indica si el hilo actual está entregando un evento de un viaje a sus observadores."""
+    return getattr(_notificacion, 'viaje', None) is not None
+
 class Viaje:
     """
     Representa un viaje realizado por un usuario, incluyendo información sobre gastos 
@@ -15,20 +60,83 @@ class Viaje:
 
     Esta clase permite registrar y analizar los gastos hechos durante el viaje,
     calculando diferencias respecto al presupuesto planeado.
+
+    El identificador `viaje_id` lo asigna el registro de viajes (ControlViaje) o el
+    repositorio donde se guarda el viaje; es None para un viaje suelto.
     """
 
+    __slots__ = ('fecha_inicio', 'fecha_fin', 'presupuesto_centavos', 'destino', 'tipo_viaje',
+                 'estado_viaje', 'gastos', 'resumen', 'viaje_id', 'cliente', 'bloqueo',
+                 '_observadores')
+
     def __init__(self, fecha_inicio, fecha_fin, presupuesto_diario: float, destino: Destino,
-                 tipo_viaje: TipoViaje):
+                 tipo_viaje: TipoViaje, almacen=None, cliente=None):
         """
         Inicializa un objeto Viaje con fechas, presupuesto, destino y tipo de viaje.
+
+        Por defecto los gastos se guardan en una lista. Puede indicarse otro almacén que se
+        comporte como una lista de Gasto (por ejemplo, AlmacenGastosColumnar); si ya contiene
+        gastos, los agregados se calculan a partir de él.
+
+        Args:
+            cliente (Cliente | None): Cliente que realiza el viaje.
         """
         self.fecha_inicio = fecha_inicio
         self.fecha_fin = fecha_fin
-        self.presupuesto_diario = presupuesto_diario
+        self.presupuesto_centavos = a_centavos(presupuesto_diario)
         self.destino = destino
         self.tipo_viaje = tipo_viaje
         self.estado_viaje = True
-        self.gastos = []
+        self.gastos = almacen if almacen is not None else []
+        self.resumen = ResumenGastos.desde_gastos(self.gastos)
+        self.viaje_id = None
+        self.cliente = cliente
+        self.bloqueo = _BLOQUEOS[next(_siguiente_bloqueo) % CANTIDAD_BLOQUEOS]
+        self._observadores = ()
+
+    @property
+    def presupuesto_diario(self) -> float:
+        """Presupuesto diario en COP; se guarda en centavos."""
+        return a_unidades(self.presupuesto_centavos)
+
+    @presupuesto_diario.setter
+    def presupuesto_diario(self, valor: float):
+        self.presupuesto_centavos = a_centavos(valor)
+
+    def agregar_observador(self, observador):
+        """
+        Suscribe un invocable a los cambios del viaje.
+
+        El observador se llama como `observador(evento, viaje, *datos)` después de cada cambio,
+        con uno de estos eventos: 'gasto_agregado' (gasto), 'gastos_agregados' (lista de
+        gastos), 'gasto_eliminado' (gasto), 'gasto_reemplazado' (anterior, nuevo) y
+        'viaje_finalizado' (sin datos).
+
+        Args:
+            observador (callable): Función u objeto invocable a notificar.
+        """
+        with self.bloqueo:
+            self._observadores = self._observadores + (observador,)
+
+    def quitar_observador(self, observador):
+        """
+        Cancela la suscripción de un observador.
+
+        Args:
+            observador (callable): Observador previamente agregado.
+        """
+        with self.bloqueo:
+            self._observadores = tuple(o for o in self._observadores if o is not observador)
+
+    def _notificar(self, evento: str, *datos):
+        """Informa un cambio a todos los observadores suscritos."""
+        anterior = getattr(_notificacion, 'viaje', None)
+        _notificacion.viaje = self
+        try:
+            for observador in self._observadores:
+                observador(evento, self, *datos)
+        finally:
+            _notificacion.viaje = anterior
 
     def agregar_gasto(self, gasto: Gasto):
         """
@@ -39,18 +147,93 @@ class Viaje:
 
         Raises:
             RuntimeError: Si el viaje ya ha finalizado y no se pueden registrar más gastos.
+            ValueError: Si el medio de pago del gasto no es reconocido.
         """
-        if self.estado_viaje:
+        with self.bloqueo:
+            if not self.estado_viaje:
+                raise RuntimeError("El viaje ha finalizado, no se pueden registrar más gastos.")
+            self.resumen.agregar(gasto)
             self.gastos.append(gasto)
-        else:
-            raise RuntimeError("El viaje ha finalizado, no se pueden registrar más gastos.")
+            if self._observadores:
+                self._notificar('gasto_agregado', gasto)
 
+    def agregar_gastos(self, gastos: list):
+        """
+        Agrega un lote de gastos al viaje si el viaje está activo.
+
+        Si algún gasto del lote no es válido, ninguno se agrega.
+
+        Args:
+            gastos (list[Gasto]): Gastos a agregar.
+
+        Raises:
+            RuntimeError: Si el viaje ya ha finalizado y no se pueden registrar más gastos.
+            ValueError: Si el medio de pago de algún gasto no es reconocido.
+        """
+        with self.bloqueo:
+            if not self.estado_viaje:
+                raise RuntimeError("El viaje ha finalizado, no se pueden registrar más gastos.")
+
+            agregados = 0
+            try:
+                for gasto in gastos:
+                    self.resumen.agregar(gasto)
+                    agregados += 1
+            except ValueError:
+                for gasto in gastos[:agregados]:
+                    self.resumen.quitar(gasto)
+                raise
+            self.gastos.extend(gastos)
+            if self._observadores:
+                self._notificar('gastos_agregados', gastos)
+
+    def eliminar_gasto(self, gasto: Gasto):
+        """
+        Elimina un gasto del viaje y lo descuenta de los agregados.
+
+        Args:
+            gasto (Gasto): Gasto previamente agregado al viaje.
+
+        Raises:
+            ValueError: Si el gasto no pertenece al viaje.
+        """
+        with self.bloqueo:
+            self.gastos.remove(gasto)
+            self.resumen.quitar(gasto)
+            self._notificar('gasto_eliminado', gasto)
+
+    def reemplazar_gasto(self, anterior: Gasto, nuevo: Gasto):
+        """
+        Sustituye un gasto por su versión corregida, conservando su posición.
+
+        Los gastos no deben modificarse directamente una vez agregados, ya que los agregados
+        no se enterarían del cambio; para editarlos debe usarse este método.
+
+        Args:
+            anterior (Gasto): Gasto previamente agregado al viaje.
+            nuevo (Gasto): Gasto que lo reemplaza.
+
+        Raises:
+            ValueError: Si el gasto anterior no pertenece al viaje.
+        """
+        with self.bloqueo:
+            posicion = self.gastos.index(anterior)
+            self.resumen.agregar(nuevo)
+            self.resumen.quitar(anterior)
+            self.gastos[posicion] = nuevo
+            self._notificar('gasto_reemplazado', anterior, nuevo)
 
     def finalizar_viaje(self):
         """
         Marca el viaje como finalizado, impidiendo el registro de nuevos gastos.
+
+        Finalizar un viaje ya finalizado no tiene efecto ni notifica de nuevo.
         """
-        self.estado_viaje = False
+        with self.bloqueo:
+            if not self.estado_viaje:
+                return
+            self.estado_viaje = False
+            self._notificar('viaje_finalizado')
 
     def calcular_gasto_diario(self, fecha):
         """
@@ -62,7 +245,7 @@ class Viaje:
         Returns:
             float: Suma de los valores en COP de los gastos registrados en esa fecha.
         """
-        return sum(g.get_valor_moneda_local_cop() for g in self.gastos if g.get_fecha()== fecha)
+        return a_unidades(self.resumen.total_fecha(fecha))
 
     def get_gastos(self):
         """
@@ -72,3 +255,12 @@ class Viaje:
             list[Gasto]: Lista de todos los gastos asociados al viaje.
         """
         return self.gastos
+
+    def get_resumen(self):
+        """
+        Retorna los agregados de gastos que el viaje mantiene actualizados.
+
+        Returns:
+            ResumenGastos: Totales por fecha y por tipo de gasto.
+        """
+        return self.resumen
@@ -0,0 +1,517 @@
+"""
+Módulo que implementa un diario de solo anexado con instantáneas periódicas para un viaje.
+
+El diario se suscribe como observador del viaje y registra su creación, cada gasto agregado,
+eliminado o reemplazado, y su finalización. El camino crítico (registrar un gasto) solo agrega
+el evento a una cola en memoria, sin tomar ningún lock; un hilo de fondo escribe los eventos en
+lote y llama a `fsync` una vez por lote (group commit), ya sea al acumular `eventos_por_lote`
+eventos o cada `intervalo_sincronizacion` segundos.
+
+Cada `eventos_por_instantanea` eventos se escribe una instantánea binaria compacta del viaje
+(los gastos en formato columnar) y se empieza un nuevo segmento del diario; los segmentos
+anteriores se borran una vez que la instantánea es durable. El hilo de escritura construye la
+instantánea a partir de una copia columnar propia, que actualiza con cada evento que escribe,
+de modo que el viaje nunca se copia en el camino crítico. Para reanudar un viaje basta con
+cargar la instantánea y reproducir los segmentos posteriores.
+
+Estructura del directorio:
+    instantanea.bin         Cabecera JSON en la primera línea, seguida de los arreglos columnares.
+    diario.00000000.log     Registros binarios: un byte con el tipo de evento seguido de sus datos.
+
+Los gastos se escriben como registros de ancho fijo empaquetados con `struct`, que cuestan
+mucho menos de codificar que un JSON por evento; así el hilo de escritura apenas compite por
+el GIL con el hilo que registra los gastos. Solo la creación del viaje, que ocurre una vez,
+se guarda como JSON precedido de su longitud.
+"""
+
+import json
+import os
+import struct
+import threading
+from collections import deque
+from datetime import date
+
+from enums.tipo_viaje import TipoViaje
+
+from modelos.almacen_columnar import AlmacenGastosColumnar, fila_gasto, gasto_desde_fila
+
+from modelos.destino import Destino
+
+from modelos.gasto import Gasto
+
+from modelos.viaje import Viaje
+
+VERSION = 2
+NOMBRE_INSTANTANEA = "instantanea.bin"
+PREFIJO_SEGMENTO = "diario."
+SUFIJO_SEGMENTO = ".log"
+
+# Un gasto en el orden de `fila_gasto`: ordinal, código de medio, código de tipo, centavos y
+# centavos en COP.
+REGISTRO_GASTO = struct.Struct("<ibbqq")
+LONGITUD = struct.Struct("<I")
+AGREGADO, ELIMINADO, REEMPLAZADO, FINALIZADO, CREADO = b"a", b"e", b"r", b"f", b"c"
+# Bytes de datos que siguen al tipo de cada registro de ancho fijo.
+TAMANOS_REGISTRO = {AGREGADO: REGISTRO_GASTO.size, ELIMINADO: REGISTRO_GASTO.size,
+                    REEMPLAZADO: 2 * REGISTRO_GASTO.size, FINALIZADO: 0}
+
+
+class DiarioCorruptoError(RuntimeError):
+    """Se lanza cuando un registro completo del diario no puede leerse o aplicarse."""
+
+
+def datos_viaje(viaje: Viaje) -> dict:
+    """Retorna los datos del viaje, sin sus gastos, en un diccionario serializable."""
+    destino = viaje.destino
+    return {
+        'fecha_inicio': viaje.fecha_inicio.isoformat(),
+        'fecha_fin': viaje.fecha_fin.isoformat(),
+        'presupuesto_centavos': viaje.presupuesto_centavos,
+        'destino': [destino.get_ciudad(), destino.get_departamento(), destino.get_pais(),
+                    destino.get_moneda_local()],
+        'tipo_viaje': viaje.tipo_viaje.value,
+        'estado_viaje': viaje.estado_viaje,
+    }
+
+
+def viaje_desde_datos(datos: dict, almacen=None) -> Viaje:
+    """Reconstruye un viaje a partir de `datos_viaje` y, opcionalmente, de sus gastos."""
+    viaje = Viaje(date.fromisoformat(datos['fecha_inicio']),
+                  date.fromisoformat(datos['fecha_fin']), 0,
+                  Destino.obtener(*datos['destino']),
+                  TipoViaje(datos['tipo_viaje']), almacen=almacen)
+    viaje.presupuesto_centavos = datos['presupuesto_centavos']
+    viaje.estado_viaje = datos['estado_viaje']
+    return viaje
+
+
+class DiarioViaje:
+    """
+    Diario durable de los cambios de un viaje.
+
+    La cola de eventos es un `deque`, cuyo `append` es atómico; los contadores del camino
+    crítico no se protegen con un lock porque un viaje notifica sus eventos de uno en uno.
+
+    Atributos:
+        directorio (str): Carpeta donde se guardan la instantánea y los segmentos.
+        eventos_por_lote (int): Eventos pendientes que provocan una escritura inmediata.
+        intervalo_sincronizacion (float): Segundos máximos entre escrituras.
+        eventos_por_instantanea (int): Eventos entre dos instantáneas consecutivas.
+        viaje (Viaje | None): Viaje observado.
+    """
+
+    def __init__(self, directorio: str, eventos_por_lote: int = 1024,
+                 intervalo_sincronizacion: float = 0.05, eventos_por_instantanea: int = 100000):
+        """
+        Prepara el diario en el directorio indicado, creándolo si no existe.
+
+        Args:
+            directorio (str): Carpeta del diario.
+            eventos_por_lote (int): Eventos pendientes que provocan una escritura inmediata.
+            intervalo_sincronizacion (float): Segundos máximos entre escrituras.
+            eventos_por_instantanea (int): Eventos entre dos instantáneas consecutivas.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.eventos_por_lote = eventos_por_lote
+        self.intervalo_sincronizacion = intervalo_sincronizacion
+        self.eventos_por_instantanea = eventos_por_instantanea
+        self.viaje = None
+        self._pendientes = deque()
+        self._lock = threading.Lock()
+        self._hay_trabajo = threading.Condition(self._lock)
+        self._persistido = threading.Condition(self._lock)
+        self._encolados = 0
+        self._escritos = 0
+        self._eventos_desde_instantanea = 0
+        self._espejo = AlmacenGastosColumnar()
+        self._datos = None
+        self._segmento = 0
+        self._archivo = None
+        self._hilo = None
+        self._cerrado = False
+        self._error = None
+
+    def existe(self) -> bool:
+        """
+        Indica si el directorio ya contiene un diario.
+
+        Returns:
+            bool: True si hay una instantánea o algún segmento.
+        """
+        return bool(self._segmentos()) or os.path.exists(self._ruta(NOMBRE_INSTANTANEA))
+
+    def descartar(self):
+        """
+        Borra la instantánea y los segmentos de un diario que no está en uso.
+
+        Raises:
+            RuntimeError: Si el diario está suscrito a un viaje.
+        """
+        if self.viaje is not None and not self._cerrado:
+            raise RuntimeError("No se puede descartar un diario en uso.")
+        for numero in self._segmentos():
+            os.remove(self._ruta_segmento(numero))
+        if os.path.exists(self._ruta(NOMBRE_INSTANTANEA)):
+            os.remove(self._ruta(NOMBRE_INSTANTANEA))
+
+    def iniciar(self, viaje: Viaje):
+        """
+        Empieza un diario nuevo para un viaje recién creado.
+
+        Args:
+            viaje (Viaje): Viaje a registrar; si ya tiene gastos, también se registran.
+
+        Raises:
+            FileExistsError: Si el directorio ya contiene un diario.
+        """
+        if self.existe():
+            raise FileExistsError(f"Ya existe un diario en {self.directorio}.")
+        self._segmento = 0
+        self._pendientes.append(('viaje_creado', (datos_viaje(viaje),)))
+        if len(viaje.get_gastos()):
+            self._pendientes.append(('gastos_agregados', (list(viaje.get_gastos()),)))
+        self._encolados = len(self._pendientes)
+        self._adjuntar(viaje)
+
+    def recuperar(self, columnar: bool = True) -> Viaje:
+        """
+        Reconstruye el viaje a partir de la última instantánea y de los segmentos posteriores.
+
+        Un último registro incompleto, por una caída durante la escritura, se descarta y se
+        trunca. Un registro completo que no puede aplicarse indica un diario dañado: no se
+        borra nada y se lanza DiarioCorruptoError.
+        Al terminar, el diario queda suscrito al viaje recuperado y sigue registrando cambios.
+
+        Args:
+            columnar (bool): Si es True, los gastos se cargan en un AlmacenGastosColumnar;
+                             si es False, en una lista de Gasto.
+
+        Returns:
+            Viaje: Viaje recuperado.
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene un diario.
+            ValueError: Si la instantánea fue escrita con otra versión del formato.
+            DiarioCorruptoError: Si un registro completo es desconocido o no puede aplicarse.
+        """
+        viaje = None
+        desde = 0
+        ruta_instantanea = self._ruta(NOMBRE_INSTANTANEA)
+        if os.path.exists(ruta_instantanea):
+            with open(ruta_instantanea, "rb") as archivo:
+                cabecera = json.loads(archivo.readline())
+                if cabecera.get('version') != VERSION:
+                    raise ValueError(f"La instantánea de {self.directorio} tiene la versión "
+                                     f"{cabecera.get('version')}; se esperaba {VERSION}.")
+                almacen = AlmacenGastosColumnar()
+                for columna in almacen.columnas():
+                    columna.fromfile(archivo, cabecera['cantidad'])
+            viaje = viaje_desde_datos(cabecera['viaje'], almacen if columnar else list(almacen))
+            desde = cabecera['segmento']
+
+        segmentos = [numero for numero in self._segmentos() if numero >= desde]
+        for numero in segmentos:
+            viaje = self._reproducir_segmento(numero, viaje, columnar)
+        if viaje is None:
+            raise FileNotFoundError(f"No hay un diario en {self.directorio}.")
+
+        self._segmento = max(segmentos, default=desde)
+        gastos = viaje.get_gastos()
+        if isinstance(gastos, AlmacenGastosColumnar):
+            self._espejo = gastos.copiar()
+        else:
+            self._espejo = AlmacenGastosColumnar(gastos)
+        self._datos = datos_viaje(viaje)
+        self._adjuntar(viaje)
+        return viaje
+
+    def _reproducir_segmento(self, numero: int, viaje, columnar: bool):
+        """
+        Aplica al viaje los eventos de un segmento y trunca un posible registro incompleto.
+
+        Raises:
+            DiarioCorruptoError: Si un registro completo es desconocido o no puede aplicarse.
+        """
+        ruta = self._ruta_segmento(numero)
+        with open(ruta, "rb") as archivo:
+            contenido = archivo.read()
+        posicion = 0
+        while posicion < len(contenido):
+            registro = self._leer_registro(contenido, posicion)
+            if registro is None:
+                # Solo el último registro puede estar incompleto: se anexa y no se reescribe.
+                with open(ruta, "r+b") as archivo:
+                    archivo.truncate(posicion)
+                break
+            tipo, datos, siguiente = registro
+            try:
+                if viaje is None and tipo != CREADO:
+                    raise ValueError("el primer registro no crea el viaje")
+                viaje = self._aplicar(tipo, datos, viaje, columnar)
+            except (ValueError, LookupError, RuntimeError) as e:
+                raise DiarioCorruptoError(f"No se pudo aplicar el registro {tipo!r} en la "
+                                          f"posición {posicion} de {ruta}: {e}") from e
+            posicion = siguiente
+        return viaje
+
+    @staticmethod
+    def _leer_registro(contenido: bytes, posicion: int):
+        """
+        Separa el registro que empieza en `posicion` sin interpretar sus datos.
+
+        Returns:
+            tuple | None: (tipo, datos, posición del siguiente registro), o None si el registro
+                          termina después del final del contenido.
+
+        Raises:
+            DiarioCorruptoError: Si el tipo de registro es desconocido.
+        """
+        tipo = contenido[posicion:posicion + 1]
+        posicion += 1
+        if tipo == CREADO:
+            if posicion + LONGITUD.size > len(contenido):
+                return None
+            (longitud,) = LONGITUD.unpack_from(contenido, posicion)
+            posicion += LONGITUD.size
+        elif tipo in TAMANOS_REGISTRO:
+            longitud = TAMANOS_REGISTRO[tipo]
+        else:
+            raise DiarioCorruptoError(f"Registro desconocido en el diario: {tipo!r}")
+        if posicion + longitud > len(contenido):
+            return None
+        return tipo, contenido[posicion:posicion + longitud], posicion + longitud
+
+    @staticmethod
+    def _aplicar(tipo: bytes, datos: bytes, viaje, columnar: bool):
+        """
+        Aplica al viaje un registro completo separado por `_leer_registro`.
+
+        Returns:
+            Viaje: Viaje resultante.
+
+        Raises:
+            ValueError: Si los datos del registro no son válidos.
+            LookupError: Si el registro hace referencia a un gasto inexistente.
+            RuntimeError: Si el viaje no admite el cambio (por ejemplo, ya finalizó).
+        """
+        if tipo == CREADO:
+            return viaje_desde_datos(json.loads(datos),
+                                     AlmacenGastosColumnar() if columnar else None)
+        if tipo == AGREGADO:
+            viaje.agregar_gasto(gasto_desde_fila(REGISTRO_GASTO.unpack(datos)))
+        elif tipo == ELIMINADO:
+            fila = REGISTRO_GASTO.unpack(datos)
+            viaje.eliminar_gasto(DiarioViaje._buscar_gasto(viaje, fila))
+        elif tipo == REEMPLAZADO:
+            anterior = REGISTRO_GASTO.unpack_from(datos)
+            nueva = REGISTRO_GASTO.unpack_from(datos, REGISTRO_GASTO.size)
+            viaje.reemplazar_gasto(DiarioViaje._buscar_gasto(viaje, anterior),
+                                   gasto_desde_fila(nueva))
+        else:
+            viaje.finalizar_viaje()
+        return viaje
+
+    @staticmethod
+    def _buscar_gasto(viaje: Viaje, fila: tuple) -> Gasto:
+        """Retorna el gasto del viaje cuyos datos coinciden con la fila."""
+        for gasto in viaje.get_gastos():
+            if fila_gasto(gasto) == fila:
+                return gasto
+        raise LookupError("El diario hace referencia a un gasto inexistente.")
+
+    def _adjuntar(self, viaje: Viaje):
+        """Suscribe el diario al viaje y arranca el hilo de escritura."""
+        self.viaje = viaje
+        self._archivo = open(self._ruta_segmento(self._segmento), "ab")
+        self._hilo = threading.Thread(target=self._escribir_en_segundo_plano,
+                                      name="diario-viaje", daemon=True)
+        self._hilo.start()
+        viaje.agregar_observador(self)
+
+    def __call__(self, evento: str, viaje: Viaje, *datos):
+        """
+        Recibe un evento del viaje y lo encola; es el único trabajo en el camino crítico.
+
+        Raises:
+            RuntimeError: Si el hilo de escritura falló o el diario está cerrado.
+        """
+        if self._error is not None or self._cerrado:
+            raise RuntimeError("El diario del viaje no está disponible.") from self._error
+        # El caso más frecuente se encola como el propio gasto, sin crear una tupla.
+        self._pendientes.append(datos[0] if evento == 'gasto_agregado' else (evento, datos))
+        self._encolados += 1
+        if len(self._pendientes) >= self.eventos_por_lote:
+            with self._lock:
+                self._hay_trabajo.notify()
+
+    def _escribir_en_segundo_plano(self):
+        """Bucle del hilo de escritura: vacía los eventos pendientes en lotes con un fsync."""
+        while True:
+            with self._lock:
+                if not self._pendientes and not self._cerrado:
+                    self._hay_trabajo.wait(self.intervalo_sincronizacion)
+                cerrado = self._cerrado
+            pendientes = [self._pendientes.popleft() for _ in range(len(self._pendientes))]
+            if cerrado and not pendientes:
+                return
+            try:
+                if pendientes:
+                    self._escribir(pendientes)
+            # Cualquier error detiene el hilo: se publica para que sincronizar() no espere para
+            # siempre (por ejemplo, struct.error con un valor que no cabe en el registro).
+            except Exception as e:
+                with self._lock:
+                    self._error = e
+                    self._persistido.notify_all()
+                return
+            with self._lock:
+                self._escritos += len(pendientes)
+                self._persistido.notify_all()
+
+    def _escribir(self, pendientes: list):
+        """Codifica y escribe un lote de eventos, con una instantánea cuando corresponde."""
+        registros = []
+        for pendiente in pendientes:
+            if type(pendiente) is Gasto:
+                fila = fila_gasto(pendiente)
+                registros.append(AGREGADO + REGISTRO_GASTO.pack(*fila))
+                self._espejo.agregar_fila(fila)
+                self._eventos_desde_instantanea += 1
+            else:
+                self._codificar(*pendiente, registros)
+            if self._eventos_desde_instantanea >= self.eventos_por_instantanea:
+                self._volcar(registros)
+                registros = []
+                self._escribir_instantanea()
+        self._volcar(registros)
+
+    def _codificar(self, evento: str, datos: tuple, registros: list):
+        """
+        Agrega a `registros` los registros de un evento del viaje y lo aplica a la copia
+        columnar que el hilo de escritura mantiene para las instantáneas.
+        """
+        if evento == 'gastos_agregados':
+            for gasto in datos[0]:
+                fila = fila_gasto(gasto)
+                registros.append(AGREGADO + REGISTRO_GASTO.pack(*fila))
+                self._espejo.agregar_fila(fila)
+            self._eventos_desde_instantanea += len(datos[0])
+            return
+        if evento == 'gasto_eliminado':
+            fila = fila_gasto(datos[0])
+            registros.append(ELIMINADO + REGISTRO_GASTO.pack(*fila))
+            del self._espejo[self._espejo.buscar_fila(fila)]
+        elif evento == 'gasto_reemplazado':
+            anterior, nueva = fila_gasto(datos[0]), fila_gasto(datos[1])
+            registros.append(REEMPLAZADO + REGISTRO_GASTO.pack(*anterior)
+                             + REGISTRO_GASTO.pack(*nueva))
+            self._espejo[self._espejo.buscar_fila(anterior)] = datos[1]
+        elif evento == 'viaje_finalizado':
+            registros.append(FINALIZADO)
+            self._datos = dict(self._datos, estado_viaje=False)
+        elif evento == 'viaje_creado':
+            texto = json.dumps(datos[0]).encode()
+            registros.append(CREADO + LONGITUD.pack(len(texto)) + texto)
+            self._datos = datos[0]
+            self._espejo = AlmacenGastosColumnar()
+        else:
+            return
+        self._eventos_desde_instantanea += 1
+
+    def _volcar(self, registros: list):
+        """Escribe los registros en el segmento actual y los hace durables con un único fsync."""
+        if not registros:
+            return
+        self._archivo.write(b"".join(registros))
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+
+    def _escribir_instantanea(self):
+        """Escribe la instantánea atómicamente, empieza un segmento nuevo y borra los viejos."""
+        gastos = self._espejo
+        nuevo = self._segmento + 1
+        cabecera = {'version': VERSION, 'segmento': nuevo, 'viaje': self._datos,
+                    'cantidad': len(gastos)}
+        temporal = self._ruta(NOMBRE_INSTANTANEA + ".tmp")
+        with open(temporal, "wb") as archivo:
+            archivo.write(json.dumps(cabecera).encode() + b"\n")
+            for columna in gastos.columnas():
+                columna.tofile(archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self._ruta(NOMBRE_INSTANTANEA))
+        self._sincronizar_directorio()
+        self._eventos_desde_instantanea = 0
+
+        self._archivo.close()
+        self._segmento = nuevo
+        self._archivo = open(self._ruta_segmento(nuevo), "ab")
+        for numero in self._segmentos():
+            if numero < nuevo:
+                os.remove(self._ruta_segmento(numero))
+
+    def _sincronizar_directorio(self):
+        """Hace durable el renombrado de la instantánea (no disponible en todos los sistemas)."""
+        try:
+            descriptor = os.open(self.directorio, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    def sincronizar(self, timeout: float = None):
+        """
+        Espera a que todos los eventos encolados hasta ahora estén escritos en disco.
+
+        Args:
+            timeout (float | None): Segundos máximos de espera.
+
+        Raises:
+            RuntimeError: Si el hilo de escritura falló.
+        """
+        with self._lock:
+            objetivo = self._encolados
+            self._hay_trabajo.notify()
+            self._persistido.wait_for(
+                lambda: self._escritos >= objetivo or self._error is not None, timeout
+            )
+            if self._error is not None:
+                raise RuntimeError("No se pudo escribir el diario del viaje.") from self._error
+
+    def cerrar(self):
+        """Escribe los eventos pendientes, detiene el hilo y deja de observar el viaje."""
+        if self.viaje is None or self._cerrado:
+            return
+        self.viaje.quitar_observador(self)
+        with self._lock:
+            self._cerrado = True
+            self._hay_trabajo.notify()
+        self._hilo.join()
+        self._archivo.close()
+
+    def _segmentos(self) -> list:
+        """Retorna los números de segmento presentes en el directorio, en orden."""
+        numeros = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith(PREFIJO_SEGMENTO) and nombre.endswith(SUFIJO_SEGMENTO):
+                numeros.append(int(nombre[len(PREFIJO_SEGMENTO):-len(SUFIJO_SEGMENTO)]))
+        return sorted(numeros)
+
+    def _ruta_segmento(self, numero: int) -> str:
+        """Retorna la ruta del segmento con el número indicado."""
+        return self._ruta(f"{PREFIJO_SEGMENTO}{numero:08d}{SUFIJO_SEGMENTO}")
+
+    def _ruta(self, nombre: str) -> str:
+        """Retorna la ruta de un archivo dentro del directorio del diario."""
+        return os.path.join(self.directorio, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
@@ -0,0 +1,543 @@
+"""
+Módulo que implementa un repositorio opcional en SQLite para clientes, destinos, viajes y gastos.
+
+Los gastos de un viaje guardado se manejan con GastosSQLite, un almacén que puede pasarse a
+`Viaje(almacen=...)` en lugar de la lista de gastos. Al cargar un viaje, sus agregados se
+calculan con una sola consulta `GROUP BY` sobre la tabla de gastos, sin crear un objeto Gasto
+por fila, y a partir de ahí el gasto diario y los reportes se consultan en memoria. Así es
+posible reportar viajes con más gastos de los que caben en RAM.
+
+Las inserciones se acumulan y se escriben con `executemany` (una sentencia preparada) en
+transacciones de `tamano_lote` gastos. Los índices (viaje_id, fecha) y (viaje_id, tipo_gasto)
+sirven a las consultas por día y por tipo que no necesitan cargar el viaje.
+
+Los montos se guardan en columnas INTEGER de centavos (ver dinero), de modo que los `SUM` de
+SQLite son sumas enteras exactas; las consultas que entregan totales los convierten a unidades.
+"""
+
+import sqlite3
+import threading
+from datetime import date
+
+from enums.medio_pago import MedioPago
+
+from enums.tipo_gasto import TipoGasto
+
+from enums.tipo_viaje import TipoViaje
+
+from modelos.cliente import Cliente
+
+from modelos.destino import Destino
+
+from modelos.dinero import a_unidades, reporte_a_unidades
+
+from modelos.gasto import Gasto
+
+from modelos.viaje import Viaje
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cliente (
+    cedula TEXT PRIMARY KEY,
+    nombre_completo TEXT NOT NULL,
+    telefono TEXT,
+    correo TEXT
+);
+CREATE TABLE IF NOT EXISTS destino (
+    id INTEGER PRIMARY KEY,
+    ciudad TEXT NOT NULL,
+    departamento TEXT NOT NULL,
+    pais TEXT NOT NULL,
+    moneda_local TEXT NOT NULL,
+    UNIQUE (ciudad, departamento, pais, moneda_local)
+);
+CREATE TABLE IF NOT EXISTS viaje (
+    id INTEGER PRIMARY KEY,
+    cliente_cedula TEXT REFERENCES cliente (cedula),
+    destino_id INTEGER NOT NULL REFERENCES destino (id),
+    fecha_inicio TEXT NOT NULL,
+    fecha_fin TEXT NOT NULL,
+    presupuesto_centavos INTEGER NOT NULL,
+    tipo_viaje TEXT NOT NULL,
+    estado_viaje INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS gasto (
+    id INTEGER PRIMARY KEY,
+    viaje_id INTEGER NOT NULL REFERENCES viaje (id),
+    fecha INTEGER NOT NULL,
+    centavos INTEGER NOT NULL,
+    medio_pago TEXT NOT NULL,
+    tipo_gasto TEXT NOT NULL,
+    centavos_cop INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gasto_viaje_fecha ON gasto (viaje_id, fecha);
+CREATE INDEX IF NOT EXISTS gasto_viaje_tipo ON gasto (viaje_id, tipo_gasto);
+"""
+
+COLUMNAS_GASTO = "fecha, centavos, medio_pago, tipo_gasto, centavos_cop"
+INSERTAR_GASTO = f"INSERT INTO gasto (viaje_id, {COLUMNAS_GASTO}) VALUES (?, ?, ?, ?, ?, ?)"
+# Suma por columna de reporte; debe coincidir con COLUMNA_MEDIO de resumen_gastos.
+SUMAS_POR_MEDIO = (
+    "SUM(CASE WHEN medio_pago = 'EFECTIVO' THEN centavos_cop ELSE 0 END), "
+    "SUM(CASE WHEN medio_pago <> 'EFECTIVO' THEN centavos_cop ELSE 0 END), "
+    "SUM(centavos_cop)"
+)
+
+
+def fila_gasto(viaje_id: int, gasto: Gasto) -> tuple:
+    """Retorna los parámetros de INSERTAR_GASTO para un gasto; la fecha se guarda como ordinal."""
+    return (viaje_id, gasto.get_fecha().toordinal(), gasto.get_centavos(),
+            gasto.get_medio_pago().name, gasto.get_tipo_gasto().name,
+            gasto.get_centavos_cop())
+
+
+def gasto_desde_fila(fila: tuple) -> Gasto:
+    """Construye un Gasto a partir de las columnas COLUMNAS_GASTO."""
+    fecha, centavos, medio_pago, tipo_gasto, centavos_cop = fila
+    return Gasto.desde_centavos(date.fromordinal(fecha), centavos, MedioPago[medio_pago],
+                                TipoGasto[tipo_gasto], centavos_cop)
+
+
+class RepositorioSQLite:
+    """
+    Repositorio de clientes, destinos, viajes y gastos en una base de datos SQLite.
+
+    Atributos:
+        ruta (str): Ruta del archivo SQLite, o ":memory:" para una base temporal.
+        tamano_lote (int): Gastos por transacción al insertar.
+    """
+
+    def __init__(self, ruta: str = ":memory:", tamano_lote: int = 10000):
+        """
+        Abre o crea la base de datos y su esquema.
+
+        Args:
+            ruta (str): Ruta del archivo SQLite.
+            tamano_lote (int): Gastos por transacción al insertar.
+
+        Raises:
+            ValueError: Si el tamaño de lote no es positivo.
+        """
+        if tamano_lote <= 0:
+            raise ValueError("El tamaño de lote debe ser positivo.")
+        self.ruta = ruta
+        self.tamano_lote = tamano_lote
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        if ruta != ":memory:":
+            self._conexion.execute("PRAGMA journal_mode = WAL")
+            self._conexion.execute("PRAGMA synchronous = NORMAL")
+        self._conexion.executescript(ESQUEMA)
+        self._conexion.commit()
+
+    def guardar_cliente(self, cliente: Cliente):
+        """
+        Guarda un cliente, reemplazando sus datos si la cédula ya existe.
+
+        Args:
+            cliente (Cliente): Cliente a guardar.
+        """
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO cliente (cedula, nombre_completo, telefono, correo) "
+                "VALUES (?, ?, ?, ?)",
+                (cliente.get_cedula(), cliente.get_nombre(), cliente.get_telefono(),
+                 cliente.get_correo())
+            )
+
+    def obtener_cliente(self, cedula: str):
+        """
+        Busca un cliente por su cédula.
+
+        Args:
+            cedula (str): Cédula del cliente.
+
+        Returns:
+            Cliente | None: El cliente, o None si no está guardado.
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT nombre_completo, cedula, telefono, correo FROM cliente WHERE cedula = ?",
+                (cedula,)
+            ).fetchone()
+        return Cliente(*fila) if fila is not None else None
+
+    def guardar_destino(self, destino: Destino) -> int:
+        """
+        Guarda un destino si aún no existe.
+
+        Args:
+            destino (Destino): Destino a guardar.
+
+        Returns:
+            int: Identificador del destino en la base de datos.
+        """
+        datos = (destino.get_ciudad(), destino.get_departamento(), destino.get_pais(),
+                 destino.get_moneda_local())
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                "INSERT OR IGNORE INTO destino (ciudad, departamento, pais, moneda_local) "
+                "VALUES (?, ?, ?, ?)", datos
+            )
+            return self._conexion.execute(
+                "SELECT id FROM destino "
+                "WHERE ciudad = ? AND departamento = ? AND pais = ? AND moneda_local = ?", datos
+            ).fetchone()[0]
+
+    def guardar_viaje(self, viaje: Viaje, cliente: Cliente = None) -> int:
+        """
+        Guarda un viaje nuevo junto con los gastos que ya tenga.
+
+        Args:
+            viaje (Viaje): Viaje a guardar.
+            cliente (Cliente | None): Cliente que realiza el viaje; se guarda también. Si es
+                                      None, se usa el cliente del viaje.
+
+        Returns:
+            int: Identificador del viaje en la base de datos.
+        """
+        cliente = cliente if cliente is not None else viaje.cliente
+        if cliente is not None:
+            self.guardar_cliente(cliente)
+        destino_id = self.guardar_destino(viaje.destino)
+        with self._lock, self._conexion:
+            viaje_id = self._conexion.execute(
+                "INSERT INTO viaje (cliente_cedula, destino_id, fecha_inicio, fecha_fin, "
+                "presupuesto_centavos, tipo_viaje, estado_viaje) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cliente.get_cedula() if cliente is not None else None, destino_id,
+                 viaje.fecha_inicio.isoformat(), viaje.fecha_fin.isoformat(),
+                 viaje.presupuesto_centavos, viaje.tipo_viaje.value, int(viaje.estado_viaje))
+            ).lastrowid
+        self.insertar_gastos(viaje_id, viaje.get_gastos())
+        return viaje_id
+
+    def actualizar_estado(self, viaje_id: int, estado_viaje: bool):
+        """
+        Guarda el estado (activo o finalizado) de un viaje.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+            estado_viaje (bool): True si el viaje sigue activo.
+        """
+        with self._lock, self._conexion:
+            self._conexion.execute("UPDATE viaje SET estado_viaje = ? WHERE id = ?",
+                                   (int(estado_viaje), viaje_id))
+
+    def cargar_viaje(self, viaje_id: int) -> Viaje:
+        """
+        Carga un viaje con sus gastos en un GastosSQLite, sin leerlos a memoria.
+
+        Los agregados del viaje se construyen con la tabla cruzada calculada en SQL, y su
+        finalización se guarda automáticamente en la base de datos.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            Viaje: Viaje cuyos gastos se leen y escriben en este repositorio.
+
+        Raises:
+            KeyError: Si no existe un viaje con ese identificador.
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT v.fecha_inicio, v.fecha_fin, v.presupuesto_centavos, v.tipo_viaje, "
+                "v.estado_viaje, v.cliente_cedula, d.ciudad, d.departamento, d.pais, "
+                "d.moneda_local "
+                "FROM viaje v JOIN destino d ON d.id = v.destino_id WHERE v.id = ?",
+                (viaje_id,)
+            ).fetchone()
+        if fila is None:
+            raise KeyError(f"No existe el viaje {viaje_id}.")
+        fecha_inicio, fecha_fin, presupuesto, tipo_viaje, estado, cedula = fila[:6]
+        viaje = Viaje(date.fromisoformat(fecha_inicio), date.fromisoformat(fecha_fin),
+                      0, Destino.obtener(*fila[6:]), TipoViaje(tipo_viaje),
+                      almacen=GastosSQLite(self, viaje_id),
+                      cliente=self.obtener_cliente(cedula) if cedula is not None else None)
+        viaje.presupuesto_centavos = presupuesto
+        viaje.viaje_id = viaje_id
+        viaje.estado_viaje = bool(estado)
+        viaje.agregar_observador(viaje.get_gastos())
+        return viaje
+
+    def insertar_gastos(self, viaje_id: int, gastos):
+        """
+        Inserta gastos con una sentencia preparada, en transacciones de `tamano_lote` gastos.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+            gastos (iterable[Gasto]): Gastos a insertar; se recorren una sola vez.
+        """
+        lote = []
+        for gasto in gastos:
+            lote.append(fila_gasto(viaje_id, gasto))
+            if len(lote) >= self.tamano_lote:
+                self._insertar_filas(lote)
+                lote = []
+        if lote:
+            self._insertar_filas(lote)
+
+    def reemplazar_gastos(self, viaje_id: int, gastos, estado_viaje: bool):
+        """
+        Reemplaza los gastos guardados de un viaje y su estado en una sola transacción.
+
+        Si algo falla, la base queda como estaba: el viaje nunca queda sin gastos o con solo
+        una parte de ellos.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+            gastos (iterable[Gasto]): Gastos que reemplazan a los guardados.
+            estado_viaje (bool): True si el viaje sigue activo.
+        """
+        with self._lock, self._conexion:
+            self._conexion.execute("DELETE FROM gasto WHERE viaje_id = ?", (viaje_id,))
+            lote = []
+            for gasto in gastos:
+                lote.append(fila_gasto(viaje_id, gasto))
+                if len(lote) >= self.tamano_lote:
+                    self._conexion.executemany(INSERTAR_GASTO, lote)
+                    lote = []
+            if lote:
+                self._conexion.executemany(INSERTAR_GASTO, lote)
+            self._conexion.execute("UPDATE viaje SET estado_viaje = ? WHERE id = ?",
+                                   (int(estado_viaje), viaje_id))
+
+    def _insertar_filas(self, filas: list):
+        """Inserta filas ya convertidas en una sola transacción."""
+        with self._lock, self._conexion:
+            self._conexion.executemany(INSERTAR_GASTO, filas)
+
+    def tabla_cruzada(self, viaje_id: int) -> tuple:
+        """
+        Agrupa los gastos de un viaje por fecha, tipo y medio de pago en SQL.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            tuple: (tabla, cantidades) con la misma forma que `calcular_tabla_cruzada` de
+                   resumen_gastos (totales en centavos), en orden cronológico.
+        """
+        tabla = {}
+        cantidades = {}
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT fecha, tipo_gasto, medio_pago, SUM(centavos_cop), COUNT(*) FROM gasto "
+                "WHERE viaje_id = ? GROUP BY fecha, tipo_gasto, medio_pago ORDER BY fecha",
+                (viaje_id,)
+            ).fetchall()
+        for fecha, tipo, medio, total, cantidad in filas:
+            celda = (date.fromordinal(fecha), tipo, medio)
+            tabla[celda] = total
+            cantidades[celda] = cantidad
+        return tabla, cantidades
+
+    def gasto_diario(self, viaje_id: int, fecha: date) -> float:
+        """
+        Suma en SQL los gastos en COP de un viaje en una fecha, usando el índice por fecha.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+            fecha (date): Fecha a consultar.
+
+        Returns:
+            float: Total de la fecha, o 0 si no hay gastos.
+        """
+        with self._lock:
+            centavos = self._conexion.execute(
+                "SELECT COALESCE(SUM(centavos_cop), 0) FROM gasto "
+                "WHERE viaje_id = ? AND fecha = ?", (viaje_id, fecha.toordinal())
+            ).fetchone()[0]
+        return a_unidades(centavos)
+
+    def reporte_diario(self, viaje_id: int) -> dict:
+        """
+        Agrupa en SQL los gastos de un viaje por fecha.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            dict: Fecha -> {'efectivo', 'tarjetas', 'total'}, en orden cronológico.
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                f"SELECT fecha, {SUMAS_POR_MEDIO} FROM gasto WHERE viaje_id = ? "
+                "GROUP BY fecha ORDER BY fecha", (viaje_id,)
+            ).fetchall()
+        return reporte_a_unidades({
+            date.fromordinal(fecha): {'efectivo': efectivo, 'tarjetas': tarjetas, 'total': total}
+            for fecha, efectivo, tarjetas, total in filas
+        })
+
+    def reporte_por_tipo(self, viaje_id: int) -> dict:
+        """
+        Agrupa en SQL los gastos de un viaje por tipo de gasto.
+
+        Args:
+            viaje_id (int): Identificador del viaje.
+
+        Returns:
+            dict: Nombre del tipo -> {'efectivo', 'tarjetas', 'total'}; los tipos sin gastos
+                  aparecen en cero.
+        """
+        reporte = {tipo.name: {'efectivo': 0, 'tarjetas': 0, 'total': 0} for tipo in TipoGasto}
+        with self._lock:
+            filas = self._conexion.execute(
+                f"SELECT tipo_gasto, {SUMAS_POR_MEDIO} FROM gasto WHERE viaje_id = ? "
+                "GROUP BY tipo_gasto", (viaje_id,)
+            ).fetchall()
+        for tipo, efectivo, tarjetas, total in filas:
+            reporte[tipo] = {'efectivo': efectivo, 'tarjetas': tarjetas, 'total': total}
+        return reporte_a_unidades(reporte)
+
+    def ejecutar(self, consulta: str, parametros: tuple = ()) -> list:
+        """Ejecuta una consulta de lectura y retorna todas sus filas."""
+        with self._lock:
+            return self._conexion.execute(consulta, parametros).fetchall()
+
+    def ejecutar_cambio(self, consulta: str, parametros: tuple = ()):
+        """Ejecuta una sentencia de escritura en su propia transacción."""
+        with self._lock, self._conexion:
+            self._conexion.execute(consulta, parametros)
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conexion.close()
+
+
+class GastosSQLite:
+    """
+    Secuencia de los gastos de un viaje guardados en un RepositorioSQLite.
+
+    Puede usarse donde se espera la lista de gastos de un viaje. Los gastos agregados se
+    acumulan en memoria y se insertan por lotes; cualquier lectura escribe antes los pendientes.
+
+    Atributos:
+        repositorio (RepositorioSQLite): Repositorio donde se guardan los gastos.
+        viaje_id (int): Identificador del viaje.
+    """
+
+    def __init__(self, repositorio: RepositorioSQLite, viaje_id: int):
+        """
+        Inicializa el almacén de gastos de un viaje ya guardado.
+
+        Args:
+            repositorio (RepositorioSQLite): Repositorio del viaje.
+            viaje_id (int): Identificador del viaje.
+        """
+        self.repositorio = repositorio
+        self.viaje_id = viaje_id
+        self._pendientes = []
+
+    def append(self, gasto: Gasto):
+        """Agrega un gasto; se inserta al completar un lote o en la siguiente lectura."""
+        self._pendientes.append(gasto)
+        if len(self._pendientes) >= self.repositorio.tamano_lote:
+            self.sincronizar()
+
+    def extend(self, gastos):
+        """Agrega varios gastos."""
+        self._pendientes.extend(gastos)
+        if len(self._pendientes) >= self.repositorio.tamano_lote:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Inserta en la base de datos los gastos pendientes."""
+        if self._pendientes:
+            pendientes, self._pendientes = self._pendientes, []
+            self.repositorio.insertar_gastos(self.viaje_id, pendientes)
+
+    def tabla_cruzada(self) -> tuple:
+        """Calcula la tabla cruzada fecha × tipo × medio de pago con un `GROUP BY`."""
+        self.sincronizar()
+        return self.repositorio.tabla_cruzada(self.viaje_id)
+
+    def __len__(self):
+        self.sincronizar()
+        return self.repositorio.ejecutar("SELECT COUNT(*) FROM gasto WHERE viaje_id = ?",
+                                         (self.viaje_id,))[0][0]
+
+    def __iter__(self):
+        self.sincronizar()
+        ultimo = 0
+        # Se lee por bloques de identificadores para no retener el lock durante la iteración.
+        while True:
+            filas = self.repositorio.ejecutar(
+                f"SELECT id, {COLUMNAS_GASTO} FROM gasto WHERE viaje_id = ? AND id > ? "
+                "ORDER BY id LIMIT ?", (self.viaje_id, ultimo, self.repositorio.tamano_lote)
+            )
+            if not filas:
+                return
+            for fila in filas:
+                yield gasto_desde_fila(fila[1:])
+            ultimo = filas[-1][0]
+
+    def __getitem__(self, posicion: int) -> Gasto:
+        """Lee el gasto de la posición indicada, en orden de inserción."""
+        return gasto_desde_fila(self._fila(posicion)[1:])
+
+    def __setitem__(self, posicion: int, gasto: Gasto):
+        """Sobrescribe el gasto de la posición indicada."""
+        fila = fila_gasto(self.viaje_id, gasto)
+        self.repositorio.ejecutar_cambio(
+            "UPDATE gasto SET fecha = ?, centavos = ?, medio_pago = ?, tipo_gasto = ?, "
+            "centavos_cop = ? WHERE id = ?", fila[1:] + (self._fila(posicion)[0],)
+        )
+
+    def __delitem__(self, posicion: int):
+        """Elimina el gasto de la posición indicada."""
+        self.repositorio.ejecutar_cambio("DELETE FROM gasto WHERE id = ?",
+                                         (self._fila(posicion)[0],))
+
+    def _fila(self, posicion: int) -> tuple:
+        """Retorna (id, columnas del gasto) de la posición indicada, admitiendo negativos."""
+        if posicion < 0:
+            posicion += len(self)
+        self.sincronizar()
+        filas = self.repositorio.ejecutar(
+            f"SELECT id, {COLUMNAS_GASTO} FROM gasto WHERE viaje_id = ? "
+            "ORDER BY id LIMIT 1 OFFSET ?", (self.viaje_id, posicion)
+        ) if posicion >= 0 else []
+        if not filas:
+            raise IndexError("Posición de gasto fuera de rango.")
+        return filas[0]
+
+    def _id_de(self, gasto: Gasto) -> int:
+        """Retorna el identificador del primer gasto con los mismos datos, usando el índice."""
+        self.sincronizar()
+        filas = self.repositorio.ejecutar(
+            "SELECT id FROM gasto WHERE viaje_id = ? AND fecha = ? AND centavos = ? "
+            "AND medio_pago = ? AND tipo_gasto = ? AND centavos_cop = ? ORDER BY id LIMIT 1",
+            fila_gasto(self.viaje_id, gasto)
+        )
+        if not filas:
+            raise ValueError("El gasto no está en el repositorio.")
+        return filas[0][0]
+
+    def index(self, gasto: Gasto) -> int:
+        """
+        Retorna la posición del primer gasto con los mismos datos.
+
+        Raises:
+            ValueError: Si no hay ningún gasto con esos datos.
+        """
+        return self.repositorio.ejecutar(
+            "SELECT COUNT(*) FROM gasto WHERE viaje_id = ? AND id < ?",
+            (self.viaje_id, self._id_de(gasto))
+        )[0][0]
+
+    def remove(self, gasto: Gasto):
+        """
+        Elimina el primer gasto con los mismos datos.
+
+        Raises:
+            ValueError: Si no hay ningún gasto con esos datos.
+        """
+        self.repositorio.ejecutar_cambio("DELETE FROM gasto WHERE id = ?", (self._id_de(gasto),))
+
+    def __call__(self, evento: str, viaje: Viaje, *datos):
+        """Observador del viaje: guarda su finalización junto con los gastos pendientes."""
+        if evento == 'viaje_finalizado':
+            self.sincronizar()
+            self.repositorio.actualizar_estado(self.viaje_id, False)
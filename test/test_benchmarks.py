@@ -0,0 +1,105 @@
+"""
+Pruebas de los benchmarks: ejecución de cada uno con una carga mínima y control de regresiones
+de la suite.
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks import suite
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Argumentos de cada benchmark para que termine en pocos segundos.
+ARGUMENTOS = {
+    'bench_arranque': ["--repeticiones", "1", "--modulos", "1"],
+    'bench_concurrencia': ["--gastos", "10"],
+    'bench_gasto_diario': ["--maximo", "1000"],
+    'bench_memoria': ["--gastos", "10", "--viajes", "10"],
+    'bench_reporte_flota': ["--viajes", "4", "--gastos", "10"],
+}
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Ejecuta cada `benchmarks/bench_*.py` en un intérprete nuevo."""
+
+    def test_benchmarks_se_ejecutan(self):
+        """Todos los benchmarks deben terminar sin errores con una carga mínima."""
+        rutas = sorted(glob.glob(os.path.join(RAIZ, "benchmarks", "bench_*.py")))
+        self.assertTrue(rutas)
+        for ruta in rutas:
+            nombre = os.path.splitext(os.path.basename(ruta))[0]
+            with self.subTest(benchmark=nombre):
+                self.assertIn(nombre, ARGUMENTOS, "Falta la carga mínima del benchmark.")
+                proceso = subprocess.run(
+                    [sys.executable, "-m", f"benchmarks.{nombre}", *ARGUMENTOS[nombre]],
+                    cwd=RAIZ, capture_output=True, text=True, timeout=120
+                )
+                self.assertEqual(proceso.returncode, 0, proceso.stderr)
+
+    def test_suite_restaura_configuracion_de_tasas(self):
+        """La suite en el mismo proceso no debe cambiar la configuración de tasas del llamador."""
+        api = suite.ControlAPIMonedaIntercambio
+        originales = (api.url_api, api.cache, api.transporte, api.paquete)
+        with mock.patch("sys.stdout"):
+            resultados = suite.ejecutar(["obtener_tasa", "registrar_gasto_internacional"], [3],
+                                        memoria=False)
+        self.assertEqual(len(resultados), 2)
+        for actual, original in zip((api.url_api, api.cache, api.transporte, api.paquete),
+                                    originales):
+            self.assertIs(actual, original)
+
+
+class TestComparacionLineaBase(unittest.TestCase):
+    """Pruebas del control de regresiones de la suite frente a la línea base."""
+
+    def setUp(self):
+        """Prepara un resultado con 1000 ops/s y 1 MiB de pico de memoria."""
+        self.resultados = [{'caso': 'reporte_diario', 'tamano': 1000,
+                            'ops_por_segundo': 1000.0, 'memoria_pico_bytes': 2 ** 20}]
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+
+    def test_comparar_detecta_regresiones(self):
+        """Debe reportar solo las métricas que empeoran más que la tolerancia."""
+        base = [{'caso': 'reporte_diario', 'tamano': 1000,
+                 'ops_por_segundo': 1200.0, 'memoria_pico_bytes': 2 ** 19}]
+        self.assertEqual(len(suite.comparar(self.resultados, base, 0.25)), 1)
+        self.assertEqual(len(suite.comparar(self.resultados, base, 0.10)), 2)
+        self.assertEqual(suite.comparar(self.resultados, base, 1.0), [])
+        self.assertEqual(suite.comparar(self.resultados, [], 0.0), [])
+
+    def ejecutar_main(self, *argumentos):
+        """Ejecuta `suite.main` sin medir, con los resultados preparados."""
+        argv = ["suite", "--salida", os.path.join(self.directorio, "resultados.json"),
+                *argumentos]
+        with mock.patch.object(sys, "argv", argv), \
+                mock.patch.object(suite, "ejecutar", return_value=self.resultados), \
+                mock.patch("builtins.print"):
+            suite.main()
+
+    def test_linea_base_faltante(self):
+        """Sin línea base, `--comparar` debe fallar; sin la opción, no se compara."""
+        faltante = os.path.join(self.directorio, "no_existe.json")
+        self.ejecutar_main("--linea-base", faltante)
+        with self.assertRaises(SystemExit) as contexto:
+            self.ejecutar_main("--linea-base", faltante, "--comparar")
+        self.assertEqual(contexto.exception.code, 1)
+
+    def test_main_falla_ante_regresion(self):
+        """Si el rendimiento cae más que la tolerancia, debe terminar con código 1."""
+        ruta = os.path.join(self.directorio, "linea_base.json")
+        self.ejecutar_main("--linea-base", ruta, "--guardar-linea-base")
+        self.ejecutar_main("--linea-base", ruta, "--comparar")
+        self.resultados[0]['ops_por_segundo'] = 500.0
+        with self.assertRaises(SystemExit) as contexto:
+            self.ejecutar_main("--linea-base", ruta, "--comparar")
+        self.assertEqual(contexto.exception.code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Pruebas unitarias para la caché de tasas de cambio.
+"""
+import os
+import tempfile
+import time
+import unittest
+
+from controladores.cache_tasas import CacheTasas
+
+
+class TestCacheTasas(unittest.TestCase):
+    """Conjunto de pruebas para la caché LRU con respaldo en disco."""
+
+    def setUp(self):
+        """Crea un directorio temporal para el almacén en disco."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "tasas.sqlite3")
+
+    def tearDown(self):
+        """Elimina el directorio temporal."""
+        self.directorio.cleanup()
+
+    def test_acierto_y_fallo(self):
+        """Debe contar un fallo antes de guardar y un acierto en memoria después."""
+        cache = CacheTasas()
+        self.assertIsNone(cache.obtener("usd:2025-06-01"))
+        cache.guardar("usd:2025-06-01", 4100.5)
+        self.assertEqual(cache.obtener("usd:2025-06-01"), 4100.5)
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas['fallos'], 1)
+        self.assertEqual(estadisticas['aciertos_memoria'], 1)
+
+    def test_descarta_la_menos_usada(self):
+        """Debe descartar la entrada menos usada cuando se supera la capacidad."""
+        cache = CacheTasas(capacidad=2)
+        cache.guardar("a", 1.0)
+        cache.guardar("b", 2.0)
+        cache.obtener("a")
+        cache.guardar("c", 3.0)
+        self.assertIsNone(cache.obtener("b"))
+        self.assertEqual(cache.obtener("a"), 1.0)
+
+    def test_persiste_entre_instancias(self):
+        """Debe recuperar desde disco una tasa guardada por otra instancia."""
+        cache = CacheTasas(ruta=self.ruta)
+        cache.guardar("eur:2025-06-01", 4500.25)
+        cache.cerrar()
+
+        nueva = CacheTasas(ruta=self.ruta)
+        self.assertEqual(nueva.obtener("eur:2025-06-01"), 4500.25)
+        self.assertEqual(nueva.estadisticas()['aciertos_disco'], 1)
+        nueva.cerrar()
+
+    def test_entrada_volatil_vence(self):
+        """Debe ignorar una entrada volátil cuyo tiempo de vida ya pasó."""
+        cache = CacheTasas(ruta=self.ruta, ttl_volatil=0.01)
+        cache.guardar("usd:hoy", 4000.0, volatil=True)
+        time.sleep(0.02)
+        self.assertIsNone(cache.obtener("usd:hoy"))
+        cache.cerrar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Pruebas de estrés del modelo de concurrencia de Viaje y ControlViaje.
+"""
+import threading
+import time
+import unittest
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+from controladores.control_reporte import ControlReporte
+
+HILOS = 8
+GASTOS_POR_HILO = 3000
+
+
+def crear_viaje():
+    """Crea un viaje nacional de diez días."""
+    return Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                 Destino.obtener("Cali", "Valle", "Colombia", "cop"), TipoViaje.NACIONAL)
+
+
+def en_paralelo(objetivo, argumentos):
+    """Ejecuta `objetivo` en un hilo por argumento, arrancándolos a la vez, y los espera."""
+    barrera = threading.Barrier(len(argumentos))
+
+    def correr(argumento):
+        barrera.wait()
+        objetivo(argumento)
+
+    hilos = [threading.Thread(target=correr, args=(argumento,)) for argumento in argumentos]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+
+class TestConcurrenciaViaje(unittest.TestCase):
+    """Conjunto de pruebas que registran gastos en un mismo viaje desde muchos hilos."""
+
+    def test_ningun_gasto_despues_de_finalizar(self):
+        """Los gastos aceptados, los almacenados y los agregados deben coincidir siempre."""
+        viaje = crear_viaje()
+        aceptados = [0] * (HILOS + 1)
+        rechazados = [False] * HILOS
+        inconsistencias = []
+
+        def registrar(hilo):
+            if hilo == HILOS:
+                # Hilo lector: finaliza a mitad de la carga y revisa reportes consistentes.
+                while len(viaje.get_gastos()) < HILOS * GASTOS_POR_HILO // 2:
+                    reporte = ControlReporte.calcular_reporte_gastos_todos_los_dias(None, viaje)
+                    for datos in reporte.values():
+                        if datos['efectivo'] + datos['tarjetas'] != datos['total']:
+                            inconsistencias.append(datos)
+                viaje.finalizar_viaje()
+                return
+            # Los hilos escritores siguen registrando hasta que el viaje los rechace.
+            medio = MedioPago.EFECTIVO if hilo % 2 else MedioPago.TARJETA_CREDITO
+            for i in range(100 * GASTOS_POR_HILO):
+                gasto = Gasto(date(2025, 6, 1 + i % 10), 1, medio, TipoGasto.COMPRAS, 1)
+                try:
+                    viaje.agregar_gasto(gasto)
+                except RuntimeError:
+                    rechazados[hilo] = True
+                    return
+                aceptados[hilo] += 1
+
+        en_paralelo(registrar, list(range(HILOS + 1)))
+
+        self.assertFalse(viaje.estado_viaje)
+        self.assertEqual(inconsistencias, [])
+        self.assertTrue(all(rechazados))
+        self.assertEqual(len(viaje.get_gastos()), sum(aceptados))
+        self.assertEqual(ControlReporte.generar_reportes(viaje),
+                         ControlReporte.recalcular_reportes(viaje))
+
+    def test_rendimiento_con_varios_hilos(self):
+        """El rendimiento total con varios hilos no debe desplomarse por contención."""
+        def medir(hilos):
+            viajes = [crear_viaje() for _ in range(hilos)]
+            gasto = Gasto(date(2025, 6, 1), 1, MedioPago.EFECTIVO, TipoGasto.COMPRAS, 1)
+
+            def registrar(viaje):
+                for _ in range(GASTOS_POR_HILO):
+                    viaje.agregar_gasto(gasto)
+
+            inicio = time.perf_counter()
+            en_paralelo(registrar, viajes)
+            return hilos * GASTOS_POR_HILO / (time.perf_counter() - inicio)
+
+        un_hilo = medir(1)
+        varios = medir(HILOS)
+        # Con el GIL no se espera una mejora lineal, pero sí que no haya convoyes de locks.
+        self.assertGreater(varios, un_hilo * 0.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Pruebas unitarias para el controlador de conversión de monedas.
+
+Las respuestas de la API se simulan para no depender de la red.
+"""
+import asyncio
+import unittest
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.transporte_http import ErrorTransporte
+
+TABLA_USD = {'usd': {'cop': 4000.0, 'eur': 0.8, 'mxn': 20.0}}
+
+
+class TestControlAPIMonedaIntercambio(unittest.TestCase):
+    """Conjunto de pruebas para la obtención y conversión de tasas de cambio."""
+
+    def setUp(self):
+        """Reinicia la caché de tasas antes de cada prueba."""
+        ControlAPIMonedaIntercambio.configurar_cache()
+        parche = mock.patch.object(ControlAPIMonedaIntercambio, "transporte")
+        self.transporte = parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_tabla_reutilizada_para_otras_monedas(self):
+        """Debe resolver tasas directas, inversas y cruzadas con una sola descarga."""
+        self.transporte.obtener_json.return_value = TABLA_USD
+        fecha = date(2025, 6, 1)
+
+        self.assertEqual(ControlAPIMonedaIntercambio.obtener_tasa_cambio("USD", fecha), 4000.0)
+        self.assertEqual(ControlAPIMonedaIntercambio.obtener_tasa_cambio("eur", fecha), 5000.0)
+        self.assertAlmostEqual(ControlAPIMonedaIntercambio.obtener_tasa("cop", "usd", fecha),
+                               1 / 4000.0)
+        self.assertAlmostEqual(ControlAPIMonedaIntercambio.obtener_tasa("mxn", "eur", fecha),
+                               0.04)
+        self.assertEqual(self.transporte.obtener_json.call_count, 1)
+
+    def test_convertir_moneda(self):
+        """Debe convertir el monto a COP redondeando a dos decimales."""
+        self.transporte.obtener_json.return_value = TABLA_USD
+        valor = ControlAPIMonedaIntercambio.convertir_moneda("usd", 12.5, date(2025, 6, 1))
+        self.assertEqual(valor, 50000.0)
+
+    def test_retrocede_ante_fecha_inexistente(self):
+        """Debe usar la tabla del día anterior si la fecha solicitada no existe (404)."""
+        self.transporte.obtener_json.side_effect = [None, None, TABLA_USD]
+        tabla = ControlAPIMonedaIntercambio.obtener_tabla("usd", date(2025, 6, 3))
+        self.assertEqual(tabla['fecha'], "2025-06-01")
+
+    def test_fechas_no_publicadas_se_recuerdan(self):
+        """No debe volver a consultar una fecha que la API ya respondió con 404."""
+        self.transporte.obtener_json.side_effect = [None, TABLA_USD]
+        tabla = ControlAPIMonedaIntercambio.obtener_tabla("usd", date(2025, 6, 2))
+        self.assertEqual(tabla['fecha'], "2025-06-01")
+
+        self.assertIsNone(ControlAPIMonedaIntercambio.descargar_tabla("usd", date(2025, 6, 2)))
+        self.assertEqual(self.transporte.obtener_json.call_count, 2)
+        estadisticas = ControlAPIMonedaIntercambio.estadisticas_cache()
+        self.assertEqual((estadisticas['fallos'], estadisticas['aciertos_memoria']), (1, 0))
+        ControlAPIMonedaIntercambio.obtener_tabla("usd", date(2025, 6, 2))
+        estadisticas = ControlAPIMonedaIntercambio.estadisticas_cache()
+        self.assertEqual((estadisticas['fallos'], estadisticas['aciertos_memoria']), (1, 1))
+
+    def test_tabla_de_respaldo_vence_si_la_fecha_puede_publicarse(self):
+        """La tabla de un día anterior usada para ayer debe renovarse al publicarse ayer."""
+        ayer = date.today() - timedelta(days=1)
+        self.transporte.obtener_json.side_effect = [None, TABLA_USD]
+        tabla = ControlAPIMonedaIntercambio.obtener_tabla("usd", ayer)
+        self.assertEqual(tabla['fecha'], (ayer - timedelta(days=1)).isoformat())
+
+        self.transporte.obtener_json.side_effect = [{'usd': {'cop': 4100.0}}]
+        ttl = ControlAPIMonedaIntercambio.cache.ttl_volatil
+        with mock.patch("controladores.cache_tasas.time") as reloj:
+            reloj.time.return_value = time.time() + ttl + 1
+            self.assertEqual(ControlAPIMonedaIntercambio.obtener_tasa_cambio("usd", ayer),
+                             4100.0)
+
+    def test_busqueda_paralela_elige_fecha_mas_reciente(self):
+        """Debe elegir la fecha publicada más reciente al consultar los días en paralelo."""
+        publicadas = ("2025-06-01", "2025-05-31", "2025-05-28")
+        self.transporte.obtener_json.side_effect = (
+            lambda url: TABLA_USD if any(f"@{fecha}/" in url for fecha in publicadas) else None
+        )
+        ControlAPIMonedaIntercambio.configurar_busqueda_paralela(True)
+        self.addCleanup(ControlAPIMonedaIntercambio.configurar_busqueda_paralela, False)
+
+        tabla = ControlAPIMonedaIntercambio.obtener_tabla("usd", date(2025, 6, 4))
+        self.assertEqual(tabla['fecha'], "2025-06-01")
+
+    def test_error_http_no_se_reintenta_en_bucle(self):
+        """Debe propagar un error distinto al 404 en lugar de seguir intentando."""
+        self.transporte.obtener_json.side_effect = ErrorTransporte("Error HTTP 403")
+        with self.assertRaises(ErrorTransporte):
+            ControlAPIMonedaIntercambio.obtener_tasa_cambio("usd", date(2025, 6, 1))
+        self.assertEqual(self.transporte.obtener_json.call_count, 1)
+
+
+class TestControlAPIMonedaIntercambioAsync(unittest.IsolatedAsyncioTestCase):
+    """Pruebas para la conversión asíncrona de monedas."""
+
+    def setUp(self):
+        """Reinicia la caché y simula el transporte HTTP."""
+        ControlAPIMonedaIntercambio.configurar_cache()
+        parche = mock.patch.object(ControlAPIMonedaIntercambio, "transporte")
+        self.transporte = parche.start()
+        self.addCleanup(parche.stop)
+        self.transporte.obtener_json.return_value = TABLA_USD
+
+    async def test_consultas_concurrentes_comparten_descarga(self):
+        """Debe realizar una sola descarga para muchas conversiones concurrentes iguales."""
+        valores = await asyncio.gather(*(
+            ControlAPIMonedaIntercambio.convertir_moneda_async("usd", 2, date(2025, 6, 1))
+            for _ in range(50)
+        ))
+        self.assertEqual(valores, [8000.0] * 50)
+        self.assertEqual(self.transporte.obtener_json.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
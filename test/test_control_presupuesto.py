@@ -0,0 +1,81 @@
+"""
+Pruebas unitarias para el seguimiento del presupuesto de un viaje.
+"""
+import unittest
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+from controladores.control_presupuesto import (
+    ControlPresupuesto, EXCEDIDO, UMBRAL_80, UMBRAL_100
+)
+
+
+def gasto(dia: int, valor: float) -> Gasto:
+    """Crea un gasto en efectivo del 2025-06-<dia>."""
+    return Gasto(date(2025, 6, dia), valor, MedioPago.EFECTIVO, TipoGasto.COMPRAS, valor)
+
+
+class TestControlPresupuesto(unittest.TestCase):
+    """Pruebas de los totales restantes y de las alertas por umbral."""
+
+    def setUp(self):
+        """Crea un viaje de 3 días con 100000 COP diarios y un control que guarda las alertas."""
+        self.viaje = Viaje(date(2025, 6, 1), date(2025, 6, 3), 100000,
+                           Destino("Cali", "Valle", "Colombia", "cop"), TipoViaje.NACIONAL)
+        self.control = ControlPresupuesto(self.viaje)
+        self.alertas = []
+        self.control.suscribir(self.alertas.append)
+
+    def umbrales(self):
+        """Retorna (fecha, umbral) de las alertas recibidas."""
+        return [(alerta.fecha, alerta.umbral) for alerta in self.alertas]
+
+    def test_restante_por_dia_y_viaje(self):
+        """Debe descontar cada gasto del día y del presupuesto total del viaje."""
+        self.viaje.agregar_gasto(gasto(1, 30000))
+        self.viaje.agregar_gastos([gasto(2, 10000), gasto(2, 5000)])
+        self.assertEqual(self.control.restante_dia(date(2025, 6, 1)), 70000)
+        self.assertEqual(self.control.restante_dia(date(2025, 6, 2)), 85000)
+        self.assertEqual(self.control.restante_viaje(), 255000)
+
+        self.viaje.eliminar_gasto(self.viaje.get_gastos()[0])
+        self.assertEqual(self.control.restante_viaje(), 285000)
+        self.assertEqual(self.alertas, [])
+
+    def test_umbral_se_avisa_una_vez_por_cruce(self):
+        """Cada umbral debe avisarse al cruzarlo y no de nuevo mientras siga cruzado."""
+        dia = date(2025, 6, 1)
+        self.viaje.agregar_gasto(gasto(1, 80000))
+        self.viaje.agregar_gasto(gasto(1, 5000))
+        self.assertEqual(self.umbrales(), [(dia, UMBRAL_80)])
+
+        self.viaje.agregar_gasto(gasto(1, 30000))
+        self.assertEqual(self.umbrales(), [(dia, UMBRAL_80), (dia, UMBRAL_100), (dia, EXCEDIDO)])
+        self.assertEqual(self.alertas[-1].gastado, 115000)
+
+        self.alertas.clear()
+        self.viaje.eliminar_gasto(self.viaje.get_gastos()[2])
+        self.viaje.agregar_gasto(gasto(1, 20000))
+        self.assertEqual(self.umbrales(), [(dia, UMBRAL_100), (dia, EXCEDIDO)])
+
+    def test_umbral_del_viaje(self):
+        """Debe avisar los umbrales del viaje completo con fecha None."""
+        self.viaje.agregar_gastos([gasto(1, 90000), gasto(2, 90000), gasto(3, 60000)])
+        self.assertIn((None, UMBRAL_80), self.umbrales())
+        self.assertNotIn((None, UMBRAL_100), self.umbrales())
+
+        anterior = self.viaje.get_gastos()[2]
+        self.viaje.reemplazar_gasto(anterior, gasto(3, 120000))
+        dia = date(2025, 6, 3)
+        self.assertEqual(self.umbrales()[-4:], [(None, UMBRAL_100), (dia, UMBRAL_80),
+                                                (dia, UMBRAL_100), (dia, EXCEDIDO)])
+        self.assertEqual(self.control.restante_viaje(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
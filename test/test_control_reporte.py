@@ -8,9 +8,11 @@ from enums.medio_pago import MedioPago
 from enums.tipo_gasto import TipoGasto
 from enums.tipo_viaje import TipoViaje
 from modelos.destino import Destino
+from modelos.almacen_columnar import AlmacenGastosColumnar
 from modelos.gasto import Gasto
+from modelos.resumen_gastos import ResumenGastos
 from modelos.viaje import Viaje
-from controladores.control_reporte import ControlReporte
+from controladores.control_reporte import ControlReporte, combinar_reportes
 
 class TestCasosReporte(unittest.TestCase):
     """Conjunto de pruebas unitarias para validar el cálculo de reportes de gastos."""
@@ -186,6 +188,151 @@ class TestCasosReporte(unittest.TestCase):
             'total': 40000
         })
 
+    def test_reporte_por_tipo(self):
+        """Debe acumular por tipo de gasto y dejar en cero los tipos sin gastos."""
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 20000, MedioPago.EFECTIVO,
+            TipoGasto.ALIMENTACION, 20000
+        ))
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 2), 15000, MedioPago.TARJETA_CREDITO,
+            TipoGasto.ALIMENTACION, 15000
+        ))
+        reporte = ControlReporte.reporte_por_tipo(self.viaje)
+        self.assertEqual(
+            reporte['ALIMENTACION'],
+            {'efectivo': 20000, 'tarjetas': 15000, 'total': 35000}
+        )
+        self.assertEqual(reporte['OTROS'], {'efectivo': 0, 'tarjetas': 0, 'total': 0})
+
+    def test_reporte_es_una_copia(self):
+        """Modificar un reporte no debe alterar los agregados del viaje."""
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 20000, MedioPago.EFECTIVO,
+            TipoGasto.ALIMENTACION, 20000
+        ))
+        reporte = ControlReporte.calcular_reporte_gastos_todos_los_dias(None, self.viaje)
+        reporte[date(2025, 6, 1)]['total'] = 0
+        self.assertEqual(self.viaje.calcular_gasto_diario(date(2025, 6, 1)), 20000)
+
+    def test_almacen_columnar_mismos_reportes(self):
+        """Un viaje sobre un almacén columnar debe producir los mismos reportes."""
+        gastos = [
+            Gasto(date(2025, 6, 2), 15000, MedioPago.TARJETA_CREDITO, TipoGasto.COMPRAS, 15000),
+            Gasto(date(2025, 6, 1), 20000, MedioPago.EFECTIVO, TipoGasto.ALIMENTACION, 20000),
+            Gasto(date(2025, 6, 2), 5000, MedioPago.EFECTIVO, TipoGasto.COMPRAS, 5000),
+        ]
+        for gasto in gastos:
+            self.viaje.agregar_gasto(gasto)
+        columnar = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                         Destino("Bogotá", "Cundinamarca", "Colombia", "cop"),
+                         TipoViaje.NACIONAL, almacen=AlmacenGastosColumnar(gastos))
+
+        self.assertEqual(
+            ControlReporte.calcular_reporte_gastos_todos_los_dias(None, columnar),
+            ControlReporte.calcular_reporte_gastos_todos_los_dias(None, self.viaje)
+        )
+        self.assertEqual(ControlReporte.reporte_por_tipo(columnar),
+                         ControlReporte.reporte_por_tipo(self.viaje))
+        self.assertEqual(columnar.get_gastos()[1].get_tipo_gasto(), TipoGasto.ALIMENTACION)
+
+    def test_reportes_por_medio_y_fecha_tipo(self):
+        """Debe derivar los reportes por medio de pago y por fecha y tipo de la tabla cruzada."""
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 20000, MedioPago.EFECTIVO, TipoGasto.ALIMENTACION, 20000
+        ))
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 10000, MedioPago.TARJETA_DEBITO, TipoGasto.ALIMENTACION, 10000
+        ))
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 7000, MedioPago.TARJETA_CREDITO, TipoGasto.TRANSPORTE, 7000
+        ))
+        reportes = ControlReporte.generar_reportes(self.viaje)
+
+        self.assertEqual(reportes['por_medio'],
+                         {'EFECTIVO': 20000, 'TARJETA_DEBITO': 10000, 'TARJETA_CREDITO': 7000})
+        self.assertEqual(reportes['fecha_tipo'], {date(2025, 6, 1): {
+            'ALIMENTACION': {'efectivo': 20000, 'tarjetas': 10000, 'total': 30000},
+            'TRANSPORTE': {'efectivo': 0, 'tarjetas': 7000, 'total': 7000},
+        }})
+        self.assertEqual(ControlReporte.recalcular_reportes(self.viaje), reportes)
+
+    def test_reporte_diario_por_rango(self):
+        """Debe entregar solo los días del rango, en orden cronológico."""
+        for dia, valor in ((5, 500), (1, 100), (3, 300), (2, 200), (3, 50)):
+            self.viaje.agregar_gasto(Gasto(
+                date(2025, 6, dia), valor, MedioPago.EFECTIVO, TipoGasto.COMPRAS, valor
+            ))
+        filas = list(ControlReporte.iterar_reporte_diario(
+            self.viaje, date(2025, 6, 2), date(2025, 6, 4)
+        ))
+        self.assertEqual(filas, [
+            (date(2025, 6, 2), {'efectivo': 200, 'tarjetas': 0, 'total': 200}),
+            (date(2025, 6, 3), {'efectivo': 350, 'tarjetas': 0, 'total': 350}),
+        ])
+        self.assertEqual(
+            [fecha.day for fecha, _ in ControlReporte.iterar_reporte_diario(self.viaje)],
+            [1, 2, 3, 5]
+        )
+
+        self.viaje.eliminar_gasto(self.viaje.get_gastos()[3])
+        self.assertEqual(
+            [fecha.day for fecha, _ in ControlReporte.iterar_reporte_diario(
+                self.viaje, desde=date(2025, 6, 2))],
+            [3, 5]
+        )
+
+    def test_reporte_fecha_tipo_por_rango(self):
+        """El desglose por rango debe coincidir con el del reporte completo."""
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 2), 7000, MedioPago.TARJETA_CREDITO, TipoGasto.TRANSPORTE, 7000
+        ))
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 1), 20000, MedioPago.EFECTIVO, TipoGasto.ALIMENTACION, 20000
+        ))
+        self.viaje.agregar_gasto(Gasto(
+            date(2025, 6, 2), 3000, MedioPago.EFECTIVO, TipoGasto.TRANSPORTE, 3000
+        ))
+        completo = ControlReporte.reporte_por_fecha_y_tipo(self.viaje)
+        self.assertEqual(
+            list(ControlReporte.iterar_reporte_fecha_tipo(self.viaje, hasta=date(2025, 6, 2))),
+            sorted(completo.items())
+        )
+
+    def test_reporte_flota_combina_viajes(self):
+        """El reporte de flota debe sumar los reportes de cada viaje, con o sin procesos."""
+        destino = Destino("Bogotá", "Cundinamarca", "Colombia", "cop")
+        viajes = []
+        for numero in range(6):
+            gastos = [
+                Gasto(date(2025, 6, 1 + (numero + dia) % 5), 1000.5 * (dia + 1),
+                      list(MedioPago)[dia % 3], list(TipoGasto)[(numero + dia) % 6],
+                      1000.5 * (dia + 1))
+                for dia in range(numero + 3)
+            ]
+            almacen = AlmacenGastosColumnar(gastos) if numero % 2 else None
+            viaje = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000, destino,
+                          TipoViaje.NACIONAL, almacen=almacen)
+            if almacen is None:
+                viaje.agregar_gastos(gastos)
+            viajes.append(viaje)
+
+        esperado = ControlReporte._reportes_de(ResumenGastos())
+        for viaje in reversed(viajes):
+            combinar_reportes(esperado, ControlReporte.generar_reportes(viaje))
+
+        en_serie = ControlReporte.reporte_flota(viajes, procesos=1)
+        en_paralelo = ControlReporte.reporte_flota(viajes, procesos=2, particiones=3)
+        self.assertEqual(list(en_serie['diario']), sorted(esperado['diario']))
+        for clave, reporte in esperado.items():
+            self.assertEqual(en_serie[clave], reporte)
+            self.assertEqual(en_paralelo[clave], reporte)
+
+    def test_reporte_flota_sin_viajes(self):
+        """Sin viajes, el reporte de flota debe tener los totales en cero."""
+        self.assertEqual(ControlReporte.reporte_flota([], procesos=2),
+                         ControlReporte.generar_reportes(self.viaje))
+
     def test_valor_cop_negativo(self):
         """Debe lanzar ValueError si el valor en COP es negativo."""
         with self.assertRaises(ValueError):
@@ -0,0 +1,161 @@
+"""
+Pruebas unitarias para el registro de viajes de ControlViaje.
+"""
+import sqlite3
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.cliente import Cliente
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+from controladores.control_gasto import ViajeFinalizadoError
+from controladores.control_viaje import ControlViaje
+from persistencia.repositorio_sqlite import RepositorioSQLite
+
+
+class TestRegistroViajes(unittest.TestCase):
+    """Conjunto de pruebas para el registro de viajes de varios clientes."""
+
+    def setUp(self):
+        """Crea dos clientes y un destino nacional con fechas ya vencidas."""
+        self.ana = Cliente("Ana Pérez", "123", "3000000000", "ana@correo.com")
+        self.luis = Cliente("Luis Gómez", "456", "3100000000", "luis@correo.com")
+        self.destino = Destino.obtener("Cali", "Valle", "Colombia", "cop")
+        self.inicio = date.today() - timedelta(days=5)
+        self.fin = date.today() - timedelta(days=1)
+
+    def registrar(self, control, cliente):
+        """Registra un viaje nacional del cliente y retorna su identificador."""
+        return control.registrar_viaje(self.inicio, self.fin, 100000, self.destino,
+                                       TipoViaje.NACIONAL, cliente)
+
+    def test_enruta_gastos_por_viaje(self):
+        """Cada gasto debe llegar al viaje indicado, y los índices por cliente deben cuadrar."""
+        control = ControlViaje()
+        viaje_ana = self.registrar(control, self.ana)
+        viaje_luis = self.registrar(control, self.luis)
+        otro_ana = self.registrar(control, self.ana)
+
+        control.registrar_gasto(viaje_luis, self.inicio, 5000, MedioPago.EFECTIVO,
+                                TipoGasto.COMPRAS)
+        self.assertEqual(control.obtener_viaje(viaje_luis).calcular_gasto_diario(self.inicio),
+                         5000)
+        self.assertEqual(control.obtener_viaje(viaje_ana).calcular_gasto_diario(self.inicio), 0)
+        self.assertEqual(set(control.viajes_activos("123")), {viaje_ana, otro_ana})
+        self.assertEqual(control.obtener_cliente("456").get_nombre(), "Luis Gómez")
+        with self.assertRaises(KeyError):
+            control.registrar_gasto(999, self.inicio, 1, MedioPago.EFECTIVO, TipoGasto.OTROS)
+
+    def test_finalizados_se_archivan(self):
+        """Un viaje finalizado debe pasar al índice de finalizados y rechazar gastos."""
+        control = ControlViaje()
+        viaje_id = self.registrar(control, self.ana)
+        control.finalizar_viaje(viaje_id)
+
+        self.assertEqual(control.viajes_activos(), {})
+        self.assertEqual(control.viajes_finalizados("123"), {viaje_id})
+        with self.assertRaises(ViajeFinalizadoError):
+            control.registrar_gasto(viaje_id, self.inicio, 1, MedioPago.EFECTIVO,
+                                    TipoGasto.OTROS)
+
+    def test_finalizados_se_liberan_al_repositorio(self):
+        """Con repositorio, el viaje finalizado se guarda y se vuelve a cargar al consultarlo."""
+        repositorio = RepositorioSQLite()
+        self.addCleanup(repositorio.cerrar)
+        control = ControlViaje(repositorio)
+        viaje_id = self.registrar(control, self.ana)
+        viaje = control.get_viaje()
+        control.registrar_gasto(viaje_id, self.inicio, 7000, MedioPago.TARJETA_CREDITO,
+                                TipoGasto.ALOJAMIENTO)
+        viaje.finalizar_viaje()
+        # La notificación corre con el lock del viaje: la escritura queda pendiente.
+        self.assertIs(control.obtener_viaje(viaje_id), viaje)
+        control.guardar_finalizados()
+
+        self.assertIs(control.get_viaje(), viaje)
+        cargado = control.obtener_viaje(viaje_id)
+        self.assertIsNot(cargado, viaje)
+        self.assertFalse(cargado.estado_viaje)
+        self.assertEqual(cargado.cliente.get_cedula(), "123")
+        self.assertEqual(cargado.calcular_gasto_diario(self.inicio), 7000)
+
+    def test_fallo_al_guardar_finalizado_se_reintenta(self):
+        """Si el repositorio falla, el viaje debe seguir en memoria y pendiente de guardar."""
+        repositorio = RepositorioSQLite()
+        self.addCleanup(repositorio.cerrar)
+        control = ControlViaje(repositorio)
+        viaje_id = self.registrar(control, self.ana)
+        viaje = control.get_viaje()
+        control.registrar_gasto(viaje_id, self.inicio, 7000, MedioPago.EFECTIVO,
+                                TipoGasto.COMPRAS)
+        with mock.patch.object(repositorio, "reemplazar_gastos",
+                               side_effect=sqlite3.OperationalError("disco lleno")):
+            viaje.finalizar_viaje()
+            with self.assertRaises(sqlite3.OperationalError):
+                control.guardar_finalizados()
+        self.assertIs(control.obtener_viaje(viaje_id), viaje)
+
+        control.guardar_finalizados()
+        cargado = control.obtener_viaje(viaje_id)
+        self.assertIsNot(cargado, viaje)
+        self.assertEqual(cargado.calcular_gasto_diario(self.inicio), 7000)
+
+    def test_observador_no_modifica_otro_viaje(self):
+        """Un observador de un viaje no debe poder registrar gastos en otro viaje."""
+        control = ControlViaje()
+        primero = self.registrar(control, self.ana)
+        segundo = self.registrar(control, self.ana)
+
+        def copiar_gasto(evento, _viaje, *_):
+            if evento == 'gasto_agregado':
+                control.registrar_gasto(segundo, self.inicio, 1, MedioPago.EFECTIVO,
+                                        TipoGasto.OTROS)
+
+        control.obtener_viaje(primero).agregar_observador(copiar_gasto)
+        with self.assertRaises(RuntimeError):
+            control.registrar_gasto(primero, self.inicio, 1, MedioPago.EFECTIVO,
+                                    TipoGasto.OTROS)
+        self.assertEqual(len(control.obtener_viaje(segundo).get_gastos()), 0)
+        control.registrar_gasto(segundo, self.inicio, 1, MedioPago.EFECTIVO, TipoGasto.OTROS)
+        self.assertEqual(len(control.obtener_viaje(segundo).get_gastos()), 1)
+
+    def test_reanudar_viaje_lo_registra(self):
+        """Un viaje recuperado fuera del registro debe indexarse, precargarse y archivarse."""
+        precarga = mock.Mock()
+        repositorio = RepositorioSQLite()
+        self.addCleanup(repositorio.cerrar)
+        control = ControlViaje(repositorio, precarga=precarga)
+        viaje = Viaje(self.inicio, self.fin, 100000, self.destino, TipoViaje.NACIONAL,
+                      cliente=self.ana)
+        viaje.agregar_gasto(Gasto(self.inicio, 3000, MedioPago.EFECTIVO, TipoGasto.COMPRAS,
+                                  3000))
+
+        viaje_id = control.reanudar_viaje(viaje)
+        self.assertIs(control.get_viaje(), viaje)
+        self.assertEqual(control.viajes_activos("123"), {viaje_id: viaje})
+        precarga.precargar_viaje.assert_called_once_with(viaje)
+
+        control.finalizar_viaje()
+        self.assertEqual(control.viajes_finalizados("123"), {viaje_id})
+        self.assertEqual(control.obtener_viaje(viaje_id).calcular_gasto_diario(self.inicio),
+                         3000)
+
+    def test_iniciar_viaje_registra_el_viaje_actual(self):
+        """Iniciar un viaje asignado directamente debe registrarlo como activo."""
+        control = ControlViaje()
+        control.viaje = Viaje(self.inicio, self.fin, 100000, self.destino, TipoViaje.NACIONAL)
+        control.viaje.estado_viaje = False
+        control.iniciar_viaje()
+        self.assertEqual(control.viajes_activos(), {control.viaje.viaje_id: control.viaje})
+
+        control.finalizar_viaje()
+        with self.assertRaises(ViajeFinalizadoError):
+            control.iniciar_viaje()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Pruebas unitarias para el diario de persistencia de un viaje.
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+from controladores.control_reporte import ControlReporte
+from persistencia.diario_viaje import (AGREGADO, ELIMINADO, REGISTRO_GASTO,
+                                       DiarioCorruptoError, DiarioViaje)
+
+
+class TestDiarioViaje(unittest.TestCase):
+    """Conjunto de pruebas para la escritura y recuperación del diario."""
+
+    def setUp(self):
+        """Crea un directorio temporal y un viaje vacío."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.viaje = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                           Destino.obtener("Lima", "Lima", "Perú", "pen"),
+                           TipoViaje.INTERNACIONAL)
+
+    def registrar_gastos(self, cantidad):
+        """Agrega `cantidad` gastos repartidos en tres días."""
+        for i in range(cantidad):
+            self.viaje.agregar_gasto(Gasto(date(2025, 6, 1 + i % 3), i, MedioPago.EFECTIVO,
+                                           TipoGasto.COMPRAS, i * 1000.5))
+
+    def test_recupera_eventos(self):
+        """Debe reconstruir gastos, eliminaciones y finalización tras reabrir el diario."""
+        with DiarioViaje(self.directorio.name) as diario:
+            diario.iniciar(self.viaje)
+            self.registrar_gastos(10)
+            self.viaje.eliminar_gasto(self.viaje.get_gastos()[4])
+            self.viaje.finalizar_viaje()
+        esperado = ControlReporte.generar_reportes(self.viaje)
+
+        for columnar in (True, False):
+            with DiarioViaje(self.directorio.name) as diario:
+                recuperado = diario.recuperar(columnar=columnar)
+            self.assertFalse(recuperado.estado_viaje)
+            self.assertEqual(len(recuperado.get_gastos()), 9)
+            self.assertEqual(ControlReporte.generar_reportes(recuperado), esperado)
+
+    def test_instantanea_y_cola(self):
+        """Debe cargar la instantánea y reproducir solo los eventos posteriores."""
+        with DiarioViaje(self.directorio.name, eventos_por_instantanea=50) as diario:
+            diario.iniciar(self.viaje)
+            self.registrar_gastos(120)
+        segmentos = [n for n in os.listdir(self.directorio.name) if n.endswith(".log")]
+        self.assertEqual(segmentos, ["diario.00000002.log"])
+
+        with DiarioViaje(self.directorio.name) as diario:
+            recuperado = diario.recuperar()
+            recuperado.agregar_gasto(Gasto(date(2025, 6, 4), 1, MedioPago.EFECTIVO,
+                                           TipoGasto.OTROS, 1))
+        with DiarioViaje(self.directorio.name) as diario:
+            recuperado = diario.recuperar()
+        self.assertEqual(len(recuperado.get_gastos()), 121)
+        self.assertEqual(recuperado.calcular_gasto_diario(date(2025, 6, 1)),
+                         self.viaje.calcular_gasto_diario(date(2025, 6, 1)))
+
+    def test_descarta_registro_incompleto(self):
+        """Debe ignorar y truncar un último registro escrito a medias."""
+        with DiarioViaje(self.directorio.name) as diario:
+            diario.iniciar(self.viaje)
+            self.registrar_gastos(3)
+        with open(os.path.join(self.directorio.name, "diario.00000000.log"), "ab") as archivo:
+            archivo.write(b"a\x2e\xdc\x0b")
+
+        with DiarioViaje(self.directorio.name) as diario:
+            recuperado = diario.recuperar()
+            recuperado.agregar_gasto(Gasto(date(2025, 6, 4), 1, MedioPago.EFECTIVO,
+                                           TipoGasto.OTROS, 1))
+        with DiarioViaje(self.directorio.name) as diario:
+            self.assertEqual(len(diario.recuperar().get_gastos()), 4)
+
+    def test_registro_completo_invalido_no_se_trunca(self):
+        """Un registro completo que no puede aplicarse debe fallar sin borrar datos del diario."""
+        with DiarioViaje(self.directorio.name) as diario:
+            diario.iniciar(self.viaje)
+            self.registrar_gastos(3)
+        ruta = os.path.join(self.directorio.name, "diario.00000000.log")
+        ordinal = date(2025, 6, 1).toordinal()
+        for registro in (ELIMINADO + REGISTRO_GASTO.pack(ordinal, 0, 0, 999, 999),
+                         AGREGADO + REGISTRO_GASTO.pack(ordinal, 0, 0, -100, -100)):
+            with open(ruta, "rb") as archivo:
+                original = archivo.read()
+            with open(ruta, "ab") as archivo:
+                archivo.write(registro + AGREGADO + REGISTRO_GASTO.pack(ordinal, 0, 0, 1, 1))
+
+            with self.assertRaises(DiarioCorruptoError):
+                DiarioViaje(self.directorio.name).recuperar()
+            with open(ruta, "rb") as archivo:
+                self.assertEqual(len(archivo.read()), len(original) + 2 * len(registro))
+            with open(ruta, "wb") as archivo:
+                archivo.write(original)
+
+    def test_error_de_escritura_no_bloquea(self):
+        """Un error distinto de OSError al escribir debe hacer fallar sincronizar()."""
+        diario = DiarioViaje(self.directorio.name)
+        with mock.patch.object(DiarioViaje, "_escribir", side_effect=OverflowError("fuera")):
+            diario.iniciar(self.viaje)
+            with self.assertRaises(RuntimeError) as contexto:
+                diario.sincronizar(timeout=5)
+        self.assertIsInstance(contexto.exception.__cause__, OverflowError)
+        diario.cerrar()
+
+    def test_instantanea_refleja_reemplazos(self):
+        """La instantánea debe incluir reemplazos, eliminaciones y el estado final del viaje."""
+        with DiarioViaje(self.directorio.name, eventos_por_instantanea=5) as diario:
+            diario.iniciar(self.viaje)
+            self.registrar_gastos(6)
+            gastos = self.viaje.get_gastos()
+            self.viaje.reemplazar_gasto(gastos[1], Gasto(date(2025, 6, 2), 7, MedioPago.EFECTIVO,
+                                                         TipoGasto.OTROS, 7000))
+            self.viaje.eliminar_gasto(gastos[0])
+            self.viaje.finalizar_viaje()
+        esperado = ControlReporte.generar_reportes(self.viaje)
+
+        diario = DiarioViaje(self.directorio.name)
+        self.assertTrue(diario.existe())
+        with diario:
+            recuperado = diario.recuperar()
+        self.assertFalse(recuperado.estado_viaje)
+        self.assertEqual(ControlReporte.generar_reportes(recuperado), esperado)
+
+        diario.descartar()
+        self.assertFalse(diario.existe())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Pruebas unitarias para la representación del dinero en centavos.
+"""
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from modelos.dinero import a_centavos, aplicar_tasa, formatear, reporte_a_unidades
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+
+
+class TestDinero(unittest.TestCase):
+    """Pruebas de la conversión, el redondeo y el formato de los montos."""
+
+    def test_a_centavos(self):
+        """Debe redondear al centavo más cercano según el decimal escrito, no el float."""
+        self.assertEqual(a_centavos(12), 1200)
+        self.assertEqual(a_centavos(0.29), 29)
+        self.assertEqual(a_centavos(0.285), 29)
+        self.assertEqual(a_centavos(-0.285), -29)
+        self.assertEqual(a_centavos(1.004), 100)
+        self.assertEqual(a_centavos(Decimal("2.675")), 268)
+        with self.assertRaises(TypeError):
+            a_centavos("10")
+        with self.assertRaises(ValueError):
+            a_centavos(float("nan"))
+
+    def test_aplicar_tasa_y_formatear(self):
+        """Debe convertir con redondeo explícito y formatear sin pasar por float."""
+        self.assertEqual(aplicar_tasa(1250, 4000.0), 5000000)
+        self.assertEqual(aplicar_tasa(1, 0.5), 1)
+        self.assertEqual(aplicar_tasa(333, 1 / 3), 111)
+        self.assertEqual(formatear(123405), "1234.05")
+        self.assertEqual(formatear(-5), "-0.05")
+        self.assertEqual(reporte_a_unidades({'a': {'b': {'c': 150}}, 'd': 7}),
+                         {'a': {'b': {'c': 1.5}}, 'd': 0.07})
+
+    def test_agregados_exactos(self):
+        """Los totales del viaje deben ser exactos tras muchas sumas y restas de decimales."""
+        viaje = Viaje(date(2025, 6, 1), date(2025, 6, 2), 100,
+                      Destino.obtener("Cali", "Valle", "Colombia", "cop"), TipoViaje.NACIONAL)
+        gastos = [Gasto(date(2025, 6, 1), 0.1, MedioPago.EFECTIVO, TipoGasto.COMPRAS, 0.1)
+                  for _ in range(10)]
+        viaje.agregar_gastos(gastos)
+        self.assertEqual(viaje.calcular_gasto_diario(date(2025, 6, 1)), 1.0)
+        self.assertNotEqual(sum(gasto.get_valor() for gasto in gastos), 1.0)
+
+        for gasto in gastos:
+            viaje.eliminar_gasto(gasto)
+        self.assertEqual(viaje.get_resumen().por_tipo['COMPRAS']['total'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Pruebas unitarias para las métricas de la aplicación y su exportación en formato Prometheus.
+"""
+import unittest
+import urllib.request
+from datetime import date
+from unittest import mock
+
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.metricas import REGISTRO, RegistroMetricas
+
+TABLA_USD = {'usd': {'cop': 4000.0}}
+
+
+class TestRegistroMetricas(unittest.TestCase):
+    """Pruebas del registro de métricas en sí."""
+
+    def setUp(self):
+        """Crea un registro propio, activo."""
+        self.registro = RegistroMetricas()
+        self.registro.activar()
+
+    def test_exportar_formato_prometheus(self):
+        """Debe exportar contadores, medidores e histogramas con sus etiquetas."""
+        consultas = self.registro.contador("consultas_total", "Consultas.", ("moneda",))
+        activos = self.registro.medidor("activos", "Activos.")
+        latencia = self.registro.histograma("latencia_segundos", "Latencia.",
+                                            limites=(0.1, 1.0))
+        consultas.etiquetas("usd").inc()
+        consultas.etiquetas("usd").inc(2)
+        activos.inc(3)
+        activos.dec()
+        latencia.observar(0.05)
+        latencia.observar(0.5)
+        latencia.observar(7)
+
+        self.assertEqual(self.registro.exportar().splitlines(), [
+            "# HELP consultas_total Consultas.",
+            "# TYPE consultas_total counter",
+            'consultas_total{moneda="usd"} 3',
+            "# HELP activos Activos.",
+            "# TYPE activos gauge",
+            "activos 2",
+            "# HELP latencia_segundos Latencia.",
+            "# TYPE latencia_segundos histogram",
+            'latencia_segundos_bucket{le="0.1"} 1',
+            'latencia_segundos_bucket{le="1"} 2',
+            'latencia_segundos_bucket{le="+Inf"} 3',
+            "latencia_segundos_sum 7.55",
+            "latencia_segundos_count 3",
+        ])
+
+    def test_desactivado_no_registra(self):
+        """Con el registro desactivado, las actualizaciones no deben tener efecto."""
+        contador = self.registro.contador("eventos_total", "Eventos.")
+        histograma = self.registro.histograma("duracion_segundos", "Duración.")
+        self.registro.activar(False)
+        contador.inc()
+        with histograma.medir():
+            pass
+        self.assertIn("eventos_total 0", self.registro.exportar())
+        self.assertIn("duracion_segundos_count 0", self.registro.exportar())
+
+    def test_metrica_con_etiquetas_requiere_etiquetas(self):
+        """Los atajos sin etiquetas deben fallar con ValueError en una métrica etiquetada."""
+        contador = self.registro.contador("consultas_total", "Consultas.", ("resultado",))
+        histograma = self.registro.histograma("latencia_segundos", "Latencia.", ("ruta",))
+        with self.assertRaises(ValueError):
+            contador.inc()
+        with self.assertRaises(ValueError):
+            histograma.medir()
+        contador.etiquetas("ok").inc()
+        self.assertIn('consultas_total{resultado="ok"} 1', self.registro.exportar())
+
+    def test_servir_metricas(self):
+        """Debe publicar el texto de las métricas en /metrics."""
+        self.registro.contador("eventos_total", "Eventos.").inc()
+        direccion, puerto = self.registro.servir(0)
+        self.addCleanup(self.registro.detener_servidor)
+        with urllib.request.urlopen(f"http://{direccion}:{puerto}/metrics") as respuesta:
+            self.assertIn("eventos_total 1", respuesta.read().decode())
+
+
+class TestMetricasAplicacion(unittest.TestCase):
+    """Pruebas de la instrumentación de las consultas de tasas."""
+
+    def setUp(self):
+        """Activa y reinicia el registro global y simula la API de tasas."""
+        REGISTRO.reiniciar()
+        REGISTRO.activar()
+        self.addCleanup(REGISTRO.activar, False)
+        self.addCleanup(REGISTRO.reiniciar)
+        ControlAPIMonedaIntercambio.configurar_cache()
+        parche = mock.patch.object(ControlAPIMonedaIntercambio, "transporte")
+        self.transporte = parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_consultas_de_tasas(self):
+        """Debe contar las consultas, los 404 y la latencia por moneda."""
+        self.transporte.obtener_json.side_effect = [None, TABLA_USD]
+        ControlAPIMonedaIntercambio.obtener_tasa_cambio("usd", date(2025, 6, 2))
+        texto = REGISTRO.exportar()
+        self.assertIn('tasas_consultas_total{moneda="usd"} 2', texto)
+        self.assertIn('tasas_no_publicadas_total{moneda="usd"} 1', texto)
+        self.assertIn('tasas_latencia_segundos_count{moneda="usd"} 2', texto)
+        self.assertNotIn('tasas_errores_total{moneda="usd"} 1', texto)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Pruebas unitarias para el paquete binario de tasas de cambio.
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.paquete_tasas import PaqueteTasas, construir_paquete, escribir_paquete
+
+
+class TestPaqueteTasas(unittest.TestCase):
+    """Pruebas de escritura, lectura y uso del paquete de tasas."""
+
+    def setUp(self):
+        """Escribe un paquete de 5 días (1 al 5 de junio) con el 3 y el 4 sin publicar."""
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "tasas.paquete")
+        escribir_paquete(self.ruta, date(2025, 6, 1), {
+            'usd': [1.0, 1.0, None, None, 1.0],
+            'cop': [4000.0, 4100.0, None, None, 4200.0],
+            'eur': [0.9, 0.8, None, None, 0.5],
+        })
+
+    def test_lectura_y_fecha_anterior_mas_cercana(self):
+        """Debe leer las tasas y, sin publicación, usar la fecha anterior más cercana."""
+        paquete = PaqueteTasas(self.ruta)
+        self.addCleanup(paquete.cerrar)
+        self.assertEqual(paquete.monedas, ('usd', 'cop', 'eur'))
+        self.assertEqual(paquete.tasa("USD", "cop", date(2025, 6, 1)), 4000.0)
+        self.assertEqual(paquete.tasa("eur", "cop", date(2025, 6, 5)), 8400.0)
+        self.assertEqual(paquete.tasa("usd", "cop", date(2025, 6, 4)), 4100.0)
+        self.assertIsNone(paquete.tasa("usd", "cop", date(2025, 6, 4), dias_retroceso=2))
+        self.assertIsNone(paquete.tasa("usd", "cop", date(2025, 5, 31)))
+        self.assertIsNone(paquete.tasa("usd", "mxn", date(2025, 6, 1)))
+
+    def test_fecha_posterior_al_paquete(self):
+        """Un día después del paquete no debe usar su última tasa, sino consultar la API."""
+        paquete = PaqueteTasas(self.ruta)
+        self.addCleanup(paquete.cerrar)
+        self.assertIsNone(paquete.tasa("usd", "cop", date(2025, 6, 6)))
+
+        ControlAPIMonedaIntercambio.configurar_cache()
+        self.addCleanup(ControlAPIMonedaIntercambio.configurar_paquete, None)
+        ControlAPIMonedaIntercambio.configurar_paquete(self.ruta)
+        with mock.patch.object(ControlAPIMonedaIntercambio, "transporte") as transporte:
+            transporte.obtener_json.return_value = {'usd': {'cop': 4400.0}}
+            valor = ControlAPIMonedaIntercambio.convertir_moneda("usd", 10, date(2025, 6, 6))
+        self.assertEqual(valor, 44000.0)
+        transporte.obtener_json.assert_called_once()
+
+    def test_archivo_invalido(self):
+        """Debe rechazar archivos que no son paquetes o están truncados."""
+        with open(self.ruta, "r+b") as archivo:
+            archivo.truncate(os.path.getsize(self.ruta) - 8)
+        with self.assertRaises(ValueError):
+            PaqueteTasas(self.ruta)
+
+    def test_conversion_sin_red(self):
+        """Con un paquete configurado, la conversión no debe consultar la API."""
+        ControlAPIMonedaIntercambio.configurar_cache()
+        self.addCleanup(ControlAPIMonedaIntercambio.configurar_paquete, None)
+        ControlAPIMonedaIntercambio.configurar_paquete(self.ruta)
+        with mock.patch.object(ControlAPIMonedaIntercambio, "transporte") as transporte:
+            valor = ControlAPIMonedaIntercambio.convertir_moneda("usd", 10, date(2025, 6, 3))
+            self.assertEqual(valor, 41000.0)
+            transporte.obtener_json.assert_not_called()
+
+    def test_construir_paquete(self):
+        """Debe descargar cada día del rango y guardar NaN en los días sin publicación."""
+        respuestas = {
+            "2025-06-01": {'usd': {'cop': 4000.0, 'eur': 0.9}},
+            "2025-06-03": {'usd': {'cop': 4300.0}},
+        }
+        with mock.patch.object(ControlAPIMonedaIntercambio, "transporte") as transporte:
+            transporte.obtener_json.side_effect = lambda url: next(
+                (datos for fecha, datos in respuestas.items() if fecha in url), None)
+            resultado = construir_paquete(self.ruta, date(2025, 6, 1), date(2025, 6, 3),
+                                          ["COP", "eur"],
+                                          ControlAPIMonedaIntercambio.descargar_tabla)
+        self.assertEqual(resultado, {'dias': 3, 'publicados': 2})
+
+        paquete = PaqueteTasas(self.ruta)
+        self.addCleanup(paquete.cerrar)
+        self.assertEqual(paquete.tasa("usd", "cop", date(2025, 6, 2)), 4000.0)
+        self.assertEqual(paquete.tasa("usd", "cop", date(2025, 6, 3)), 4300.0)
+        self.assertAlmostEqual(paquete.tasa("eur", "cop", date(2025, 6, 3)), 4000.0 / 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Pruebas unitarias para la precarga de tasas de los viajes internacionales.
+
+Las respuestas de la API se simulan para no depender de la red.
+"""
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.destino import Destino
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.control_viaje import ControlViaje
+from controladores.precarga_tasas import PrecargaTasas
+
+TABLA_USD = {'usd': {'cop': 4000.0}}
+
+
+class TestPrecargaTasas(unittest.TestCase):
+    """Pruebas de la precarga al registrar viajes y al comenzar cada día."""
+
+    def setUp(self):
+        """Simula la API y crea un registro de viajes con precarga."""
+        ControlAPIMonedaIntercambio.configurar_cache()
+        parche = mock.patch.object(ControlAPIMonedaIntercambio, "transporte")
+        self.transporte = parche.start()
+        self.addCleanup(parche.stop)
+        self.transporte.obtener_json.return_value = TABLA_USD
+
+        self.hoy = date.today()
+        self.precarga = PrecargaTasas(hilos=2, hoy=lambda: self.hoy)
+        self.addCleanup(self.precarga.detener)
+        self.control = ControlViaje(precarga=self.precarga)
+        self.inicio = self.hoy - timedelta(days=3)
+
+    def registrar(self, tipo_viaje, moneda):
+        """Registra un viaje de 6 días, 4 de ellos ya transcurridos."""
+        destino = Destino.obtener("Ciudad", "Región", "País", moneda)
+        return self.control.registrar_viaje(self.inicio, self.hoy + timedelta(days=2), 100000,
+                                            destino, tipo_viaje)
+
+    def test_precarga_dias_transcurridos(self):
+        """Debe precargar cada día transcurrido y el gasto no debe consultar la API."""
+        viaje_id = self.registrar(TipoViaje.INTERNACIONAL, "usd")
+        self.assertTrue(self.precarga.esperar(5))
+        self.assertEqual(self.precarga.precargadas, 4)
+        self.assertEqual(self.transporte.obtener_json.call_count, 4)
+
+        self.control.registrar_gasto(viaje_id, self.inicio + timedelta(days=1), 10,
+                                     MedioPago.EFECTIVO, TipoGasto.COMPRAS)
+        self.assertEqual(self.transporte.obtener_json.call_count, 4)
+        self.assertEqual(self.control.obtener_viaje(viaje_id).calcular_gasto_diario(
+            self.inicio + timedelta(days=1)), 40000)
+
+    def test_nuevo_dia_y_viajes_sin_conversion(self):
+        """Al comenzar un día debe precargarlo; los viajes nacionales no se precargan."""
+        self.registrar(TipoViaje.NACIONAL, "cop")
+        self.assertTrue(self.precarga.esperar(5))
+        self.assertEqual(self.transporte.obtener_json.call_count, 0)
+
+        self.registrar(TipoViaje.INTERNACIONAL, "usd")
+        self.precarga.esperar(5)
+        self.hoy += timedelta(days=1)
+        self.precarga.revisar_dia()
+        self.assertTrue(self.precarga.esperar(5))
+        fechas = {llamada.args[0] for llamada in self.transporte.obtener_json.call_args_list}
+        self.assertEqual(len(fechas), 5)
+        self.assertTrue(any(self.hoy.isoformat() in url for url in fechas))
+
+    def test_olvida_dias_de_viajes_terminados(self):
+        """Al terminar un viaje, sus días pedidos deben dejar de recordarse."""
+        self.registrar(TipoViaje.INTERNACIONAL, "usd")
+        self.assertTrue(self.precarga.esperar(5))
+        self.hoy += timedelta(days=1)
+        self.precarga.revisar_dia()
+        self.assertEqual(len(self.precarga._pedidas), 3)
+
+        self.hoy += timedelta(days=2)
+        self.precarga.revisar_dia()
+        self.assertTrue(self.precarga.esperar(5))
+        self.assertEqual(self.precarga._pedidas, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
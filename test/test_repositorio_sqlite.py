@@ -0,0 +1,100 @@
+"""
+Pruebas unitarias para el repositorio SQLite de viajes y gastos.
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from enums.medio_pago import MedioPago
+from enums.tipo_gasto import TipoGasto
+from enums.tipo_viaje import TipoViaje
+from modelos.cliente import Cliente
+from modelos.destino import Destino
+from modelos.gasto import Gasto
+from modelos.viaje import Viaje
+from controladores.control_reporte import ControlReporte
+from persistencia.repositorio_sqlite import RepositorioSQLite
+
+
+class TestRepositorioSQLite(unittest.TestCase):
+    """Conjunto de pruebas para guardar viajes y agregarlos en SQL."""
+
+    def setUp(self):
+        """Crea un repositorio en un archivo temporal y un viaje con gastos."""
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "viajes.sqlite3")
+        self.repositorio = RepositorioSQLite(self.ruta, tamano_lote=4)
+        self.addCleanup(self.repositorio.cerrar)
+        self.cliente = Cliente("Ana Pérez", "123", "3000000000", "ana@correo.com")
+        self.viaje = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                           Destino.obtener("Cali", "Valle", "Colombia", "cop"),
+                           TipoViaje.NACIONAL)
+        medios = (MedioPago.EFECTIVO, MedioPago.TARJETA_DEBITO, MedioPago.TARJETA_CREDITO)
+        for i in range(10):
+            self.viaje.agregar_gasto(Gasto(date(2025, 6, 1 + i % 3), 1000 * i, medios[i % 3],
+                                           TipoGasto.TRANSPORTE if i % 2 else TipoGasto.OTROS,
+                                           1000 * i))
+
+    def test_reportes_en_sql(self):
+        """Los reportes agrupados en SQL deben coincidir con los calculados en memoria."""
+        viaje_id = self.repositorio.guardar_viaje(self.viaje, self.cliente)
+        esperado = ControlReporte.generar_reportes(self.viaje)
+
+        self.assertEqual(ControlReporte.reportes_desde_repositorio(self.repositorio, viaje_id),
+                         esperado)
+        self.assertEqual(self.repositorio.reporte_diario(viaje_id), esperado['diario'])
+        self.assertEqual(self.repositorio.reporte_por_tipo(viaje_id), esperado['por_tipo'])
+        self.assertEqual(self.repositorio.gasto_diario(viaje_id, date(2025, 6, 2)),
+                         self.viaje.calcular_gasto_diario(date(2025, 6, 2)))
+        self.assertEqual(self.repositorio.obtener_cliente("123").get_nombre(), "Ana Pérez")
+
+    def test_viaje_cargado_escribe_en_la_base(self):
+        """Un viaje cargado debe guardar sus gastos, eliminaciones y finalización."""
+        viaje_id = self.repositorio.guardar_viaje(self.viaje)
+        cargado = self.repositorio.cargar_viaje(viaje_id)
+        self.assertEqual(ControlReporte.generar_reportes(cargado),
+                         ControlReporte.generar_reportes(self.viaje))
+
+        cargado.agregar_gasto(Gasto(date(2025, 6, 5), 500, MedioPago.EFECTIVO,
+                                    TipoGasto.COMPRAS, 500))
+        cargado.eliminar_gasto(cargado.get_gastos()[0])
+        cargado.finalizar_viaje()
+
+        otro = RepositorioSQLite(self.ruta)
+        self.addCleanup(otro.cerrar)
+        recuperado = otro.cargar_viaje(viaje_id)
+        self.assertFalse(recuperado.estado_viaje)
+        self.assertEqual(len(recuperado.get_gastos()), 10)
+        self.assertEqual(recuperado.calcular_gasto_diario(date(2025, 6, 5)), 500)
+        self.assertEqual(ControlReporte.generar_reportes(recuperado),
+                         ControlReporte.recalcular_reportes(cargado))
+
+    def test_viaje_inexistente(self):
+        """Debe lanzar KeyError al cargar un viaje que no existe."""
+        with self.assertRaises(KeyError):
+            self.repositorio.cargar_viaje(99)
+
+    def test_reemplazar_gastos_es_atomico(self):
+        """Si falla a mitad de los gastos, no debe cambiar ni los gastos ni el estado."""
+        viaje_id = self.repositorio.guardar_viaje(self.viaje, self.cliente)
+
+        def gastos_con_error():
+            yield from list(self.viaje.get_gastos())[:5]
+            raise ValueError("gasto inválido")
+
+        with self.assertRaises(ValueError):
+            self.repositorio.reemplazar_gastos(viaje_id, gastos_con_error(), False)
+        cargado = self.repositorio.cargar_viaje(viaje_id)
+        self.assertTrue(cargado.estado_viaje)
+        self.assertEqual(len(cargado.get_gastos()), 10)
+
+        self.repositorio.reemplazar_gastos(viaje_id, list(self.viaje.get_gastos())[:3], False)
+        cargado = self.repositorio.cargar_viaje(viaje_id)
+        self.assertFalse(cargado.estado_viaje)
+        self.assertEqual(len(cargado.get_gastos()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
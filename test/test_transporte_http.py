@@ -0,0 +1,107 @@
+"""
+Pruebas unitarias para el transporte HTTP y su interruptor de circuito.
+
+El reloj del interruptor y la sesión de `requests` se simulan para no depender del tiempo ni
+de la red.
+"""
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import requests
+
+from controladores.transporte_http import (CircuitoAbiertoError, ErrorTransporte,
+                                           InterruptorCircuito, TransporteHTTP)
+
+
+class TestInterruptorCircuito(unittest.TestCase):
+    """Pruebas de los estados del interruptor de circuito."""
+
+    def setUp(self):
+        """Crea un interruptor que abre tras 3 fallos y espera 10 s, con reloj simulado."""
+        self.ahora = 0.0
+        self.interruptor = InterruptorCircuito(3, 10, reloj=lambda: self.ahora)
+
+    def test_abre_tras_fallos_consecutivos(self):
+        """Debe abrirse solo tras los fallos seguidos y rechazar las consultas al estar abierto."""
+        for _ in range(2):
+            self.interruptor.registrar_fallo()
+        self.interruptor.registrar_exito()
+        for _ in range(2):
+            self.interruptor.registrar_fallo()
+        self.interruptor.permitir()
+        self.interruptor.registrar_fallo()
+        self.assertEqual(self.interruptor.estado, InterruptorCircuito.ABIERTO)
+        self.ahora = 9.9
+        with self.assertRaises(CircuitoAbiertoError):
+            self.interruptor.permitir()
+
+    def test_prueba_semiabierta(self):
+        """Pasada la espera, una sola consulta de prueba decide si el circuito se cierra."""
+        for _ in range(3):
+            self.interruptor.registrar_fallo()
+        self.ahora = 10
+        self.interruptor.permitir()
+        self.assertEqual(self.interruptor.estado, InterruptorCircuito.SEMIABIERTO)
+        with self.assertRaises(CircuitoAbiertoError):
+            self.interruptor.permitir()
+        self.interruptor.registrar_fallo()
+        self.assertEqual(self.interruptor.estado, InterruptorCircuito.ABIERTO)
+
+        self.ahora = 20
+        self.interruptor.permitir()
+        self.interruptor.registrar_exito()
+        self.assertEqual(self.interruptor.estado, InterruptorCircuito.CERRADO)
+        self.interruptor.permitir()
+
+
+class TestTransporteHTTP(unittest.TestCase):
+    """Pruebas de la clasificación de respuestas del transporte."""
+
+    def setUp(self):
+        """Crea un transporte que abre el circuito tras 2 fallos."""
+        self.transporte = TransporteHTTP(fallos_para_abrir=2, espera_apertura=60)
+        self.addCleanup(self.transporte.cerrar)
+        parche = mock.patch.object(self.transporte.sesion, "get")
+        self.get = parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_circuito_abierto_no_consulta(self):
+        """Tras los fallos del servidor, las consultas deben fallar sin llegar a la red."""
+        self.get.side_effect = requests.exceptions.ConnectionError("sin conexión")
+        for _ in range(2):
+            with self.assertRaises(ErrorTransporte):
+                self.transporte.obtener_json("http://tasas/x.json")
+        with self.assertRaises(CircuitoAbiertoError):
+            self.transporte.obtener_json("http://tasas/x.json")
+        self.assertEqual(self.get.call_count, 2)
+
+    def test_404_no_cuenta_como_fallo(self):
+        """Un 404 es una respuesta válida del servidor y no debe abrir el circuito."""
+        self.get.return_value = mock.Mock(status_code=404)
+        for _ in range(3):
+            self.assertIsNone(self.transporte.obtener_json("http://tasas/x.json"))
+        self.assertEqual(self.transporte.interruptor.estado, InterruptorCircuito.CERRADO)
+
+
+class TestArranque(unittest.TestCase):
+    """Pruebas de la carga diferida de la pila HTTP."""
+
+    def test_main_no_importa_requests(self):
+        """Importar la aplicación no debe cargar `requests` hasta la primera consulta."""
+        codigo = ("import sys, main\n"
+                  "from controladores.control_api_moneda_intercambio import "
+                  "ControlAPIMonedaIntercambio\n"
+                  "assert 'requests' not in sys.modules, 'requests se importó al arrancar'\n"
+                  "ControlAPIMonedaIntercambio.transporte.sesion\n"
+                  "assert 'requests' in sys.modules\n")
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proceso = subprocess.run([sys.executable, "-c", codigo], cwd=raiz,
+                                 capture_output=True, text=True)
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
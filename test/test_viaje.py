@@ -1,6 +1,11 @@
+import io
 import unittest
 from datetime import date
+from unittest import mock
 from controladores.control_gasto import ControlGasto
+from controladores.control_api_moneda_intercambio import ControlAPIMonedaIntercambio
+from controladores.lector_gastos import leer_csv, leer_jsonl
+from controladores.transporte_http import ErrorTransporte
 from modelos.viaje import Viaje
 from modelos.gasto import Gasto
 from enums.medio_pago import MedioPago
@@ -91,5 +96,115 @@ class TestCalcularDiferenciaPresupuesto(unittest.TestCase):
 
 
 
+class TestIndiceGastoDiario(unittest.TestCase):
+    """Pruebas del índice incremental de gasto por fecha del viaje."""
+
+    def setUp(self):
+        """Crea un viaje nacional con dos gastos en la misma fecha."""
+        self.viaje = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                           Destino("Bogotá", "Cundinamarca", "Colombia", "COP"),
+                           TipoViaje.NACIONAL)
+        self.gasto_1 = Gasto(date(2025, 6, 2), 30000, MedioPago.EFECTIVO,
+                             TipoGasto.ALIMENTACION, 30000)
+        self.gasto_2 = Gasto(date(2025, 6, 2), 20000, MedioPago.TARJETA_DEBITO,
+                             TipoGasto.TRANSPORTE, 20000)
+        self.viaje.agregar_gasto(self.gasto_1)
+        self.viaje.agregar_gasto(self.gasto_2)
+
+    def test_eliminar_gasto(self):
+        """Debe descontar del total diario el gasto eliminado."""
+        self.viaje.eliminar_gasto(self.gasto_1)
+        self.assertEqual(self.viaje.calcular_gasto_diario(date(2025, 6, 2)), 20000)
+
+    def test_reemplazar_gasto(self):
+        """Debe trasladar el valor al total de la nueva fecha al reemplazar un gasto."""
+        corregido = Gasto(date(2025, 6, 3), 5000, MedioPago.EFECTIVO,
+                          TipoGasto.ALIMENTACION, 5000)
+        self.viaje.reemplazar_gasto(self.gasto_1, corregido)
+        self.assertEqual(self.viaje.calcular_gasto_diario(date(2025, 6, 2)), 20000)
+        self.assertEqual(self.viaje.calcular_gasto_diario(date(2025, 6, 3)), 5000)
+
+
+class TestModelosCompactos(unittest.TestCase):
+    """Pruebas de la representación compacta de los modelos."""
+
+    def test_destino_compartido(self):
+        """Debe retornar la misma instancia para destinos con los mismos datos."""
+        destino = Destino.obtener("Lima", "Lima", "Perú", "pen")
+        self.assertIs(destino, Destino.obtener("Lima", "Lima", "Perú", "pen"))
+        self.assertIsNot(destino, Destino.obtener("Cusco", "Cusco", "Perú", "pen"))
+
+    def test_gasto_sin_diccionario(self):
+        """Los gastos no deben tener __dict__ por instancia."""
+        gasto = Gasto(date(2025, 6, 2), 100, MedioPago.EFECTIVO, TipoGasto.OTROS, 100)
+        self.assertFalse(hasattr(gasto, '__dict__'))
+
+
+class TestRegistroEnLote(unittest.TestCase):
+    """Pruebas de la importación de gastos en lote."""
+
+    CSV = (
+        "fecha,valor,medio_pago,tipo_gasto\n"
+        "2025-06-01,10,efectivo,alimentacion\n"
+        "2025-06-02,20,TARJETA_CREDITO,TRANSPORTE\n"
+        "2025-06-01,5,EFECTIVO,COMPRAS\n"
+        "2025-06-01,-3,EFECTIVO,COMPRAS\n"
+        "2025-06-02,7,CHEQUE,COMPRAS\n"
+    )
+
+    def crear_control(self, tipo_viaje):
+        """Crea un ControlGasto para un viaje del tipo indicado con moneda USD."""
+        viaje = Viaje(date(2025, 6, 1), date(2025, 6, 10), 100000,
+                      Destino("Miami", "Florida", "Estados Unidos", "usd"), tipo_viaje)
+        return ControlGasto(viaje, None)
+
+    @mock.patch.object(ControlAPIMonedaIntercambio, "obtener_tasa_cambio", return_value=4000.0)
+    def test_una_tasa_por_fecha(self, obtener_tasa):
+        """Debe consultar la tasa una vez por fecha y rechazar las filas inválidas."""
+        control = self.crear_control(TipoViaje.INTERNACIONAL)
+        resumen = control.registrar_gastos_lote(leer_csv(io.StringIO(self.CSV)), tamano_lote=2)
+
+        self.assertEqual(resumen['registrados'], 3)
+        self.assertEqual(resumen['rechazados'], 2)
+        self.assertEqual([linea for linea, _ in resumen['errores']], [5, 6])
+        self.assertEqual(obtener_tasa.call_count, 2)
+        self.assertEqual(control.viaje.calcular_gasto_diario(date(2025, 6, 1)), 60000)
+
+    def test_tasas_no_disponibles(self):
+        """Debe reintentar en el lote siguiente solo las fechas que fallaron por la red."""
+        fallos = {date(2025, 6, 1): ErrorTransporte("sin conexión"),
+                  date(2025, 6, 2): RuntimeError("sin tasa publicada")}
+
+        def obtener_tasa(_moneda, fecha):
+            if fecha in fallos:
+                error = fallos[fecha]
+                if isinstance(error, ErrorTransporte):
+                    del fallos[fecha]
+                raise error
+            return 4000.0
+
+        control = self.crear_control(TipoViaje.INTERNACIONAL)
+        with mock.patch.object(ControlAPIMonedaIntercambio, "obtener_tasa_cambio",
+                               side_effect=obtener_tasa) as consulta:
+            resumen = control.registrar_gastos_lote(leer_csv(io.StringIO(self.CSV)),
+                                                    tamano_lote=2)
+
+        self.assertEqual((resumen['registrados'], resumen['rechazados'], resumen['sin_tasa']),
+                         (1, 2, 2))
+        self.assertEqual(consulta.call_count, 3)
+        self.assertEqual(control.viaje.calcular_gasto_diario(date(2025, 6, 1)), 20000)
+
+    def test_jsonl_nacional(self):
+        """Debe importar gastos de un JSONL sin conversión en un viaje nacional."""
+        jsonl = io.StringIO(
+            '{"fecha": "2025-06-03", "valor": 1500, "medio_pago": "EFECTIVO", '
+            '"tipo_gasto": "OTROS"}\n\nno es json\n'
+        )
+        control = self.crear_control(TipoViaje.NACIONAL)
+        resumen = control.registrar_gastos_lote(leer_jsonl(jsonl))
+        self.assertEqual((resumen['registrados'], resumen['rechazados']), (1, 1))
+        self.assertEqual(control.viaje.calcular_gasto_diario(date(2025, 6, 3)), 1500)
+
+
 if __name__ == '__main__':
     unittest.main()